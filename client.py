@@ -2,6 +2,7 @@ from pygame import *
 import socket
 import json
 from threading import Thread
+from functools import lru_cache
 
 # ---ПУГАМЕ НАЛАШТУВАННЯ ---
 WIDTH, HEIGHT = 800, 600
@@ -40,32 +41,47 @@ def receive():
 # --- ШРИФТИ ---
 font_win = font.Font(None, 72)
 font_main = font.Font(None, 36)
+font_countdown = font.Font(None, 72)
+
+
+# Готові написи: рахунок і відлік рендеряться заново лише тоді, коли змінюється текст
+@lru_cache(maxsize=64)
+def render_text(text_font, text, color):
+    return text_font.render(text, True, color)
+
 # --- ЗОБРАЖЕННЯ ----
 bg_img = image.load('images/backgrounds/game_bg.jpg')
-bg_img = transform.scale(bg_img, (800, 600))
+bg_img = transform.scale(bg_img, (800, 600)).convert()  # Формат екрана: фон малюється без перетворення щокадру
 # --- ЗВУКИ ---
 
 # --- ГРА ---
 game_over = False
 winner = None
 you_winner = None
+# Під час гри стираємо і оновлюємо на екрані лише ділянки, намальовані минулого кадру
+dirty_rects = []
+full_redraw = True
 my_id, game_state, buffer, client = connect_to_server()
 Thread(target=receive, daemon=True).start()
 while True:
     for e in event.get():
         if e.type == QUIT:
             exit()
-    screen.blit(bg_img, (0, 0))
+        if e.type == VIDEOEXPOSE:
+            full_redraw = True
 
     if "countdown" in game_state and game_state["countdown"] > 0:
+        screen.blit(bg_img, (0, 0))
+        full_redraw = True
         #screen.fill((0, 0, 0))
-        countdown_text = font.Font(None, 72).render(str(game_state["countdown"]), True, (255, 255, 255))
+        countdown_text = render_text(font_countdown, str(game_state["countdown"]), (255, 255, 255))
         screen.blit(countdown_text, (WIDTH // 2 - 20, HEIGHT // 2 - 30))
         display.update()
         continue  # Не малюємо гру до завершення відліку
 
     if "winner" in game_state and game_state["winner"] is not None:
         screen.fill((20, 20, 20))
+        full_redraw = True
 
         if you_winner is None:  # Встановлюємо тільки один раз
             if game_state["winner"] == my_id:
@@ -78,11 +94,11 @@ while True:
         else:
             text = "Пощастить наступним разом!"
 
-        win_text = font_win.render(text, True, (255, 215, 0))
+        win_text = render_text(font_win, text, (255, 215, 0))
         text_rect = win_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
         screen.blit(win_text, text_rect)
 
-        text = font_win.render('К - рестарт', True, (255, 215, 0))
+        text = render_text(font_win, 'К - рестарт', (255, 215, 0))
         text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 120))
         screen.blit(text, text_rect)
 
@@ -90,12 +106,25 @@ while True:
         continue  # Блокує гру після перемоги
 
     if game_state:
-        #screen.fill((30, 30, 30))
-        draw.rect(screen, (0, 255, 0), (20, game_state['paddles']['0'], 20, 100))
-        draw.rect(screen, (255, 0, 255), (WIDTH - 40, game_state['paddles']['1'], 20, 100))
-        draw.circle(screen, (255, 255, 255), (game_state['ball']['x'], game_state['ball']['y']), 10)
-        score_text = font_main.render(f"{game_state['scores'][0]} : {game_state['scores'][1]}", True, (255, 255, 255))
-        screen.blit(score_text, (WIDTH // 2 -25, 20))
+        if full_redraw:
+            screen.blit(bg_img, (0, 0))
+        else:
+            for rect in dirty_rects:
+                screen.blit(bg_img, rect, rect)  # Повертаємо фон лише під минулими ракетками, м'ячем і рахунком
+        new_rects = [
+            draw.rect(screen, (0, 255, 0), (20, game_state['paddles']['0'], 20, 100)),
+            draw.rect(screen, (255, 0, 255), (WIDTH - 40, game_state['paddles']['1'], 20, 100)),
+            draw.circle(screen, (255, 255, 255), (game_state['ball']['x'], game_state['ball']['y']), 10),
+        ]
+        score_text = render_text(font_main, f"{game_state['scores'][0]} : {game_state['scores'][1]}", (255, 255, 255))
+        new_rects.append(screen.blit(score_text, (WIDTH // 2 -25, 20)))
+
+        if full_redraw:
+            display.update()
+        else:
+            display.update(dirty_rects + new_rects)
+        dirty_rects = new_rects
+        full_redraw = False
 
         if game_state['sound_event']:
             if game_state['sound_event'] == 'wall_hit':
@@ -106,10 +135,12 @@ while True:
                 pass
 
     else:
-        wating_text = font_main.render(f"Очікування гравців...", True, (255, 255, 255))
+        screen.blit(bg_img, (0, 0))
+        wating_text = render_text(font_main, f"Очікування гравців...", (255, 255, 255))
         screen.blit(wating_text, (WIDTH // 2 - 25, 20))
+        display.update()
+        full_redraw = True
 
-    display.update()
     clock.tick(60)
 
     keys = key.get_pressed()
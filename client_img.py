@@ -2,6 +2,7 @@ from pygame import *
 import socket
 import json
 from threading import Thread
+from functools import lru_cache
 import os
 
 # ---PYGAME НАЛАШТУВАННЯ ---
@@ -41,15 +42,24 @@ def receive():
 # --- ШРИФТИ ---
 font_win = font.Font(None, 72)
 font_main = font.Font(None, 36)
+font_countdown = font.Font(None, 72)
+
+
+# Готові написи: рахунок і відлік рендеряться заново лише тоді, коли змінюється текст
+@lru_cache(maxsize=64)
+def render_text(text_font, text, color):
+    return text_font.render(text, True, color)
+
 
 # === ЗАВАНТАЖЕННЯ ЗОБРАЖЕНЬ ===
 # Функція для безпечного завантаження зображень з обробкою помилок
-def load_image_safe(path, size=None):
+def load_image_safe(path, size=None, alpha=True):
     try:
         img = image.load(path)
         if size:
             img = transform.scale(img, size)
-        return img.convert_alpha()  # convert_alpha() для прозорості та швидкості
+        # convert_alpha() лише там, де потрібна прозорість; непрозорі фони малюються швидше після convert()
+        return img.convert_alpha() if alpha else img.convert()
     except:
         print(f"⚠️ Не вдалося завантажити {path}")
         return None
@@ -58,18 +68,18 @@ print("🎨 Завантажую зображення...")
 
 # === ЗАВАНТАЖЕННЯ ФОНОВИХ ЗОБРАЖЕНЬ ===
 # Фон основної гри
-game_bg = load_image_safe('images/backgrounds/game_bg.jpg', (WIDTH, HEIGHT))
+game_bg = load_image_safe('images/backgrounds/game_bg.jpg', (WIDTH, HEIGHT), alpha=False)
 if game_bg is None:
     # Якщо не вдалося завантажити, використовуємо старий фон
     try:
         game_bg = image.load('images/backgrounds/game_bg.jpg')
-        game_bg = transform.scale(game_bg, (WIDTH, HEIGHT))
+        game_bg = transform.scale(game_bg, (WIDTH, HEIGHT)).convert()
     except:
         print("⚠️ Фонове зображення не знайдено")
         game_bg = None
 
 # Фон екрану перемоги
-win_bg = load_image_safe('images/backgrounds/win_bg.jpg', (800, 600))
+win_bg = load_image_safe('images/backgrounds/win_bg.jpg', (800, 600), alpha=False)
 
 # === ЗАВАНТАЖЕННЯ ІГРОВИХ ЕЛЕМЕНТІВ ===
 # М'яч - тепер це зображення замість білого кола
@@ -83,6 +93,15 @@ paddle2_img = load_image_safe('images/game_elements/paddle2.png', (20, 100))
 
 print("✅ Завантаження зображень завершено!")
 
+
+def restore_background(rect=None):
+    """Повертає фон на всьому екрані або лише в ділянці rect"""
+    rect = rect or screen.get_rect()
+    if game_bg:
+        screen.blit(game_bg, rect, rect)
+    else:
+        screen.fill((30, 30, 30), rect)  # Темний фон як резерв
+
 # --- ЗВУКИ ---
 # (Тут можна додати завантаження звукових файлів)
 
@@ -90,6 +109,9 @@ print("✅ Завантаження зображень завершено!")
 game_over = False
 winner = None
 you_winner = None
+# Під час гри стираємо і оновлюємо на екрані лише ділянки, намальовані минулого кадру
+dirty_rects = []
+full_redraw = True
 my_id, game_state, buffer, client = connect_to_server()
 Thread(target=receive, daemon=True).start()
 
@@ -97,16 +119,14 @@ while True:
     for e in event.get():
         if e.type == QUIT:
             exit()
-
-    # === ВІДОБРАЖЕННЯ ФОНУ ===
-    if game_bg:
-        screen.blit(game_bg, (0, 0))
-    else:
-        screen.fill((30, 30, 30))  # Темний фон як резерв
+        if e.type == VIDEOEXPOSE:
+            full_redraw = True
 
     # === ЕКРАН ВІДЛІКУ ===
     if "countdown" in game_state and game_state["countdown"] > 0:
-        countdown_text = font.Font(None, 72).render(str(game_state["countdown"]), True, (255, 255, 255))
+        restore_background()
+        full_redraw = True
+        countdown_text = render_text(font_countdown, str(game_state["countdown"]), (255, 255, 255))
         screen.blit(countdown_text, (WIDTH // 2 - 20, HEIGHT // 2 - 30))
         display.update()
         continue  # Не малюємо гру до завершення відліку
@@ -118,6 +138,7 @@ while True:
             screen.blit(win_bg, (0, 0))
         else:
             screen.fill((20, 20, 20))
+        full_redraw = True
 
         if you_winner is None:  # Встановлюємо тільки один раз
             if game_state["winner"] == my_id:
@@ -130,11 +151,11 @@ while True:
         else:
             text = "Пощастить наступним разом!"
 
-        win_text = font_win.render(text, True, (255, 215, 0))
+        win_text = render_text(font_win, text, (255, 215, 0))
         text_rect = win_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
         screen.blit(win_text, text_rect)
 
-        text = font_win.render('К - рестарт', True, (255, 215, 0))
+        text = render_text(font_win, 'К - рестарт', (255, 215, 0))
         text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 120))
         screen.blit(text, text_rect)
 
@@ -143,28 +164,45 @@ while True:
 
     # === ОСНОВНА ГРА ===
     if game_state:
+        # === СТИРАННЯ МИНУЛОГО КАДРУ ===
+        # Фон повертаємо лише під минулими ракетками, м'ячем і рахунком
+        if full_redraw:
+            restore_background()
+        else:
+            for rect in dirty_rects:
+                restore_background(rect)
+        new_rects = []
+
         # === МАЛЮВАННЯ РАКЕТОК ===
         # Ліва ракетка (гравець 0)
         if paddle1_img:
-            screen.blit(paddle1_img, (20, game_state['paddles']['0']))
+            new_rects.append(screen.blit(paddle1_img, (20, game_state['paddles']['0'])))
         else:
-            draw.rect(screen, (0, 255, 0), (20, game_state['paddles']['0'], 20, 100))
+            new_rects.append(draw.rect(screen, (0, 255, 0), (20, game_state['paddles']['0'], 20, 100)))
 
         # Права ракетка (гравець 1)
         if paddle2_img:
-            screen.blit(paddle2_img, (WIDTH - 40, game_state['paddles']['1']))
+            new_rects.append(screen.blit(paddle2_img, (WIDTH - 40, game_state['paddles']['1'])))
         else:
-            draw.rect(screen, (255, 0, 255), (WIDTH - 40, game_state['paddles']['1'], 20, 100))
+            new_rects.append(draw.rect(screen, (255, 0, 255), (WIDTH - 40, game_state['paddles']['1'], 20, 100)))
 
         # === МАЛЮВАННЯ М'ЯЧА ===
         if ball_img:
-            screen.blit(ball_img, (game_state['ball']['x'] - 10, game_state['ball']['y'] - 10))
+            new_rects.append(screen.blit(ball_img, (game_state['ball']['x'] - 10, game_state['ball']['y'] - 10)))
         else:
-            draw.circle(screen, (255, 255, 255), (game_state['ball']['x'], game_state['ball']['y']), 10)
+            new_rects.append(draw.circle(screen, (255, 255, 255), (game_state['ball']['x'], game_state['ball']['y']), 10))
 
         # === МАЛЮВАННЯ РАХУНКУ ===
-        score_text = font_main.render(f"{game_state['scores'][0]} : {game_state['scores'][1]}", True, (255, 255, 255))
-        screen.blit(score_text, (WIDTH // 2 -25, 20))
+        score_text = render_text(font_main, f"{game_state['scores'][0]} : {game_state['scores'][1]}", (255, 255, 255))
+        new_rects.append(screen.blit(score_text, (WIDTH // 2 -25, 20)))
+
+        # === ОНОВЛЕННЯ ЕКРАНУ: ЛИШЕ СТАРІ І НОВІ ДІЛЯНКИ ===
+        if full_redraw:
+            display.update()
+        else:
+            display.update(dirty_rects + new_rects)
+        dirty_rects = new_rects
+        full_redraw = False
 
         # === ЗВУКОВІ ПОДІЇ (БЕЗ ВІЗУАЛЬНИХ ЕФЕКТІВ) ===
         if game_state['sound_event']:
@@ -177,10 +215,12 @@ while True:
 
     else:
         # === ЕКРАН ОЧІКУВАННЯ ===
-        waiting_text = font_main.render(f"Очікування гравців...", True, (255, 255, 255))
+        restore_background()
+        waiting_text = render_text(font_main, f"Очікування гравців...", (255, 255, 255))
         screen.blit(waiting_text, (WIDTH // 2 - 125, HEIGHT // 2))
+        display.update()
+        full_redraw = True
 
-    display.update()
     clock.tick(60)
 
     # Управління (без змін)
@@ -0,0 +1,224 @@
+"""
+Кеш зображень клієнта.
+
+Замість того щоб на кожному запуску декодувати JPG/PNG і масштабувати їх,
+усі картинки один раз готуються у файл images/assets.cache: фони — вже
+потрібного розміру і без прозорості, спрайти (м'яч, ракетки) — разом в одному
+атласі з прозорістю. Клієнт читає файл одним read(), переводить пікселі у
+формат екрана (convert для фонів, convert_alpha лише для атласу) і звіряє час
+зміни джерел: якщо якусь картинку замінили, кеш перебудовується сам.
+
+AssetLoader вантажить ресурси у фонових потоках, щоб вікно відповідало одразу.
+
+    python assets.py          # зібрати кеш заздалегідь
+    python assets.py --force  # перебудувати, навіть якщо він свіжий
+"""
+import argparse
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter
+
+from pygame import image, transform, Surface, SRCALPHA
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "images", "assets.cache")
+CACHE_VERSION = 1
+MAGIC = b"PONGASET"
+HEADER = struct.Struct("!8sI")  # MAGIC, довжина JSON-індексу
+
+SCREEN_SIZE = (800, 600)
+# Фони на весь екран — непрозорі
+BACKGROUNDS = {
+    "menu_bg": "images/backgrounds/menu_bg.jpg",
+    "game_bg": "images/backgrounds/game_bg.jpg",
+    "settings_bg": "images/backgrounds/settings_bg.jpg",
+    "win_bg": "images/backgrounds/win_bg.jpg",
+}
+# Спрайти з прозорістю — складаються в один атлас
+SPRITES = {
+    "ball": ("images/game_elements/ball.png", (20, 20)),
+    "paddle1": ("images/game_elements/paddle1.png", (20, 100)),
+    "paddle2": ("images/game_elements/paddle2.png", (20, 100)),
+}
+
+
+def spec_signature():
+    """Якщо змінився список картинок або їхні розміри, кеш теж застарів"""
+    return json.dumps([SCREEN_SIZE, BACKGROUNDS, SPRITES], sort_keys=True)
+
+
+def source_stamp(source):
+    """Час зміни і розмір файлу-джерела або None, якщо його немає"""
+    try:
+        stat = os.stat(os.path.join(BASE_DIR, source))
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_source(source, size):
+    """Декодує і масштабує одне джерело; повертає None при помилці"""
+    try:
+        return transform.scale(image.load(os.path.join(BASE_DIR, source)), size)
+    except Exception as e:
+        print(f"⚠️ Не вдалося завантажити {source}: {e}")
+        return None
+
+
+def build_cache(path=CACHE_PATH):
+    """
+    Готує пікселі всіх картинок і пише їх у файл path (якщо path не None).
+    Повертає (індекс, дані) — те саме, що read_cache.
+    """
+    sources = {}
+    images = {}
+    data = bytearray()
+
+    for name, source in BACKGROUNDS.items():
+        sources[source] = source_stamp(source)
+        surface = load_source(source, SCREEN_SIZE)
+        if surface is None:
+            continue
+        images[name] = {"offset": len(data), "size": list(SCREEN_SIZE)}
+        data += image.tobytes(surface, "RGB")
+
+    sprites = {}
+    loaded = []
+    for name, (source, size) in SPRITES.items():
+        sources[source] = source_stamp(source)
+        surface = load_source(source, size)
+        if surface is not None:
+            loaded.append((name, surface))
+    # Атлас — спрайти в один ряд
+    atlas_size = [sum(s.get_width() for _, s in loaded), max((s.get_height() for _, s in loaded), default=0)]
+    atlas = {"offset": len(data), "size": atlas_size, "sprites": sprites}
+    if loaded:
+        sheet = Surface(atlas_size, SRCALPHA)
+        x = 0
+        for name, surface in loaded:
+            sheet.blit(surface, (x, 0))
+            sprites[name] = [x, 0, surface.get_width(), surface.get_height()]
+            x += surface.get_width()
+        data += image.tobytes(sheet, "RGBA")
+
+    index = {"version": CACHE_VERSION, "spec": spec_signature(), "sources": sources,
+             "images": images, "atlas": atlas}
+    if path:
+        write_cache(path, index, data)
+    return index, bytes(data)
+
+
+def write_cache(path, index, data):
+    encoded = json.dumps(index).encode()
+    temporary = path + ".tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(encoded)) + encoded)
+            f.write(data)
+        os.replace(temporary, path)  # Клієнт ніколи не побачить напівзаписаний кеш
+    except OSError as e:
+        print(f"⚠️ Не вдалося зберегти кеш зображень {path}: {e}")
+
+
+def read_cache(path=CACHE_PATH):
+    """Читає кеш одним read(); повертає (індекс, дані) або None, якщо кешу немає чи він застарів"""
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+        magic, index_size = HEADER.unpack_from(content)
+        if magic != MAGIC:
+            return None
+        index = json.loads(content[HEADER.size:HEADER.size + index_size])
+    except (OSError, ValueError, struct.error):
+        return None
+    if index.get("version") != CACHE_VERSION or index.get("spec") != spec_signature():
+        return None
+    if any(source_stamp(source) != stamp for source, stamp in index["sources"].items()):
+        return None
+    return index, memoryview(content)[HEADER.size + index_size:]
+
+
+def to_surfaces(index, data):
+    """Пікселі з кешу -> поверхні у форматі екрана (потрібне вже відкрите вікно)"""
+    surfaces = {}
+    for name, entry in index["images"].items():
+        width, height = entry["size"]
+        pixels = data[entry["offset"]:entry["offset"] + width * height * 3]
+        surfaces[name] = image.frombuffer(pixels, (width, height), "RGB").convert()
+
+    atlas = index["atlas"]
+    if atlas["sprites"]:
+        width, height = atlas["size"]
+        pixels = data[atlas["offset"]:atlas["offset"] + width * height * 4]
+        sheet = image.frombuffer(pixels, (width, height), "RGBA").convert_alpha()
+        for name, rect in atlas["sprites"].items():
+            surfaces[name] = sheet.subsurface(rect)
+    return surfaces
+
+
+def load_images(path=CACHE_PATH):
+    """Усі картинки клієнта за назвою; відсутні картинки просто не потрапляють у словник"""
+    cache = read_cache(path)
+    if cache is None:
+        print("🛠️ Кеш зображень відсутній або застарів — збираю новий...")
+        cache = build_cache(path)
+    return to_surfaces(*cache)
+
+
+class AssetLoader:
+    """
+    Завантажує ресурси на кількох потоках. Головний цикл не чекає: щокадру забирає
+    те, що вже готове, через take_ready(), а решта поки що малюється без картинок і звуків.
+    """
+
+    def __init__(self, workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.futures = {}
+        self.taken = set()
+        self.started = perf_counter()
+        self.elapsed = None
+
+    def submit(self, name, function, *args):
+        self.futures[name] = self.pool.submit(function, *args)
+
+    def ready(self, *names):
+        """Чи готові ресурси names (без аргументів — усі)"""
+        return all(self.futures[name].done() for name in names or self.futures)
+
+    def take_ready(self, block=False):
+        """Пари (назва, результат) ресурсів, що завантажились після минулого виклику"""
+        pending = [future for name, future in self.futures.items() if name not in self.taken]
+        if block:
+            wait(pending)
+        loaded = []
+        for name, future in self.futures.items():
+            if name in self.taken or not future.done():
+                continue
+            self.taken.add(name)
+            try:
+                loaded.append((name, future.result()))
+            except Exception as e:
+                print(f"⚠️ Не вдалося завантажити {name}: {e}")
+                loaded.append((name, None))
+        if self.elapsed is None and len(self.taken) == len(self.futures):
+            self.elapsed = perf_counter() - self.started
+        return loaded
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Збирає кеш зображень клієнта")
+    parser.add_argument("--output", default=CACHE_PATH, help="Файл кешу")
+    parser.add_argument("--force", action="store_true", help="Перебудувати навіть свіжий кеш")
+    args = parser.parse_args()
+
+    if not args.force and read_cache(args.output) is not None:
+        print(f"✅ Кеш {args.output} свіжий")
+    else:
+        index, data = build_cache(args.output)
+        count = len(index["images"]) + len(index["atlas"]["sprites"])
+        print(f"✅ Кеш {args.output}: {count} зображень, {len(data) / 1024 / 1024:.1f} МБ")
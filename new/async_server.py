@@ -0,0 +1,620 @@
+import argparse
+import asyncio
+import math
+import os
+import secrets
+import socket
+import time
+from collections import deque
+
+import metrics
+import protocol
+import simulation
+from connection import Connection
+from matchmaking import Matchmaker
+from recording import MatchRecorder, EXTENSION, MAX_COMMANDS
+from scheduler import TickScheduler
+from simulation import TICK_RATE
+
+GAME_OVER_DELAY = 5
+# Черга слухача: сплеск із тисяч підключень має вміститись, поки цикл їх розбирає
+DEFAULT_BACKLOG = 4096
+# Черга команд гравця: на скільки тіків вперед пам'ятаємо команди
+INPUT_QUEUE_TICKS = 8
+# Глядачі: id у вітанні, частота кадрів, ліміт на кімнату і скільки часу за раз
+# можна розсилати їм кадри, перш ніж дати пройти тіку гравців
+SPECTATOR_ID = -1
+SPECTATOR_RATE = 20
+MAX_SPECTATORS = 500
+SPECTATOR_TIME_BUDGET = 0.002
+SPECTATOR_HELLO_TIMEOUT = 5
+# Час розсилки міряємо для кожної N-ї кімнати — цього досить для гістограми і майже нічого не коштує
+BROADCAST_SAMPLE_EVERY = 16
+
+
+def max_inputs_per_tick(tick_rate):
+    """
+    Скільки команд гравця застосовувати за тік: клієнт шле їх з частотою кадрів (TICK_RATE),
+    тож на повільніших тіках їх приходить більше, плюс одна в запас на нерівномірну мережу.
+    Не більше, ніж вміщає один запис партії
+    """
+    return min(math.ceil(TICK_RATE / tick_rate) + 1, MAX_COMMANDS)
+
+
+class Room:
+    """
+    Одна партія на двох гравців.
+    Не має власних потоків і сну — її крокує спільний ігровий цикл сервера,
+    а вся фізика — це simulation.step над self.state.
+    """
+
+    def __init__(self, room_id, codec=protocol.CODEC_BINARY, tick_rate=TICK_RATE, seed=None):
+        self.room_id = room_id
+        self.tick_rate = tick_rate
+        self.seed = secrets.randbits(32) if seed is None else seed
+        self.codec = codec
+        self.encode = protocol.ENCODERS[codec]
+        self.history = protocol.SnapshotHistory()
+        self.json_frame = None
+        self.important_fields = None
+        self.connections = {0: None, 1: None}
+        self.max_inputs = max_inputs_per_tick(tick_rate)
+        queue_limit = self.max_inputs * INPUT_QUEUE_TICKS
+        self.inputs = {0: deque(maxlen=queue_limit), 1: deque(maxlen=queue_limit)}
+        self.last_input_seq = {0: None, 1: None}
+        self.applied_input_seq = {0: 0, 1: 0}
+        self.connected = {0: False, 1: False}
+        self.finished = False
+        self.ending = False
+        self.recorder = None
+        self.spectators = set()
+        self.spectator_tick = None
+        self.reset_game_state()
+
+    def reset_game_state(self):
+        self.state = simulation.new_game(self.seed, self.tick_rate)
+        if self.recorder:
+            self.recorder.start(self.seed, self.tick_rate)
+
+    @property
+    def tick(self):
+        return self.state.tick
+
+    @property
+    def game_over(self):
+        return self.state.game_over
+
+    @property
+    def winner(self):
+        return self.state.winner
+
+    def add_player(self, connection):
+        """Садить гравця на вільне місце і повертає його id"""
+        pid = 0 if self.connections[0] is None else 1
+        connection.pid = pid
+        connection.room = self
+        self.connections[pid] = connection
+        self.connected[pid] = True
+        return pid
+
+    def handle_input(self, pid, seq, command):
+        """Ставить команду в чергу — застосує її наступний тік"""
+        last = self.last_input_seq[pid]
+        if seq is not None:
+            if last is not None and seq <= last:
+                return  # Дублікат або запізніла команда
+            self.last_input_seq[pid] = seq
+        self.inputs[pid].append((seq, command))
+
+    def take_inputs(self):
+        """Команди гравців на цей тік (не більше max_inputs на кожного)"""
+        if not self.inputs[0] and not self.inputs[1]:
+            return simulation.NO_INPUTS
+        commands = ([], [])
+        for pid, queue in self.inputs.items():
+            for _ in range(min(len(queue), self.max_inputs)):
+                seq, command = queue.popleft()
+                commands[pid].append(command)
+                if seq is not None:
+                    self.applied_input_seq[pid] = seq
+        return commands
+
+    def input_seq_pair(self):
+        """Номери останніх застосованих команд — клієнти звіряють з ними передбачення"""
+        return self.applied_input_seq[0], self.applied_input_seq[1]
+
+    def player_left(self, pid):
+        self.connected[pid] = False
+        if not self.game_over and self.is_started:
+            self.state = simulation.forfeit(self.state, pid)  # інший гравець автоматично виграє
+            if self.recorder:
+                self.recorder.forfeit(self.state, pid)
+            print(f"[{self.room_id}] Гравець {pid} відключився. Переміг гравець {1 - pid}.")
+
+    @property
+    def is_started(self):
+        return self.connections[0] is not None and self.connections[1] is not None
+
+    def update(self):
+        """
+        Один тік гри.
+        Повертає True, якщо стан треба розіслати гравцям
+        """
+        countdown = self.state.countdown
+        inputs = self.take_inputs()
+        self.state = simulation.step(self.state, inputs, self.tick_rate)
+        if self.recorder:
+            self.recorder.record(self.state, inputs)
+        # Під час відліку розсилаємо лише зміну числа, далі — кожен тік
+        return countdown <= 0 or self.state.countdown != countdown
+
+    def encode_state(self):
+        state = self.state
+        return self.encode(state.tick, state.paddles, state.ball, state.scores, state.countdown,
+                           state.winner if state.game_over else None, state.sound_event, self.input_seq_pair())
+
+    def snapshot_frame(self, baseline):
+        """Байти поточного знімка для клієнта з базою baseline"""
+        if self.json_frame is not None:
+            return self.json_frame
+        tick = self.history.tick
+        frame, keyframe = self.history.frame_for(baseline.base_for(tick))
+        baseline.sent(tick, keyframe)
+        return frame
+
+    def broadcast_state(self):
+        # Знімок кодується один раз (на кожну базу дельт), а з'єднання самі забирають
+        # найсвіжіший кадр, коли сокет готовий — повільний клієнт не гальмує тік
+        # Це найгарячіше місце сервера (кожна кімната щотіку), тому без зайвих викликів:
+        # поля знімка беруться прямо зі стану, а запис у сокети — в тому ж проході
+        reliable_frame = None
+        if self.codec == protocol.CODEC_BINARY:
+            tick = self.state.tick
+            fields = protocol.quantize_game_state(self.state, self.input_seq_pair())
+            self.history.push(tick, fields)
+            important = protocol.important_fields(fields)
+            if important != self.important_fields:
+                # Рахунок, відлік чи переможець змінились — UDP-клієнтам дублюємо через TCP
+                self.important_fields = important
+                reliable_frame = protocol.encode_keyframe(tick, fields)
+        else:
+            self.json_frame = self.encode_state()
+        for pid, connection in self.connections.items():
+            if connection and self.connected[pid]:
+                if connection.closed:
+                    self.player_left(pid)
+                    continue
+                if reliable_frame and connection.uses_udp:
+                    connection.send(reliable_frame)
+                connection.offer_snapshot()
+                connection.flush(self)
+
+    def spectator_frame(self):
+        """Кадр для глядачів: ключовий, щоб усі могли отримати ті самі байти"""
+        if self.codec == protocol.CODEC_JSON:
+            return self.json_frame
+        if self.history.tick is None:
+            return None
+        return self.history.frame_for(None)[0]
+
+    def send_to_spectators(self):
+        frame = self.spectator_frame()
+        if frame is None or self.spectator_tick == self.tick:
+            return
+        self.spectator_tick = self.tick
+        for spectator in list(self.spectators):
+            if spectator.closed:
+                self.spectators.discard(spectator)
+            elif spectator.writable():
+                spectator.write(frame)
+                spectator.frames_sent += 1
+            else:
+                # Повільний глядач просто пропускає кадр
+                spectator.frames_replaced += 1
+
+    def flush(self):
+        for pid, connection in self.connections.items():
+            if connection and self.connected[pid]:
+                if connection.closed:
+                    self.player_left(pid)
+                else:
+                    connection.flush(self)
+
+    def close(self):
+        if self.recorder:
+            self.recorder.close()
+        for spectator in self.spectators:
+            spectator.close()
+        self.spectators.clear()
+        for pid, connection in self.connections.items():
+            if connection:
+                connection.close()
+            self.connections[pid] = None
+            self.connected[pid] = False
+
+
+class UdpEndpoint(asyncio.DatagramProtocol):
+    """UDP-сокет сервера: знімки до клієнтів, команди і підтвердження від них"""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            frames = protocol.split_frames(bytearray(data))
+        except (protocol.ProtocolError, ValueError):
+            return  # Биті датаграми просто ігноруємо
+        self.server.handle_datagram(frames, addr)
+
+
+class AsyncGameServer:
+    """
+    Сервер на одному циклі asyncio, що тримає тисячі кімнат одночасно.
+    Приймання, читання і запис — неблокуючі, а всі кімнати крокує один спільний тік.
+    """
+
+    def __init__(self, host='localhost', port=8080, backlog=DEFAULT_BACKLOG, codec=protocol.CODEC_BINARY,
+                 tick_rate=TICK_RATE, udp=False, udp_port=None, record_dir=None,
+                 spectator_port=None, spectator_rate=SPECTATOR_RATE, metrics_port=None):
+        self.host = host
+        self.codec = codec
+        # UDP-порт окремий лише тоді, коли процесів кілька (див. supervisor.py)
+        self.udp_port = udp_port
+        # UDP має сенс лише для бінарних кадрів
+        self.udp_enabled = udp and codec == protocol.CODEC_BINARY
+        self.udp = None
+        self.udp_sessions = {}
+        self.udp_peers = {}
+        self.scheduler = TickScheduler(tick_rate)
+        self.port = port
+        self.backlog = backlog
+        self.rooms = {}
+        self.matchmaker = Matchmaker()
+        self.next_room_id = 0
+        # Куди писати партії для повтору (None — не записувати)
+        self.record_dir = record_dir
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+        # Глядачі підключаються на окремий порт і отримують кадри рідше за гравців
+        self.spectator_port = spectator_port
+        self.spectator_rate = spectator_rate
+        self.spectator_server = None
+        self.spectator_task = None
+        self.active_connections = 0
+        # Задачі, створені поза asyncio.start_server: цикл тримає на них лише слабкі посилання
+        self.background_tasks = set()
+        self.closed_bytes_sent = 0
+        self.broadcasts = 0
+        self.metrics_port = metrics_port
+        self.metrics = None
+        self.metrics_server = None
+        self.broadcast_histogram = None
+        if metrics_port is not None:
+            self.create_metrics()
+
+    def create_metrics(self):
+        registry = self.metrics = metrics.Registry()
+        stats = self.scheduler.stats
+        stats.histogram = registry.histogram("pong_tick_duration_seconds", "Тривалість тіку всіх кімнат")
+        # Замість очікування блокування в потоковому сервері тут — запізнення тіку в циклі asyncio
+        stats.lag_histogram = registry.histogram("pong_tick_lag_seconds", "Наскільки пізніше запланованого почався тік")
+        self.broadcast_histogram = registry.histogram(
+            "pong_broadcast_seconds", "Кодування і розсилка стану кімнати (кожна 16-та розсилка)")
+        registry.counter("pong_tick_overruns_total", "Тіки, довші за крок симуляції", lambda: stats.overruns)
+        registry.counter("pong_tick_dropped_steps_total", "Кроки, відкинуті через перевантаження",
+                         lambda: stats.dropped_steps)
+        registry.gauge("pong_rooms_active", "Кімнати, що зараз грають", lambda: len(self.rooms))
+        registry.gauge("pong_connections_active", "Підключені гравці", lambda: self.active_connections)
+        registry.gauge("pong_spectators_active", "Підключені глядачі",
+                       lambda: sum(len(room.spectators) for room in self.rooms.values()))
+        registry.gauge("pong_matchmaking_queue_length", "Гравці, що чекають на суперника", lambda: len(self.matchmaker))
+        registry.counter("pong_matches_total", "Складені пари гравців", lambda: self.matchmaker.stats.matches)
+        registry.summary("pong_matchmaking_wait_seconds", "Час очікування суперника", self.match_wait_summary)
+        registry.counter("pong_bytes_sent_total", "Байти, надіслані гравцям",
+                         lambda: self.closed_bytes_sent + sum(c.bytes_sent for c in self.player_connections()))
+        # Розподіл по клієнтах рахується в момент запиту, а не на кожному записі
+        clients = {"bytes": [], "buffer": [], "queue": []}
+        registry.distribution("pong_client_bytes_sent", "Байти, надіслані кожному гравцю", lambda: clients["bytes"])
+        registry.distribution("pong_client_send_buffer_bytes", "Непрочитані байти в буфері сокета гравця",
+                              lambda: clients["buffer"])
+        registry.distribution("pong_client_control_queue_length", "Службові повідомлення в черзі гравця",
+                              lambda: clients["queue"])
+
+        def collect_clients():
+            for values in clients.values():
+                values.clear()
+            for connection in self.player_connections():
+                if connection.closed:
+                    continue
+                clients["bytes"].append(connection.bytes_sent)
+                clients["buffer"].append(connection.writer.transport.get_write_buffer_size())
+                clients["queue"].append(len(connection.outgoing))
+        registry.on_collect(collect_clients)
+
+    def match_wait_summary(self):
+        stats = self.matchmaker.stats
+        quantiles = {p / 100: value for p, value in stats.percentiles().items()}
+        return quantiles, stats.total_wait, stats.matches * 2
+
+    def player_connections(self):
+        for connection in self.matchmaker.waiting:
+            yield connection
+        for room in self.rooms.values():
+            for connection in room.connections.values():
+                if connection is not None:
+                    yield connection
+
+    def start_room(self, first, second):
+        """Суперника знайдено — садимо обох у нову кімнату і починаємо гру"""
+        room = Room(self.next_room_id, self.codec, self.scheduler.tick_rate)
+        self.next_room_id += 1
+        self.rooms[room.room_id] = room
+        room.add_player(first)
+        room.add_player(second)
+        if self.record_dir:
+            room.recorder = MatchRecorder(self.recording_path(room))
+        room.reset_game_state()
+        print(f"[{room.room_id}] Гра почалась. Активних кімнат: {len(self.rooms)}")
+        return room
+
+    async def handle_connection(self, reader, writer):
+        udp_token = self.new_udp_token() if self.udp_enabled else None
+        connection = Connection(writer, udp_token=udp_token)
+        decoder = protocol.InputDecoder(self.codec)
+        self.active_connections += 1
+        if udp_token is not None:
+            self.udp_sessions[udp_token] = connection
+        # Хто прийшов першим, той гравець 0 і чекає на суперника в черзі
+        pair = self.matchmaker.join(connection)
+        pid = 0 if pair is None else 1
+        connection.send(protocol.encode_welcome(pid, self.codec, udp_token, self.udp_port))
+        if pair is not None:
+            self.start_room(*pair)
+
+        try:
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                commands = decoder.feed(data)
+                if connection.room is not None:
+                    for seq, command in commands:
+                        connection.room.handle_input(pid, seq, command)
+        except (ConnectionError, OSError, protocol.ProtocolError):
+            pass
+        finally:
+            self.forget_udp(connection)
+            if connection.room is None:
+                # Гравець пішов, не дочекавшись суперника
+                self.matchmaker.leave(connection)
+            else:
+                connection.room.player_left(pid)
+            self.active_connections -= 1
+            self.closed_bytes_sent += connection.bytes_sent
+            writer.close()
+
+    def recording_path(self, room):
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{room.room_id}{EXTENSION}"
+        return os.path.join(self.record_dir, name)
+
+    def find_spectated_room(self, line):
+        """Кімната з номером з рядка глядача або, якщо номера немає, будь-яка, де вже грають"""
+        text = line.strip()
+        if text:
+            rooms = [self.rooms.get(int(text))]
+        else:
+            rooms = self.rooms.values()
+        for room in rooms:
+            if room is not None and room.is_started and not room.finished:
+                return room
+        return None
+
+    async def handle_spectator(self, reader, writer):
+        room = None
+        connection = Connection(writer, pid=SPECTATOR_ID)
+        try:
+            # Глядач першим рядком надсилає номер кімнати (або порожній рядок)
+            line = await asyncio.wait_for(reader.readline(), SPECTATOR_HELLO_TIMEOUT)
+            room = self.find_spectated_room(line)
+            if room is None or len(room.spectators) >= MAX_SPECTATORS:
+                return
+            room.spectators.add(connection)
+            connection.send(protocol.encode_welcome(SPECTATOR_ID, self.codec))
+            # Від глядача більше нічого не чекаємо, крім відключення
+            while await reader.read(1024):
+                pass
+        except (asyncio.TimeoutError, ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            if room is not None:
+                room.spectators.discard(connection)
+            writer.close()
+
+    async def run_spectators(self):
+        """
+        Окремий від тіку гравців цикл розсилки глядачам.
+        Кадр кожної кімнати кодується один раз, а якщо глядачів дуже багато,
+        розсилка ділиться на частини, між якими встигає пройти тік гравців.
+        """
+        interval = 1 / self.spectator_rate
+        while True:
+            await asyncio.sleep(interval)
+            started = time.perf_counter()
+            for room in list(self.rooms.values()):
+                if room.spectators:
+                    room.send_to_spectators()
+                if time.perf_counter() - started > SPECTATOR_TIME_BUDGET:
+                    await asyncio.sleep(0)
+                    started = time.perf_counter()
+
+    async def start_spectators(self):
+        if self.spectator_port is None:
+            return
+        self.spectator_server = await asyncio.start_server(
+            self.handle_spectator, self.host, self.spectator_port, backlog=self.backlog, reuse_address=True)
+        self.spectator_task = asyncio.create_task(self.run_spectators())
+        print(f"👀 Глядачі на {self.host}:{self.spectator_port}, {self.spectator_rate} кадрів/с")
+
+    async def start_metrics(self):
+        if self.metrics is not None:
+            self.metrics_server = metrics.MetricsServer(self.metrics, port=self.metrics_port)
+            await self.metrics_server.start()
+
+    def new_udp_token(self):
+        while True:
+            token = secrets.randbits(32)
+            if token not in self.udp_sessions:
+                return token
+
+    def forget_udp(self, connection):
+        self.udp_sessions.pop(connection.udp_token, None)
+        if connection.udp_addr is not None:
+            self.udp_peers.pop(connection.udp_addr, None)
+
+    def handle_datagram(self, frames, addr):
+        session = self.udp_peers.get(addr)
+        for kind, payload in frames:
+            if kind == protocol.FRAME_HELLO and len(payload) == protocol.HELLO.size:
+                session = self.udp_sessions.get(protocol.HELLO.unpack(payload)[0])
+                if session is not None:
+                    session.attach_udp(self.udp.transport, addr)
+                    self.udp_peers[addr] = session
+            elif session is None:
+                continue
+            elif kind == protocol.FRAME_INPUT and len(payload) == protocol.INPUT.size:
+                if session.room is not None:
+                    session.room.handle_input(session.pid, *protocol.INPUT.unpack(payload))
+            elif kind == protocol.FRAME_ACK and len(payload) == protocol.ACK.size:
+                session.baseline.acknowledge(protocol.ACK.unpack(payload)[0])
+            elif kind == protocol.FRAME_KEYFRAME_REQUEST:
+                session.baseline.reset()
+
+    def finish_room(self, room):
+        if room.finished:
+            return
+        room.finished = True
+        self.rooms.pop(room.room_id, None)
+        for connection in room.connections.values():
+            if connection:
+                self.forget_udp(connection)
+        room.close()
+
+    def tick(self):
+        for room in list(self.rooms.values()):
+            if room.ending:
+                # Кадр з переможцем має дійти навіть до повільного клієнта
+                room.flush()
+                continue
+            if room.finished or not room.is_started:
+                continue
+            # Гра могла закінчитись і через відключення суперника
+            if room.state.game_over or room.update():
+                self.broadcasts += 1
+                if self.broadcast_histogram is not None and self.broadcasts % BROADCAST_SAMPLE_EVERY == 0:
+                    started = time.perf_counter()
+                    room.broadcast_state()
+                    self.broadcast_histogram.observe(time.perf_counter() - started)
+                else:
+                    room.broadcast_state()
+            if room.game_over:
+                room.ending = True
+                print(f"[{room.room_id}] Гравець {room.winner} переміг!")
+                asyncio.get_running_loop().call_later(GAME_OVER_DELAY, self.finish_room, room)
+
+    async def start_udp(self):
+        if not self.udp_enabled:
+            return
+        port = self.udp_port or self.port
+        self.udp = UdpEndpoint(self)
+        await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: self.udp, local_addr=(self.host, port))
+        print(f"📡 UDP для знімків і команд на {self.host}:{port}")
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port,
+                                            backlog=self.backlog, reuse_address=True)
+        print(f"🎮 Async server started on {self.host}:{self.port}")
+        await self.start_udp()
+        await self.start_spectators()
+        await self.start_metrics()
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.scheduler.run_async(self.tick))
+
+    def receive_handoff(self, channel):
+        """Супервізор передав пару вже прийнятих сокетів — вони грають в одній кімнаті"""
+        try:
+            _, fds, _, _ = socket.recv_fds(channel, 16, 2)
+        except (BlockingIOError, InterruptedError):
+            return
+        if fds:
+            self.spawn(self.start_pair([socket.socket(fileno=fd) for fd in fds]))
+
+    async def start_pair(self, socks):
+        streams = []
+        for sock in socks:
+            sock.setblocking(False)
+            streams.append(await asyncio.open_connection(sock=sock))
+        # Обидва з'єднання стартують підряд, тож черга складе з них одну пару
+        for reader, writer in streams:
+            self.spawn(self.handle_connection(reader, writer))
+
+    def spawn(self, coroutine):
+        """Запускає задачу і тримає посилання на неї, доки вона не завершиться"""
+        task = asyncio.create_task(coroutine)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def serve_handoff(self, channel):
+        """Робочий процес: без власного слухача, гравців приносить супервізор"""
+        channel.setblocking(False)
+        asyncio.get_running_loop().add_reader(channel.fileno(), self.receive_handoff, channel)
+        await self.start_udp()
+        await self.start_metrics()
+        await self.scheduler.run_async(self.tick)
+
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("\n👋 Сервер зупинено користувачем")
+            print(f"⏱️ {self.scheduler.stats.summary()}")
+            print(f"🤝 {self.matchmaker.stats.summary()}")
+
+
+def build_arg_parser(description="Сервер пінг-понгу на багато кімнат"):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG, help="Довжина черги слухача")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="Частота симуляції, тіків за секунду")
+    parser.add_argument("--udp", action="store_true", help="Дозволити клієнтам отримувати знімки через UDP")
+    parser.add_argument("--json", action="store_true", help="JSON-рядки замість бінарних кадрів (для налагодження)")
+    parser.add_argument("--record", metavar="DIR", help="Записувати кожну партію в цю папку для повтору")
+    parser.add_argument("--spectator-rate", type=int, default=SPECTATOR_RATE, help="Кадрів за секунду для глядачів")
+    return parser
+
+
+def server_options(args):
+    """Параметри AsyncGameServer з аргументів командного рядка"""
+    return {
+        "codec": protocol.CODEC_JSON if args.json else protocol.CODEC_BINARY,
+        "tick_rate": args.tick_rate,
+        "udp": args.udp,
+        "record_dir": args.record,
+        "spectator_rate": args.spectator_rate,
+    }
+
+
+if __name__ == "__main__":
+    parser = build_arg_parser()
+    parser.add_argument("--spectator-port", type=int, default=None, help="Порт для глядачів (типово вимкнено)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Локальний порт з метриками для Prometheus (типово вимкнено)")
+    args = parser.parse_args()
+    AsyncGameServer(args.host, args.port, args.backlog, spectator_port=args.spectator_port,
+                    metrics_port=args.metrics_port, **server_options(args)).run()
@@ -0,0 +1,196 @@
+"""
+Пакетна симуляція тисяч партій одночасно на NumPy.
+
+Стан N кімнат зберігається в неперервних масивах, а відбиття від стінок,
+зіткнення з ракетками, голи і повторна подача м'яча — це операції над масивами.
+Правила і генератор випадковості ті самі, що в simulation.step, тож кімната з тим самим
+зерном і тими самими командами дає той самий результат, що й звичайна симуляція.
+
+Потрібен numpy (pip install numpy); серверу і клієнту він не потрібен.
+"""
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("Для пакетної симуляції потрібен numpy: pip install numpy") from None
+
+from protocol import INPUT_UP, INPUT_DOWN, SOUND_CODES
+from simulation import (
+    WIDTH, HEIGHT, TICK_RATE, BALL_SPEED, PADDLE_SPEED, PADDLE_HEIGHT, PADDLE_MIN_Y, PADDLE_MAX_Y,
+    PADDLE_START_Y, LEFT_PADDLE_X, RIGHT_PADDLE_X, WALL_TOP, WIN_SCORE, COUNTDOWN_START, MAX_BOUNCES,
+    GameState
+)
+
+WALL_HIT = SOUND_CODES["wall_hit"]
+PLATFORM_HIT = SOUND_CODES["platform_hit"]
+
+
+def xorshift32(rng):
+    """Той самий крок генератора, що simulation.next_random, але для масиву uint32"""
+    rng = rng ^ (rng << np.uint32(13))
+    rng = rng ^ (rng >> np.uint32(17))
+    rng = rng ^ (rng << np.uint32(5))
+    return rng
+
+
+def time_of_impact(start, end, line):
+    """Те саме, що simulation.time_of_impact, але для масивів"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.maximum(0.0, (start - line) / (start - end))
+    return np.where(start == end, 0.0, t)
+
+
+class BatchSimulation:
+    def __init__(self, seeds, tick_rate=TICK_RATE, skip_countdown=False):
+        """
+        seeds — зерна кімнат (по одному на кімнату)
+        skip_countdown — починати одразу з гри, без відліку (зручно для навчання ботів)
+        """
+        seeds = np.asarray(seeds, dtype=np.uint64) & 0xFFFFFFFF
+        self.count = len(seeds)
+        self.tick_rate = tick_rate
+        self.dt = TICK_RATE / tick_rate
+        self.skip_countdown = skip_countdown
+
+        n = self.count
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.paddles = np.zeros((n, 2), dtype=np.int64)
+        self.ball_x = np.zeros(n)
+        self.ball_y = np.zeros(n)
+        self.ball_vx = np.zeros(n)
+        self.ball_vy = np.zeros(n)
+        self.scores = np.zeros((n, 2), dtype=np.int64)
+        self.countdown = np.zeros(n, dtype=np.int64)
+        self.countdown_ticks = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, -1, dtype=np.int64)
+        self.sound_event = np.zeros(n, dtype=np.int8)
+        self.rng = np.zeros(n, dtype=np.uint32)
+        self.reset(np.ones(n, dtype=bool), seeds)
+
+    def reset(self, mask, seeds):
+        """Починає нові партії в кімнатах mask із зернами seeds (по одному на кожну кімнату з mask)"""
+        seeds = np.asarray(seeds, dtype=np.uint64) & 0xFFFFFFFF
+        rng = seeds.astype(np.uint32)
+        rng[rng == 0] = 0x9E3779B9  # Нульове зерно xorshift не підходить
+        self.rng[mask] = rng
+        self.tick[mask] = 0
+        self.paddles[mask] = PADDLE_START_Y
+        self.scores[mask] = 0
+        self.countdown[mask] = 0 if self.skip_countdown else COUNTDOWN_START
+        self.countdown_ticks[mask] = self.tick_rate
+        self.game_over[mask] = False
+        self.winner[mask] = -1
+        self.sound_event[mask] = 0
+        self.serve_ball(mask)
+
+    def serve_ball(self, mask):
+        rng = xorshift32(self.rng[mask])
+        self.ball_vx[mask] = np.where(rng & 1, BALL_SPEED, -BALL_SPEED)
+        rng = xorshift32(rng)
+        self.ball_vy[mask] = np.where(rng & 1, BALL_SPEED, -BALL_SPEED)
+        self.rng[mask] = rng
+        self.ball_x[mask] = WIDTH // 2
+        self.ball_y[mask] = HEIGHT // 2
+
+    def step(self, inputs=None):
+        """
+        Один тік для всіх кімнат
+        inputs — масив (N, 2) команд INPUT_NONE/INPUT_UP/INPUT_DOWN або None
+        """
+        self.tick += 1
+        self.sound_event[:] = 0
+
+        if inputs is not None:
+            inputs = np.asarray(inputs)
+            self.paddles = np.where(inputs == INPUT_UP, np.maximum(PADDLE_MIN_Y, self.paddles - PADDLE_SPEED),
+                                    self.paddles)
+            self.paddles = np.where(inputs == INPUT_DOWN, np.minimum(PADDLE_MAX_Y, self.paddles + PADDLE_SPEED),
+                                    self.paddles)
+
+        active = ~self.game_over
+        counting = active & (self.countdown > 0)
+        self.countdown_ticks[counting] -= 1
+        counted = counting & (self.countdown_ticks <= 0)
+        self.countdown[counted] -= 1
+        self.countdown_ticks[counted] = self.tick_rate
+
+        moving = active & ~counting
+        self.sweep_ball(moving)
+        x = self.ball_x
+
+        left_goal = moving & (x < 0)
+        right_goal = moving & (x > WIDTH)
+        self.scores[left_goal, 1] += 1
+        self.scores[right_goal, 0] += 1
+        scored = left_goal | right_goal
+        if scored.any():
+            self.serve_ball(scored)
+
+        won0 = moving & (self.scores[:, 0] >= WIN_SCORE)
+        won1 = moving & ~won0 & (self.scores[:, 1] >= WIN_SCORE)
+        self.game_over |= won0 | won1
+        self.winner[won0] = 0
+        self.winner[won1] = 1
+
+    def sweep_ball(self, moving):
+        """Безперервний рух м'яча з відбиттями — крок у крок як simulation.sweep_ball"""
+        x, y, vx, vy = self.ball_x, self.ball_y, self.ball_vx, self.ball_vy
+        paddle0, paddle1 = self.paddles[:, 0], self.paddles[:, 1]
+        remaining = np.full(self.count, self.dt)
+        bouncing = moving
+        for _ in range(MAX_BOUNCES):
+            nx = x + vx * remaining
+            ny = y + vy * remaining
+
+            top = bouncing & (vy < 0) & (ny <= WALL_TOP)
+            bottom = bouncing & (vy > 0) & (ny >= HEIGHT)
+            wall = top | bottom
+            t = np.where(top, time_of_impact(y, ny, WALL_TOP), 1.0)
+            t = np.where(bottom, time_of_impact(y, ny, HEIGHT), t)
+
+            left_t = time_of_impact(x, nx, LEFT_PADDLE_X)
+            left_y = y + (ny - y) * left_t
+            left = (bouncing & (vx < 0) & (x >= LEFT_PADDLE_X) & (nx <= LEFT_PADDLE_X) & (~wall | (left_t <= t)) &
+                    (paddle0 <= left_y) & (left_y <= paddle0 + PADDLE_HEIGHT))
+            right_t = time_of_impact(x, nx, RIGHT_PADDLE_X)
+            right_y = y + (ny - y) * right_t
+            right = (bouncing & (vx > 0) & (x <= RIGHT_PADDLE_X) & (nx >= RIGHT_PADDLE_X) & (~wall | (right_t <= t)) &
+                     (paddle1 <= right_y) & (right_y <= paddle1 + PADDLE_HEIGHT))
+            t = np.where(left, left_t, t)
+            t = np.where(right, right_t, t)
+            paddle = left | right
+            wall &= ~paddle
+            hit = wall | paddle
+
+            free = bouncing & ~hit
+            x = np.where(free, nx, np.where(hit, x + vx * remaining * t, x))
+            y = np.where(free, ny, np.where(hit, y + vy * remaining * t, y))
+            remaining = np.where(hit, remaining * (1.0 - t), remaining)
+            vy = np.where(wall, -vy, vy)
+            vx = np.where(paddle, -vx, vx)
+            self.sound_event[wall] = WALL_HIT
+            self.sound_event[paddle] = PLATFORM_HIT
+            bouncing = hit
+            if not bouncing.any():
+                break
+        else:
+            x = np.where(bouncing, x + vx * remaining, x)
+            y = np.where(bouncing, y + vy * remaining, y)
+        self.ball_x, self.ball_y, self.ball_vx, self.ball_vy = x, y, vx, vy
+
+    def state(self, index):
+        """Стан однієї кімнати як simulation.GameState (для перевірки і відображення)"""
+        sound = int(self.sound_event[index])
+        return GameState(
+            tick=int(self.tick[index]),
+            paddles=(int(self.paddles[index, 0]), int(self.paddles[index, 1])),
+            ball_x=float(self.ball_x[index]), ball_y=float(self.ball_y[index]),
+            ball_vx=int(self.ball_vx[index]), ball_vy=int(self.ball_vy[index]),
+            scores=(int(self.scores[index, 0]), int(self.scores[index, 1])),
+            countdown=int(self.countdown[index]),
+            countdown_ticks=int(self.countdown_ticks[index]),
+            game_over=bool(self.game_over[index]),
+            winner=None if self.winner[index] < 0 else int(self.winner[index]),
+            sound_event=None if sound == 0 else "wall_hit" if sound == WALL_HIT else "platform_hit",
+            rng=int(self.rng[index])
+        )
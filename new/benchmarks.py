@@ -0,0 +1,370 @@
+"""
+Бенчмарки сервера і клієнта.
+
+Міряє найгарячіші місця: кодування знімків і тік кімнати на сервері, крок фізики,
+розбір кадрів на клієнті і один кадр відмальовки updated_client.py (з фіктивним
+відеодрайвером SDL, тож вікно не потрібне). Результат — JSON, який можна зберегти
+як базовий і потім порівнювати з ним, щоб уповільнення було видно в числах.
+
+    python benchmarks.py --output baseline.json
+    python benchmarks.py --baseline baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import protocol
+import simulation
+from async_server import AsyncGameServer, Room
+from connection import Connection
+
+BENCHMARKS = {}
+# На скільки відсотків можна повільніше за базовий прогін, перш ніж це вважається регресією
+DEFAULT_THRESHOLD = 10
+
+
+def benchmark(name):
+    """Реєструє функцію підготовки: вона повертає операцію, яку треба заміряти"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class NullWriter:
+    """Замість сокета: приймає будь-які байти і нічого з ними не робить"""
+
+    def __init__(self):
+        self.transport = self
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+
+    def get_write_buffer_size(self):
+        return 0
+
+    def is_closing(self):
+        return False
+
+    def close(self):
+        pass
+
+
+def playing_state(seed=1):
+    """Стан партії одразу після відліку"""
+    state = simulation.new_game(seed)
+    state.countdown = 0
+    return state
+
+
+def sample_fields(tick=1000):
+    state = playing_state()
+    for _ in range(tick):
+        state = simulation.step(state)
+    return state, protocol.quantize_state(state.paddles, state.ball, state.scores, state.countdown,
+                                          None, state.sound_event, (tick, tick))
+
+
+@benchmark("protocol.encode_keyframe")
+def bench_encode_keyframe():
+    state, _ = sample_fields()
+
+    def run():
+        fields = protocol.quantize_state(state.paddles, state.ball, state.scores, state.countdown,
+                                         None, state.sound_event, (1, 1))
+        protocol.encode_keyframe(state.tick, fields)
+    return run
+
+
+@benchmark("protocol.encode_delta")
+def bench_encode_delta():
+    base_state, base_fields = sample_fields(1000)
+    state, fields = sample_fields(1003)
+    return lambda: protocol.encode_delta(state.tick, fields, base_state.tick, base_fields)
+
+
+@benchmark("protocol.encode_json")
+def bench_encode_json():
+    state, _ = sample_fields()
+    return lambda: protocol.encode_json_snapshot(state.tick, state.paddles, state.ball, state.scores,
+                                                 state.countdown, None, state.sound_event, (1, 1))
+
+
+def room_tick(codec):
+    room = Room(0, codec, seed=1)
+    for _ in range(2):
+        room.add_player(Connection(NullWriter()))
+    room.state = playing_state()
+
+    def run():
+        room.update()
+        if room.game_over:
+            # Нова партія, але номери тіків ідуть далі — від них рахуються дельти
+            tick = room.state.tick
+            room.state = playing_state()
+            room.state.tick = tick
+        room.broadcast_state()
+    return run
+
+
+@benchmark("server.room_tick.binary")
+def bench_room_tick_binary():
+    return room_tick(protocol.CODEC_BINARY)
+
+
+@benchmark("server.room_tick.json")
+def bench_room_tick_json():
+    return room_tick(protocol.CODEC_JSON)
+
+
+# Ціль сервера — стільки партій на одному ядрі за бюджет тіку 1/60 с
+SERVER_ROOMS = 2000
+
+
+@benchmark(f"server.tick.{SERVER_ROOMS}_rooms")
+def bench_server_tick():
+    # Увесь тік сервера з SERVER_ROOMS кімнатами; ns_per_op треба порівнювати з 16,7 мс
+    server = AsyncGameServer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for seed in range(1, SERVER_ROOMS + 1):
+            room = server.start_room(Connection(NullWriter()), Connection(NullWriter()))
+            room.state = playing_state(seed)
+    rooms = list(server.rooms.values())
+
+    def run():
+        for room in rooms:
+            if max(room.state.scores) >= simulation.WIN_SCORE - 1:
+                # Партія не має закінчитись посеред заміру — починаємо нову з тими ж номерами тіків
+                tick = room.state.tick
+                room.state = playing_state(tick)
+                room.state.tick = tick
+        server.tick()
+    return run
+
+
+@benchmark("simulation.step")
+def bench_simulation_step():
+    holder = [playing_state()]
+    inputs = ((protocol.INPUT_UP,), (protocol.INPUT_DOWN,))
+
+    def run():
+        state = simulation.step(holder[0], inputs)
+        holder[0] = playing_state() if state.game_over else state
+    return run
+
+
+@benchmark("simulation.batch_step_1000")
+def bench_batch_step():
+    try:
+        from batch_simulation import BatchSimulation
+    except ImportError:
+        return None
+    batch = BatchSimulation(range(1, 1001), skip_countdown=True)
+
+    def run():
+        batch.step()
+        if batch.game_over.any():
+            finished = batch.game_over.copy()
+            batch.reset(finished, range(int(finished.sum())))
+    return run
+
+
+def stream_chunk(codec, frames=4):
+    """Кілька кадрів поспіль — так їх зазвичай і приносить один recv()"""
+    state = playing_state()
+    history = protocol.SnapshotHistory()
+    baseline = protocol.DeltaBaseline()
+    chunk = b""
+    for _ in range(frames):
+        state = simulation.step(state)
+        if codec == protocol.CODEC_JSON:
+            chunk += protocol.encode_json_snapshot(state.tick, state.paddles, state.ball, state.scores,
+                                                   state.countdown, None, state.sound_event)
+            continue
+        history.push(state.tick, protocol.quantize_state(state.paddles, state.ball, state.scores,
+                                                         state.countdown, None, state.sound_event))
+        frame, keyframe = history.frame_for(baseline.base_for(state.tick))
+        baseline.sent(state.tick, keyframe)
+        chunk += frame
+    return chunk
+
+
+@benchmark("client.decode.binary")
+def bench_decode_binary():
+    chunk = stream_chunk(protocol.CODEC_BINARY)
+
+    def run():
+        decoder = protocol.FrameDecoder(protocol.CODEC_BINARY)
+        decoder.feed(chunk)
+    return run
+
+
+@benchmark("client.decode.json")
+def bench_decode_json():
+    chunk = stream_chunk(protocol.CODEC_JSON)
+
+    def run():
+        decoder = protocol.FrameDecoder(protocol.CODEC_JSON)
+        decoder.feed(chunk)
+    return run
+
+
+def load_client():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # Клієнт шукає картинки і звуки відносно своєї папки
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        import updated_client as client
+    except ImportError:
+        return None
+    client.apply_loaded_assets(block=True)
+    return client
+
+
+def render_frame(full):
+    client = load_client()
+    if client is None:
+        return None
+    ball = [100.0, 300.0]
+
+    def run():
+        ball[0] = 100.0 if ball[0] > 700 else ball[0] + 5
+        if full:
+            client.renderer.invalidate()
+        client.draw_game([250, 300], ball[0], ball[1], (3, 4))
+    return run
+
+
+@benchmark("client.render_frame")
+def bench_render_frame():
+    return render_frame(full=False)
+
+
+@benchmark("client.render_frame.full")
+def bench_render_frame_full():
+    # Для порівняння: весь фон і все вікно щокадру, як до відмальовки змінених ділянок
+    return render_frame(full=True)
+
+
+@benchmark("client.menu_frame")
+def bench_menu_frame():
+    client = load_client()
+    if client is None:
+        return None
+
+    def run():
+        client.draw_menu()
+        client.display.update()
+    return run
+
+
+@benchmark("client.load_images")
+def bench_load_images():
+    client = load_client()
+    if client is None:
+        return None
+    import assets
+    return assets.load_images
+
+
+@benchmark("client.load_images.decode")
+def bench_load_images_decode():
+    # Для порівняння: декодування і масштабування всіх JPG/PNG без кешу
+    client = load_client()
+    if client is None:
+        return None
+    import assets
+    return lambda: assets.to_surfaces(*assets.build_cache(None))
+
+
+def measure(operation, min_time=0.2, repeat=5):
+    """Найкращий і медіанний час однієї операції в наносекундах"""
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [total / number * 1e9 for total in timer.repeat(repeat, number)]
+    return {
+        "ns_per_op": min(times),
+        "median_ns": statistics.median(times),
+        "ops_per_sec": 1e9 / min(times),
+        "iterations": number * repeat,
+    }
+
+
+def run_benchmarks(selected=None, min_time=0.2, repeat=5):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(part in name for part in selected):
+            continue
+        operation = setup()
+        if operation is None:
+            print(f"⏭️ {name}: пропущено (немає залежностей)", file=sys.stderr)
+            continue
+        results[name] = measure(operation, min_time, repeat)
+        print(f"⏱️ {name}: {results[name]['ns_per_op']:.0f} нс", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Порівнює з базовим прогоном; повертає (рядки таблиці, назви регресій)"""
+    lines = [f"{'Бенчмарк':<32} {'база, нс':>12} {'зараз, нс':>12} {'зміна':>8}"]
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            lines.append(f"{name:<32} {'—':>12} {result['ns_per_op']:>12.0f} {'нове':>8}")
+            continue
+        change = (result["ns_per_op"] - base["ns_per_op"]) / base["ns_per_op"] * 100
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = " ⚠️"
+        lines.append(f"{name:<32} {base['ns_per_op']:>12.0f} {result['ns_per_op']:>12.0f} {change:>+7.1f}%{mark}")
+    return lines, regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки сервера і клієнта пінг-понгу")
+    parser.add_argument("names", nargs="*", help="Запустити лише бенчмарки, що містять ці підрядки")
+    parser.add_argument("--output", help="Зберегти результат у JSON-файл")
+    parser.add_argument("--baseline", help="JSON-файл попереднього прогону для порівняння")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Уповільнення у відсотках, яке вважається регресією")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Мінімальний час одного заміру, секунд")
+    parser.add_argument("--repeat", type=int, default=5, help="Скільки разів повторити замір")
+    args = parser.parse_args()
+    # Бенчмарк відмальовки переходить у папку клієнта — шляхи фіксуємо заздалегідь
+    output = args.output and os.path.abspath(args.output)
+    baseline_path = args.baseline and os.path.abspath(args.baseline)
+
+    report = run_benchmarks(args.names, args.min_time, args.repeat)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    if baseline_path:
+        with open(baseline_path) as f:
+            lines, regressions = compare(report, json.load(f), args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"❌ Регресії: {', '.join(regressions)}")
+            sys.exit(1)
+    elif not output:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,282 @@
+"""
+Безголові боти для навантажувального тестування сервера.
+
+Кожен бот — це звичайний клієнт без вікна: підключається, читає вітальний рядок
+з id гравця, розбирає знімки стану тим самим protocol.FrameDecoder, що й клієнт,
+і надсилає команди ракетки (за м'ячем, випадкові або жодних). Тисячі ботів живуть
+в одному циклі asyncio.
+
+Після прогону рахуються перцентилі p50/p95/p99: час підключення, інтервали між
+знімками та їх відхилення від очікуваного (джитер), байти за секунду і реальна
+частота тіків, яку бачить клієнт.
+
+    python bot_swarm.py --bots 2000 --duration 30 --ramp 500
+    python bot_swarm.py --bots 200 --mode random --json > report.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import protocol
+from matchmaking import percentile
+from simulation import TICK_RATE, PADDLE_HEIGHT
+
+MODES = ("follow", "random", "idle")
+CONNECT_TIMEOUT = 10
+READ_SIZE = 4096
+
+
+def summarize(values, scale=1):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": None if not values else percentile(values, 50) * scale,
+        "p95": None if not values else percentile(values, 95) * scale,
+        "p99": None if not values else percentile(values, 99) * scale,
+    }
+
+
+class Bot:
+    def __init__(self, bot_id, host, port, mode="follow", input_rate=20, rng=None, clock=time.perf_counter):
+        self.bot_id = bot_id
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.input_rate = input_rate
+        self.rng = rng or random.Random(bot_id)
+        self.clock = clock
+
+        self.pid = None
+        self.codec = None
+        self.state = None
+        self.input_seq = 0
+        self.error = None
+        self.games = 0
+
+        self.connect_latency = []
+        self.first_snapshot_latency = []
+        self.intervals = []
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.snapshots = 0
+        self.started = None
+        self.finished = None
+        # Для частоти тіків: (час, тік) першого і останнього знімка кожної партії
+        self.tick_spans = []
+
+    async def run(self, deadline, reconnect=True):
+        """Грає, доки не настане deadline; після кінця партії підключається знову"""
+        self.started = self.clock()
+        try:
+            while self.clock() < deadline:
+                await self.play(deadline)
+                if not reconnect:
+                    break
+        except (OSError, asyncio.TimeoutError, ConnectionError, protocol.ProtocolError) as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.finished = self.clock()
+
+    async def play(self, deadline):
+        start = self.clock()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT)
+        try:
+            line = await asyncio.wait_for(reader.readline(), CONNECT_TIMEOUT)
+            if not line:
+                raise ConnectionError("Сервер закрив з'єднання")
+            self.pid, self.codec, _, _ = protocol.decode_welcome(line.rstrip(b"\n"))
+            self.connect_latency.append(self.clock() - start)
+            self.games += 1
+            self.state = None
+            encode_input = protocol.INPUT_ENCODERS[self.codec]
+            decoder = protocol.FrameDecoder(self.codec)
+
+            sender = asyncio.create_task(self.send_inputs(writer, encode_input))
+            try:
+                await self.receive(reader, decoder, start, deadline)
+            finally:
+                sender.cancel()
+        finally:
+            writer.close()
+
+    async def receive(self, reader, decoder, start, deadline):
+        last_arrival = None
+        first = last = None
+        while self.state is None or self.state.get("winner") is None:
+            timeout = deadline - self.clock()
+            if timeout <= 0:
+                break
+            try:
+                data = await asyncio.wait_for(reader.read(READ_SIZE), timeout)
+            except asyncio.TimeoutError:
+                break
+            if not data:
+                break
+            now = self.clock()
+            self.bytes_received += len(data)
+            for state in decoder.feed(data):
+                if self.state is None:
+                    self.first_snapshot_latency.append(now - start)
+                if last_arrival is not None:
+                    self.intervals.append(now - last_arrival)
+                last_arrival = now
+                self.snapshots += 1
+                self.state = state
+                tick = state.get("tick")
+                if tick is not None:
+                    first = first or (now, tick)
+                    last = (now, tick)
+        if first is not None and last[0] > first[0]:
+            self.tick_spans.append((first, last))
+
+    async def send_inputs(self, writer, encode_input):
+        period = 1 / self.input_rate
+        while True:
+            await asyncio.sleep(period)
+            command = self.choose_command()
+            if command == protocol.INPUT_NONE or writer.is_closing():
+                continue
+            self.input_seq += 1
+            data = encode_input(self.input_seq, command)
+            writer.write(data)
+            self.bytes_sent += len(data)
+
+    def choose_command(self):
+        if self.state is None or self.mode == "idle":
+            return protocol.INPUT_NONE
+        if self.mode == "random":
+            return self.rng.choice((protocol.INPUT_NONE, protocol.INPUT_UP, protocol.INPUT_DOWN))
+        # Тримаємо центр ракетки навпроти м'яча
+        paddle = self.state["paddles"][self.pid]
+        ball_y = self.state["ball"]["y"]
+        center = paddle + PADDLE_HEIGHT / 2
+        if ball_y < center - 10:
+            return protocol.INPUT_UP
+        if ball_y > center + 10:
+            return protocol.INPUT_DOWN
+        return protocol.INPUT_NONE
+
+    def tick_rates(self):
+        """Скільки тіків за секунду насправді бачив бот у кожній партії"""
+        return [(last_tick - first_tick) / (last_time - first_time)
+                for (first_time, first_tick), (last_time, last_tick) in self.tick_spans]
+
+
+class Swarm:
+    def __init__(self, host='localhost', port=8080, bots=100, duration=30, ramp=200, mode="follow",
+                 input_rate=20, tick_rate=TICK_RATE, seed=0, reconnect=True):
+        """
+        ramp — скільки нових підключень за секунду (щоб не завалити чергу слухача за мить)
+        tick_rate — очікувана частота сервера, з нею порівнюються інтервали між знімками
+        """
+        if mode not in MODES:
+            raise ValueError(f"Невідомий режим ботів: {mode}")
+        self.host = host
+        self.port = port
+        self.duration = duration
+        self.ramp = ramp
+        self.tick_rate = tick_rate
+        self.reconnect = reconnect
+        rng = random.Random(seed)
+        self.bots = [Bot(i, host, port, mode, input_rate, random.Random(rng.random())) for i in range(bots)]
+        self.elapsed = 0
+
+    async def run(self):
+        start = time.perf_counter()
+        deadline = start + self.duration
+        tasks = []
+        for i, bot in enumerate(self.bots):
+            delay = start + i / self.ramp - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(bot.run(deadline, self.reconnect)))
+        await asyncio.gather(*tasks)
+        self.elapsed = time.perf_counter() - start
+        return self.report()
+
+    def report(self):
+        bots = self.bots
+        expected = 1 / self.tick_rate
+        intervals = [interval for bot in bots for interval in bot.intervals]
+        bandwidth = [bot.bytes_received / (bot.finished - bot.started)
+                     for bot in bots if bot.finished and bot.finished > bot.started]
+        errors = [bot.error for bot in bots if bot.error]
+        return {
+            "bots": len(bots),
+            "duration": self.elapsed,
+            "games": sum(bot.games for bot in bots),
+            "errors": len(errors),
+            "first_errors": errors[:5],
+            "snapshots": sum(bot.snapshots for bot in bots),
+            "bytes_received": sum(bot.bytes_received for bot in bots),
+            "bytes_sent": sum(bot.bytes_sent for bot in bots),
+            "connect_latency_ms": summarize([t for bot in bots for t in bot.connect_latency], 1000),
+            "first_snapshot_ms": summarize([t for bot in bots for t in bot.first_snapshot_latency], 1000),
+            "interarrival_ms": summarize(intervals, 1000),
+            "jitter_ms": summarize([abs(interval - expected) for interval in intervals], 1000),
+            "bytes_per_second": summarize(bandwidth),
+            "tick_rate": summarize([rate for bot in bots for rate in bot.tick_rates()]),
+            "expected_tick_rate": self.tick_rate,
+        }
+
+
+def format_report(report):
+    lines = [
+        f"🤖 Ботів: {report['bots']}, партій: {report['games']}, помилок: {report['errors']}, "
+        f"час: {report['duration']:.1f} с",
+        f"📦 Знімків: {report['snapshots']}, отримано {report['bytes_received']} Б, "
+        f"надіслано {report['bytes_sent']} Б",
+    ]
+    rows = [
+        ("Підключення, мс", "connect_latency_ms"),
+        ("Перший знімок, мс", "first_snapshot_ms"),
+        ("Між знімками, мс", "interarrival_ms"),
+        ("Джитер, мс", "jitter_ms"),
+        ("Байт/с на бота", "bytes_per_second"),
+        (f"Тіків/с (очікується {report['expected_tick_rate']})", "tick_rate"),
+    ]
+    for title, key in rows:
+        stats = report[key]
+        values = ", ".join(f"{p}={'—' if stats[p] is None else f'{stats[p]:.2f}'}" for p in ("p50", "p95", "p99"))
+        lines.append(f"  {title:<32} {values}")
+    for error in report["first_errors"]:
+        lines.append(f"⚠️ {error}")
+    return "\n".join(lines)
+
+
+def raise_file_limit():
+    """Тисячам з'єднань потрібно більше файлових дескрипторів, ніж дозволено типово"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Рій ботів для навантажувального тестування сервера")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--bots", type=int, default=100, help="Кількість одночасних ботів")
+    parser.add_argument("--duration", type=float, default=30, help="Тривалість прогону, секунд")
+    parser.add_argument("--ramp", type=float, default=200, help="Нових підключень за секунду")
+    parser.add_argument("--mode", choices=MODES, default="follow", help="Як боти рухають ракетку")
+    parser.add_argument("--input-rate", type=float, default=20, help="Команд за секунду від кожного бота")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="Очікувана частота тіків сервера")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-reconnect", action="store_true", help="Не починати нову партію після кінця гри")
+    parser.add_argument("--json", action="store_true", help="Вивести звіт у JSON")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    swarm = Swarm(args.host, args.port, args.bots, args.duration, args.ramp, args.mode,
+                  args.input_rate, args.tick_rate, args.seed, not args.no_reconnect)
+    try:
+        result = asyncio.run(swarm.run())
+    except KeyboardInterrupt:
+        result = swarm.report()
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
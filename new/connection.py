@@ -0,0 +1,99 @@
+"""
+З'єднання гравця на сервері з неблокуючою чергою відправлення.
+
+Знімки стану не ставляться в чергу: з'єднання лише пам'ятає, що є новий знімок,
+і при наступній можливості записує найсвіжіший. Якщо клієнт не встигає читати,
+застарілі знімки просто замінюються новими, а ігровий тік ніколи на нього не чекає.
+
+Якщо клієнт обрав UDP, знімки йдуть датаграмами (доходить найсвіжіший — і добре),
+а TCP лишається надійним каналом для службових повідомлень.
+"""
+from collections import deque
+
+import protocol
+
+# Скільки байтів може лежати в буфері сокета, перш ніж ми перестанемо писати
+SEND_BUFFER_LIMIT = 4096
+# Максимум службових повідомлень у черзі; переповнення означає, що клієнт завис
+CONTROL_QUEUE_LIMIT = 32
+
+
+class Connection:
+    def __init__(self, writer, pid=None, udp_token=None):
+        self.writer = writer
+        self.pid = pid
+        self.room = None
+        self.udp_token = udp_token
+        self.udp_transport = None
+        self.udp_addr = None
+        self.baseline = protocol.DeltaBaseline()
+        self.outgoing = deque()
+        self.snapshot_pending = False
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.frames_replaced = 0
+
+    @property
+    def uses_udp(self):
+        return self.udp_addr is not None
+
+    def attach_udp(self, transport, addr):
+        """Клієнт прислав UDP-привітання: далі знімки йдуть датаграмами"""
+        if self.udp_addr == addr:
+            return
+        self.udp_transport = transport
+        self.udp_addr = addr
+        # Через UDP кадр вважається доставленим лише після підтвердження клієнта
+        self.baseline = protocol.DeltaBaseline(reliable=False)
+
+    @property
+    def closed(self):
+        return self.writer.is_closing()
+
+    def writable(self):
+        return self.writer.transport.get_write_buffer_size() < SEND_BUFFER_LIMIT
+
+    def send(self, data):
+        """Службове повідомлення (вітання тощо) — доставляється по черзі, без заміни"""
+        if len(self.outgoing) >= CONTROL_QUEUE_LIMIT:
+            print(f"⚠️ Клієнт {self.pid} не читає дані, закриваю з'єднання")
+            self.close()
+            return
+        self.outgoing.append(data)
+        self.flush()
+
+    def offer_snapshot(self):
+        if self.snapshot_pending:
+            self.frames_replaced += 1
+        self.snapshot_pending = True
+
+    def flush(self, room=None):
+        """Пише все, що влазить у буфер, не чекаючи на клієнта"""
+        writer = self.writer
+        if writer.is_closing():
+            return
+        outgoing = self.outgoing
+        while outgoing and self.writable():
+            self.write(outgoing.popleft())
+        if not self.snapshot_pending or room is None:
+            return
+        if self.udp_addr is not None:
+            frame = room.snapshot_frame(self.baseline)
+            self.udp_transport.sendto(frame, self.udp_addr)
+        elif not outgoing and writer.transport.get_write_buffer_size() < SEND_BUFFER_LIMIT:
+            frame = room.snapshot_frame(self.baseline)
+            writer.write(frame)
+        else:
+            return
+        self.bytes_sent += len(frame)
+        self.frames_sent += 1
+        self.snapshot_pending = False
+
+    def write(self, data):
+        self.writer.write(data)
+        self.bytes_sent += len(data)
+
+    def close(self):
+        self.outgoing.clear()
+        self.snapshot_pending = False
+        self.writer.close()
@@ -0,0 +1,126 @@
+"""
+Підключення до сервера у фоновому потоці.
+
+Головний цикл клієнта ніколи не чекає на мережу: Connector сам пробує
+підключитись, а між невдалими спробами чекає дедалі довше (експоненційна
+затримка з випадковим розкидом, щоб сотні клієнтів після падіння сервера
+не стукали в нього одночасно). Цикл лише щокадру питає poll(), чи є вже
+з'єднання, а кнопка «Назад» скасовує все через cancel().
+
+Таймаут стосується лише самого connect(): після підключення вітання чекаємо
+скільки завгодно (супервізор мовчить, доки не прийде другий гравець), а
+скасування розриває з'єднання, на якому висить очікування.
+"""
+import random
+import socket
+import threading
+import time
+
+# Скільки чекати на connect() за одну спробу
+CONNECT_TIMEOUT = 3.0
+BASE_DELAY = 0.5
+MAX_DELAY = 8.0
+
+
+def backoff_delay(attempt, base=BASE_DELAY, maximum=MAX_DELAY, rng=random):
+    """Пауза після attempt-ї невдалої спроби: подвоюється до maximum, випадково в межах [половина; ціла]"""
+    delay = min(maximum, base * 2 ** (attempt - 1))
+    return delay * (0.5 + rng.random() / 2)
+
+
+class Connector:
+    """
+    connect(timeout, watch) — функція, що підключається і повертає результат або кидає виняток;
+        timeout — для connect(), а щойно з'єднаний сокет вона передає у watch(sock),
+        щоб cancel() міг перервати очікування вітання;
+    discard(result) — що зробити з результатом, якщо підключення вже скасували (закрити сокети)
+    """
+
+    def __init__(self, connect, discard=None, timeout=CONNECT_TIMEOUT, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, rng=random):
+        self.connect = connect
+        self.discard = discard
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.result = None
+        self.attempts = 0
+        self.last_error = None
+        self.next_attempt_at = None
+        self.socket = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        while not self.cancelled.is_set():
+            self.attempts += 1
+            try:
+                result = self.connect(self.timeout, self.watch)
+            except Exception as e:
+                with self.lock:
+                    self.socket = None
+                if self.cancelled.is_set():
+                    return
+                delay = backoff_delay(self.attempts, self.base_delay, self.max_delay, self.rng)
+                print(f"❌ Помилка підключення (спроба {self.attempts}): {e}; наступна через {delay:.1f} с")
+                self.next_attempt_at = time.monotonic() + delay
+                self.last_error = e
+                self.cancelled.wait(delay)
+                continue
+            with self.lock:
+                self.socket = None
+                if not self.cancelled.is_set():
+                    self.result = result
+                    return
+            # Скасували, поки ми підключались
+            if self.discard:
+                self.discard(result)
+            return
+
+    def watch(self, sock):
+        """Сокет, на якому зараз чекаємо вітання; якщо вже скасували — одразу розриваємо"""
+        with self.lock:
+            self.socket = sock
+            cancelled = self.cancelled.is_set()
+        if cancelled:
+            self.interrupt(sock)
+
+    @staticmethod
+    def interrupt(sock):
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # recv() в іншому потоці одразу поверне b""
+        except OSError:
+            pass
+
+    def poll(self):
+        """Результат підключення (один раз) або None, якщо його ще немає"""
+        with self.lock:
+            result, self.result = self.result, None
+        return result
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled.set()
+            result, self.result = self.result, None
+            sock, self.socket = self.socket, None
+        if sock is not None:
+            self.interrupt(sock)
+        if result is not None and self.discard:
+            self.discard(result)
+
+    def status(self):
+        """Короткий опис стану для екрана підключення"""
+        if self.socket is not None:
+            return "Підключено, очікування суперника..."
+        if self.last_error is None:
+            return f"Спроба {self.attempts}..."
+        left = max(0.0, (self.next_attempt_at or 0) - time.monotonic())
+        if left > 0:
+            return f"Спроба {self.attempts} не вдалась, наступна через {left:.1f} с"
+        return f"Спроба {self.attempts}..."
@@ -0,0 +1,123 @@
+"""
+Буфер знімків для плавного відображення на клієнті.
+
+Знімки складаються з мітками серверного часу (номер тіку), а кадр малюється
+трохи «в минулому» — з затримкою, що підлаштовується під тремтіння мережі.
+Між двома знімками позиції інтерполюються, а коли новий знімок запізнюється,
+м'яч ще трохи рухається за своєю швидкістю (екстраполяція).
+"""
+import threading
+import time
+from collections import deque
+
+from simulation import TICK_RATE
+
+BUFFER_SIZE = 32
+# М'яч, що стрибнув далі, ніж на стільки пікселів, — це новий розіграш, а не рух
+TELEPORT_DISTANCE = 100
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+class SnapshotBuffer:
+    def __init__(self, min_delay=0.033, max_delay=0.25, max_extrapolation=0.1, clock=time.perf_counter):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_extrapolation = max_extrapolation
+        self.clock = clock
+        self.snapshots = deque(maxlen=BUFFER_SIZE)  # (серверний час, стан)
+        self.lock = threading.Lock()
+        self.tick_interval = 1 / TICK_RATE
+        self.first = None  # (тік, локальний час) для оцінки частоти сервера
+        self.offset = None  # Локальний час мінус серверний для найшвидшого знімка
+        self.jitter = 0.0
+        self.delay = min_delay
+
+    def clear(self):
+        with self.lock:
+            self.snapshots.clear()
+            self.first = None
+            self.offset = None
+            self.jitter = 0.0
+            self.delay = self.min_delay
+
+    def push(self, state, now=None):
+        """Новий знімок від сервера (викликається з потоку отримання)"""
+        now = self.clock() if now is None else now
+        tick = state.get("tick")
+        with self.lock:
+            if tick is None:
+                # Старий сервер без номерів тіків — орієнтуємось на час отримання
+                server_time = now
+            else:
+                if self.first is None:
+                    self.first = (tick, now)
+                elif now - self.first[1] > 1.0 and tick > self.first[0]:
+                    # Частота сервера — ціле число тіків за секунду; оцінюємо її на довгому
+                    # відрізку й округлюємо, щоб тремтіння мережі не потрапляло в час знімків
+                    tick_interval = 1 / max(1, round((tick - self.first[0]) / (now - self.first[1])))
+                    if tick_interval != self.tick_interval:
+                        self.tick_interval = tick_interval
+                        self.snapshots.clear()
+                        self.offset = None
+                server_time = (tick - self.first[0]) * self.tick_interval
+            if self.snapshots and server_time <= self.snapshots[-1][0]:
+                return
+
+            sample = now - server_time
+            if self.offset is None or sample < self.offset:
+                self.offset = sample
+            else:
+                # Повільно підтягуємось угору, щоб стежити за дрейфом годинників
+                self.offset += (sample - self.offset) * 0.01
+                self.jitter += (sample - self.offset - self.jitter) * 0.1
+            self.delay = min(self.max_delay, max(self.min_delay, 2 * self.tick_interval + 2 * self.jitter))
+            self.snapshots.append((server_time, state))
+
+    def sample(self, now=None):
+        """
+        Позиції м'яча і ракеток на момент кадру
+        Повертає {"ball": (x, y), "paddles": [y0, y1]} або None, якщо знімків немає
+        """
+        now = self.clock() if now is None else now
+        with self.lock:
+            if not self.snapshots:
+                return None
+            snapshots = list(self.snapshots)
+            render_time = now - self.offset - self.delay
+
+        older_time, older = snapshots[0]
+        if render_time <= older_time:
+            return self.view(older)
+
+        for newer_time, newer in snapshots[1:]:
+            if render_time <= newer_time:
+                t = (render_time - older_time) / (newer_time - older_time)
+                return self.blend(older, newer, t)
+            older_time, older = newer_time, newer
+
+        # Новіший знімок запізнюється — недовго продовжуємо рух м'яча
+        ahead = min(render_time - older_time, self.max_extrapolation)
+        ball = older["ball"]
+        return {
+            "ball": (ball["x"] + ball["vx"] * ahead * TICK_RATE, ball["y"] + ball["vy"] * ahead * TICK_RATE),
+            "paddles": list(older["paddles"])
+        }
+
+    @staticmethod
+    def view(state):
+        return {"ball": (state["ball"]["x"], state["ball"]["y"]), "paddles": list(state["paddles"])}
+
+    @staticmethod
+    def blend(older, newer, t):
+        a, b = older["ball"], newer["ball"]
+        if abs(b["x"] - a["x"]) > TELEPORT_DISTANCE or abs(b["y"] - a["y"]) > TELEPORT_DISTANCE:
+            ball = (a["x"], a["y"])
+        else:
+            ball = (lerp(a["x"], b["x"], t), lerp(a["y"], b["y"], t))
+        return {
+            "ball": ball,
+            "paddles": [lerp(older["paddles"][i], newer["paddles"][i], t) for i in (0, 1)]
+        }
@@ -0,0 +1,90 @@
+"""
+Черга пошуку суперника.
+
+Гравці стають у чергу в порядку підключення і складаються в пари одразу, як тільки
+їх двоє, — без блокуючого accept і без пауз між партіями. Черга пам'ятає, скільки
+кожен чекав, тож видно, як швидко сервер знаходить пари під навантаженням.
+"""
+import time
+from collections import deque
+
+# Скільки останніх очікувань тримати для перцентилів
+WAIT_HISTORY = 10000
+
+
+def percentile(values, p):
+    """p-й перцентиль (0..100) відсортованого списку; None, якщо значень немає"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class MatchStats:
+    def __init__(self, history=WAIT_HISTORY):
+        self.matches = 0
+        self.abandoned = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_times = deque(maxlen=history)
+
+    def matched(self, waits):
+        self.matches += 1
+        for wait in waits:
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.wait_times.append(wait)
+
+    def percentiles(self):
+        waits = sorted(self.wait_times)
+        return {p: percentile(waits, p) for p in (50, 95, 99)}
+
+    def summary(self):
+        if not self.matches:
+            return f"пар: 0, пішли з черги: {self.abandoned}"
+        p = self.percentiles()
+        return (f"пар: {self.matches}, пішли з черги: {self.abandoned}, "
+                f"очікування p50/p95/p99: {p[50] * 1000:.1f}/{p[95] * 1000:.1f}/{p[99] * 1000:.1f} мс, "
+                f"максимальне: {self.max_wait * 1000:.1f} мс")
+
+
+class Matchmaker:
+    """
+    FIFO-черга гравців. join() повертає пару, щойно вона склалась;
+    учасником черги може бути будь-що — з'єднання, сокет тощо.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.waiting = deque()
+        self.joined_at = {}
+        self.stats = MatchStats()
+
+    def __len__(self):
+        return len(self.waiting)
+
+    def join(self, player):
+        """Ставить гравця в чергу; повертає (перший, другий), якщо знайшлась пара, інакше None"""
+        now = self.clock()
+        self.joined_at[player] = now
+        self.waiting.append(player)
+        if len(self.waiting) < 2:
+            return None
+        pair = self.waiting.popleft(), self.waiting.popleft()
+        self.stats.matched([now - self.joined_at.pop(p) for p in pair])
+        return pair
+
+    def leave(self, player):
+        """Гравець пішов, не дочекавшись суперника"""
+        if self.joined_at.pop(player, None) is None:
+            return False
+        self.waiting.remove(player)
+        self.stats.abandoned += 1
+        return True
+
+    def prune(self, is_alive):
+        """Викидає з черги тих, хто вже відключився, і повертає їх"""
+        gone = [p for p in self.waiting if not is_alive(p)]
+        for player in gone:
+            self.leave(player)
+        return gone
@@ -0,0 +1,201 @@
+"""
+Метрики сервера у текстовому форматі Prometheus.
+
+Лічильники, датчики і гістограми без сторонніх бібліотек: на гарячому шляху —
+лише додавання і пошук кошика, а все, що можна порахувати в момент запиту
+(кімнати, з'єднання, черги клієнтів), рахується тоді, коли Prometheus прийде по дані.
+
+    curl http://127.0.0.1:9100/metrics
+"""
+import asyncio
+from bisect import bisect_left
+
+from matchmaking import percentile
+
+# Кошики для часу тіку і розсилки: від 10 мкс до 100 мс
+TIME_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                0.016, 0.025, 0.05, 0.1)
+# Перцентилі для розподілів, що рахуються заново на кожен запит
+DISTRIBUTION_PERCENTILES = (50, 90, 99)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+class Counter:
+    """Лічильник; з function значення береться в момент запиту"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, function=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.function = function
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        yield self.name, {}, self.function() if self.function else self.value
+
+
+class Gauge:
+    """Датчик; з function значення береться в момент запиту"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, function=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.function = function
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        yield self.name, {}, self.function() if self.function else self.value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield self.name + "_bucket", {"le": format_value(bound)}, total
+        yield self.name + "_sum", {}, self.sum
+        yield self.name + "_count", {}, self.count
+
+
+class Summary:
+    """Готові квантилі (наприклад, з MatchStats) у форматі summary"""
+    kind = "summary"
+
+    def __init__(self, name, help_text, function):
+        self.name = name
+        self.help = help_text
+        self.function = function  # -> (словник квантиль -> значення, сума, кількість)
+
+    def samples(self):
+        quantiles, total, count = self.function()
+        for quantile, value in quantiles.items():
+            if value is not None:
+                yield self.name, {"quantile": format_value(quantile)}, value
+        yield self.name + "_sum", {}, total
+        yield self.name + "_count", {}, count
+
+
+class Distribution:
+    """
+    Розподіл значень у момент запиту (наприклад, по клієнтах): кількість, сума, максимум
+    і перцентилі. Це датчики, а не гістограма — між запитами вони можуть і зменшуватись.
+    """
+    kind = "gauge"
+
+    def __init__(self, name, help_text, function, percentiles=DISTRIBUTION_PERCENTILES):
+        self.name = name
+        self.help = help_text
+        self.function = function
+        self.percentiles = percentiles
+
+    def samples(self):
+        values = sorted(self.function())
+        yield self.name, {"stat": "count"}, len(values)
+        yield self.name, {"stat": "sum"}, sum(values)
+        yield self.name, {"stat": "max"}, values[-1] if values else 0
+        for p in self.percentiles:
+            yield self.name, {"stat": f"p{p}"}, percentile(values, p) if values else 0
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, function=None):
+        return self.register(Counter(name, help_text, function))
+
+    def gauge(self, name, help_text, function=None):
+        return self.register(Gauge(name, help_text, function))
+
+    def histogram(self, name, help_text, buckets=TIME_BUCKETS):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def summary(self, name, help_text, function):
+        return self.register(Summary(name, help_text, function))
+
+    def distribution(self, name, help_text, function, percentiles=DISTRIBUTION_PERCENTILES):
+        return self.register(Distribution(name, help_text, function, percentiles))
+
+    def on_collect(self, collector):
+        """collector() викликається перед кожним запитом, щоб оновити метрики з поточного стану"""
+        self.collectors.append(collector)
+
+    def render(self):
+        for collector in self.collectors:
+            collector()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Найпростіший HTTP-сервер, що віддає метрики на GET /metrics"""
+
+    def __init__(self, registry, host="127.0.0.1", port=9100):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+            parts = request.split(b" ", 2)
+            if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", self.registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, reuse_address=True)
+        print(f"📈 Метрики на http://{self.host}:{self.port}/metrics")
@@ -0,0 +1,43 @@
+"""
+Передбачення власної ракетки на клієнті.
+
+Команда гравця застосовується одразу, не чекаючи відповіді сервера.
+Коли приходить знімок, позиція береться з сервера і поверх неї повторюються
+ті команди, яких сервер ще не застосував.
+"""
+from collections import deque
+
+from simulation import move_paddle
+
+# Більше непідтверджених команд означає, що сервер не відповідає — старі відкидаємо
+MAX_PENDING_INPUTS = 120
+
+
+class PaddlePredictor:
+    def __init__(self, pid):
+        self.pid = pid
+        self.y = None
+        self.pending = deque(maxlen=MAX_PENDING_INPUTS)
+        self.last_tick = None
+
+    def apply_local(self, seq, command):
+        """Гравець натиснув клавішу — рухаємо ракетку одразу"""
+        self.pending.append((seq, command))
+        if self.y is not None:
+            self.y = move_paddle(self.y, command)
+
+    def reconcile(self, state):
+        """Узгоджує передбачення з авторитетним знімком сервера"""
+        tick = state.get("tick")
+        if tick is not None and tick == self.last_tick:
+            return
+        self.last_tick = tick
+
+        acked = state.get("input_seq", [0, 0])[self.pid]
+        while self.pending and self.pending[0][0] <= acked:
+            self.pending.popleft()
+
+        y = state["paddles"][self.pid]
+        for _, command in self.pending:
+            y = move_paddle(y, command)
+        self.y = y
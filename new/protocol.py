@@ -0,0 +1,527 @@
+"""
+Мережевий протокол гри.
+
+Основний формат — бінарні кадри фіксованої структури:
+заголовок (версія, тип кадру, довжина) + упаковані та квантизовані поля стану.
+JSON-рядки залишені як запасний формат для налагодження (його розуміють і старі клієнти).
+
+Знімки надсилаються дельтами: лише поля, що змінились відносно останнього
+підтвердженого клієнтом кадру, з періодичними повними (ключовими) кадрами.
+
+Від клієнта на сервер ідуть кадри з тим самим заголовком: команди руху
+з порядковими номерами, які сервер застосовує на межі тіків.
+
+Транспорт: TCP завжди використовується для вітання і як надійний канал;
+за бажанням клієнта знімки, команди і підтвердження йдуть через UDP.
+"""
+import json
+import re
+import struct
+from collections import deque
+from operator import itemgetter
+
+PROTOCOL_VERSION = 2
+
+CODEC_BINARY = "bin1"
+CODEC_JSON = "json"
+
+TRANSPORT_TCP = "tcp"
+TRANSPORT_UDP = "udp"
+
+# Типи кадрів
+FRAME_SNAPSHOT = 1
+FRAME_DELTA = 2
+# Кадри від клієнта
+FRAME_INPUT = 16
+FRAME_HELLO = 17  # Прив'язка UDP-адреси клієнта до його TCP-сесії
+FRAME_ACK = 18  # Підтвердження отриманого знімка
+FRAME_KEYFRAME_REQUEST = 19  # Клієнт загубив базу дельти — просить ключовий кадр
+
+# Заголовок: версія, тип кадру, довжина корисного навантаження
+HEADER = struct.Struct("!BBH")
+# Повний знімок: тік, ракетки, м'яч (x, y, vx, vy), рахунок, відлік, звук, переможець
+# і номери останніх застосованих команд обох гравців (для узгодження передбачення)
+SNAPSHOT = struct.Struct("!IHHhhhhBBBBbII")
+# Дельта: тік, на скільки тіків назад база, маска змінених полів
+DELTA = struct.Struct("!IBH")
+# Команда гравця: порядковий номер і команда
+INPUT = struct.Struct("!IB")
+HELLO = struct.Struct("!I")
+ACK = struct.Struct("!I")
+
+# Поля стану в порядку SNAPSHOT (без тіку) і їхні формати
+FIELD_FORMATS = "HHhhhhBBBBbII"
+FIELD_X, FIELD_Y = 2, 3
+# Рахунок, відлік і переможець — їхні зміни при UDP дублюються надійним каналом
+IMPORTANT_FIELDS = (6, 7, 8, 10)
+important_fields = itemgetter(*IMPORTANT_FIELDS)
+# Прапорець маски: зміщення м'яча записані одним байтом різниці з базою
+SMALL_BALL_FLAG = 1 << len(FIELD_FORMATS)
+
+# Скільки останніх кадрів пам'ятаємо для дельт і як часто шлемо ключовий кадр
+HISTORY_SIZE = 64
+KEYFRAME_INTERVAL = 60
+
+# Квантизація: координати з кроком 1/8 пікселя, швидкість — 1/64 пікселя за тік
+POS_SCALE = 8
+VEL_SCALE = 64
+
+# Команди руху ракетки
+INPUT_NONE, INPUT_UP, INPUT_DOWN = 0, 1, 2
+LEGACY_INPUTS = {b"UP": INPUT_UP, b"DOWN": INPUT_DOWN}
+LEGACY_INPUT_RE = re.compile(rb"UP|DOWN")
+
+SOUND_EVENTS = [None, "wall_hit", "platform_hit"]
+SOUND_CODES = {name: code for code, name in enumerate(SOUND_EVENTS)}
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode_welcome(pid, codec, udp_token=None, udp_port=None):
+    """
+    Перший рядок після підключення: id гравця, формат кадрів
+    і, якщо сервер приймає UDP, токен для прив'язки UDP-адреси та UDP-порт
+    """
+    if codec == CODEC_JSON:
+        return f"{pid}\n".encode()  # Старий формат, щоб працювали старі клієнти
+    if udp_token is None:
+        return f"{pid} {codec}\n".encode()
+    if udp_port is None:
+        return f"{pid} {codec} {udp_token}\n".encode()
+    return f"{pid} {codec} {udp_token} {udp_port}\n".encode()
+
+
+def decode_welcome(line):
+    """Повертає (id гравця, формат, UDP-токен, UDP-порт); відсутні поля — None"""
+    parts = line.decode().split()
+    pid = int(parts[0])
+    codec = parts[1] if len(parts) > 1 else CODEC_JSON
+    udp_token = int(parts[2]) if len(parts) > 2 else None
+    udp_port = int(parts[3]) if len(parts) > 3 else None
+    if codec not in (CODEC_BINARY, CODEC_JSON):
+        raise ProtocolError(f"Невідомий формат кадрів: {codec}")
+    return pid, codec, udp_token, udp_port
+
+
+def recv_welcome(sock):
+    """
+    Читає вітальний рядок сервера з сокета
+    Повертає (id гравця, формат, UDP-токен, UDP-порт, залишок байтів після рядка)
+    """
+    data = b""
+    while b"\n" not in data:
+        chunk = sock.recv(64)
+        if not chunk:
+            raise ConnectionError("Сервер закрив з'єднання")
+        data += chunk
+    line, rest = data.split(b"\n", 1)
+    pid, codec, udp_token, udp_port = decode_welcome(line)
+    return pid, codec, udp_token, udp_port, rest
+
+
+def split_frames(buffer):
+    """
+    Виймає з буфера всі повні кадри
+    Повертає список (тип кадру, корисне навантаження); неповний хвіст лишається в буфері
+    """
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= HEADER.size:
+        version, kind, length = HEADER.unpack_from(buffer, offset)
+        if version != PROTOCOL_VERSION:
+            raise ProtocolError(f"Непідтримувана версія протоколу: {version}")
+        end = offset + HEADER.size + length
+        if len(buffer) < end:
+            break
+        frames.append((kind, bytes(buffer[offset + HEADER.size:end])))
+        offset = end
+    del buffer[:offset]
+    return frames
+
+
+def encode_input(seq, command):
+    payload = INPUT.pack(seq & 0xFFFFFFFF, command)
+    return HEADER.pack(PROTOCOL_VERSION, FRAME_INPUT, len(payload)) + payload
+
+
+def encode_hello(token):
+    payload = HELLO.pack(token)
+    return HEADER.pack(PROTOCOL_VERSION, FRAME_HELLO, len(payload)) + payload
+
+
+def encode_ack(tick):
+    payload = ACK.pack(tick & 0xFFFFFFFF)
+    return HEADER.pack(PROTOCOL_VERSION, FRAME_ACK, len(payload)) + payload
+
+
+def encode_keyframe_request():
+    return HEADER.pack(PROTOCOL_VERSION, FRAME_KEYFRAME_REQUEST, 0)
+
+
+def encode_legacy_input(seq, command):
+    """Старий текстовий формат команд (для JSON-режиму)"""
+    return b"UP" if command == INPUT_UP else b"DOWN" if command == INPUT_DOWN else b""
+
+
+INPUT_ENCODERS = {
+    CODEC_BINARY: encode_input,
+    CODEC_JSON: encode_legacy_input,
+}
+
+
+class InputDecoder:
+    """
+    Розбирає потік команд від клієнта на сервері.
+    feed() повертає список (порядковий номер, команда); у старому текстовому
+    форматі номерів немає (None), зате злиплі "UPUPUP" більше не губляться.
+    """
+
+    def __init__(self, codec=CODEC_BINARY):
+        self.codec = codec
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        if self.codec == CODEC_JSON:
+            return self._feed_legacy()
+        inputs = []
+        for kind, payload in split_frames(self.buffer):
+            if kind == FRAME_INPUT:
+                if len(payload) != INPUT.size:
+                    raise ProtocolError(f"Кадр команди довжиною {len(payload)} замість {INPUT.size}")
+                inputs.append(INPUT.unpack(payload))
+        return inputs
+
+    def _feed_legacy(self):
+        inputs = []
+        consumed = 0
+        for match in LEGACY_INPUT_RE.finditer(self.buffer):
+            inputs.append((None, LEGACY_INPUTS[match.group()]))
+            consumed = match.end()
+        # Хвіст після останньої команди може бути початком наступної ("U", "DO"...)
+        tail = bytes(self.buffer[max(consumed, len(self.buffer) - 3):])
+        del self.buffer[:]
+        for keep in range(len(tail), 0, -1):
+            if b"DOWN".startswith(tail[-keep:]) or b"UP".startswith(tail[-keep:]):
+                self.buffer += tail[-keep:]
+                break
+        return inputs
+
+
+def quantize_state(paddles, ball, scores, countdown, winner, sound_event, input_seq=(0, 0)):
+    """Стан гри -> кортеж цілих полів у порядку FIELD_FORMATS"""
+    return (
+        round(paddles[0] * POS_SCALE),
+        round(paddles[1] * POS_SCALE),
+        round(ball['x'] * POS_SCALE),
+        round(ball['y'] * POS_SCALE),
+        round(ball['vx'] * VEL_SCALE),
+        round(ball['vy'] * VEL_SCALE),
+        scores[0],
+        scores[1],
+        max(countdown, 0),
+        SOUND_CODES[sound_event],
+        -1 if winner is None else winner,
+        input_seq[0] & 0xFFFFFFFF,
+        input_seq[1] & 0xFFFFFFFF
+    )
+
+
+def quantize_game_state(state, input_seq=(0, 0)):
+    """
+    Те саме, що quantize_state, але прямо з simulation.GameState —
+    без проміжного словника м'яча; сервер викликає це для кожної кімнати щотіку.
+    Ракетки і швидкості м'яча в симуляції цілі, тож округлювати треба лише позицію м'яча
+    """
+    return (
+        state.paddles[0] * POS_SCALE,
+        state.paddles[1] * POS_SCALE,
+        round(state.ball_x * POS_SCALE),
+        round(state.ball_y * POS_SCALE),
+        state.ball_vx * VEL_SCALE,
+        state.ball_vy * VEL_SCALE,
+        state.scores[0],
+        state.scores[1],
+        state.countdown if state.countdown > 0 else 0,
+        SOUND_CODES[state.sound_event],
+        state.winner if state.game_over else -1,
+        input_seq[0] & 0xFFFFFFFF,
+        input_seq[1] & 0xFFFFFFFF
+    )
+
+
+def encode_keyframe(tick, fields):
+    payload = SNAPSHOT.pack(tick & 0xFFFFFFFF, *fields)
+    return HEADER.pack(PROTOCOL_VERSION, FRAME_SNAPSHOT, len(payload)) + payload
+
+
+def encode_delta(tick, fields, base_tick, base_fields):
+    # М'яч зазвичай зміщується на кілька пікселів — вистачає одного байта на вісь
+    dx = fields[FIELD_X] - base_fields[FIELD_X]
+    dy = fields[FIELD_Y] - base_fields[FIELD_Y]
+    small_ball = -128 <= dx <= 127 and -128 <= dy <= 127
+
+    mask = SMALL_BALL_FLAG if small_ball else 0
+    fmt = "!"
+    values = []
+    for i, value in enumerate(fields):
+        if value == base_fields[i]:
+            continue
+        mask |= 1 << i
+        if small_ball and (i == FIELD_X or i == FIELD_Y):
+            fmt += "b"
+            values.append(dx if i == FIELD_X else dy)
+        else:
+            fmt += FIELD_FORMATS[i]
+            values.append(value)
+
+    payload = DELTA.pack(tick & 0xFFFFFFFF, tick - base_tick, mask) + struct.pack(fmt, *values)
+    return HEADER.pack(PROTOCOL_VERSION, FRAME_DELTA, len(payload)) + payload
+
+
+def encode_snapshot(tick, paddles, ball, scores, countdown, winner, sound_event, input_seq=(0, 0)):
+    """Повний (ключовий) кадр"""
+    return encode_keyframe(tick, quantize_state(paddles, ball, scores, countdown, winner, sound_event, input_seq))
+
+
+def encode_json_snapshot(tick, paddles, ball, scores, countdown, winner, sound_event, input_seq=(0, 0)):
+    return (json.dumps({
+        "tick": tick,
+        "paddles": {"0": paddles[0], "1": paddles[1]},
+        "ball": ball,
+        "scores": scores,
+        "countdown": max(countdown, 0),
+        "winner": winner,
+        "sound_event": sound_event,
+        "input_seq": list(input_seq)
+    }) + "\n").encode()
+
+
+ENCODERS = {
+    CODEC_BINARY: encode_snapshot,
+    CODEC_JSON: encode_json_snapshot,
+}
+
+
+def fields_to_state(tick, fields):
+    (paddle0, paddle1, x, y, vx, vy, score0, score1, countdown, sound, winner, seq0, seq1) = fields
+    return {
+        "tick": tick,
+        "paddles": [paddle0 / POS_SCALE, paddle1 / POS_SCALE],
+        "ball": {"x": x / POS_SCALE, "y": y / POS_SCALE, "vx": vx / VEL_SCALE, "vy": vy / VEL_SCALE},
+        "scores": [score0, score1],
+        "countdown": countdown,
+        "winner": None if winner < 0 else winner,
+        "sound_event": SOUND_EVENTS[sound] if sound < len(SOUND_EVENTS) else None,
+        "input_seq": [seq0, seq1]
+    }
+
+
+def decode_delta(payload, base_fields):
+    """Накладає дельту на базовий кадр, повертає (тік, поля)"""
+    if len(payload) < DELTA.size:
+        raise ProtocolError(f"Дельта-кадр довжиною {len(payload)} коротший за заголовок")
+    tick, _, mask = DELTA.unpack_from(payload)
+    small_ball = mask & SMALL_BALL_FLAG
+    fmt = "!"
+    for i in range(len(FIELD_FORMATS)):
+        if mask & (1 << i):
+            fmt += "b" if small_ball and (i == FIELD_X or i == FIELD_Y) else FIELD_FORMATS[i]
+    if DELTA.size + struct.calcsize(fmt) != len(payload):
+        raise ProtocolError(f"Дельта-кадр довжиною {len(payload)} не відповідає масці {mask:#x}")
+    values = iter(struct.unpack_from(fmt, payload, DELTA.size))
+    fields = list(base_fields)
+    for i in range(len(FIELD_FORMATS)):
+        if mask & (1 << i):
+            value = next(values)
+            fields[i] = base_fields[i] + value if small_ball and (i == FIELD_X or i == FIELD_Y) else value
+    return tick, tuple(fields)
+
+
+class SnapshotHistory:
+    """
+    Останні кадри однієї кімнати на сервері.
+    Кадр для кожної бази кодується лише раз за тік, тож клієнти з однаковою базою
+    отримують ті самі байти.
+    """
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.size = size
+        self.states = {}
+        self.order = deque()
+        self.tick = None
+        self.fields = None
+        self.cache = {}
+
+    def push(self, tick, fields):
+        self.tick = tick
+        self.fields = fields
+        self.states[tick] = fields
+        self.order.append(tick)
+        while len(self.order) > self.size:
+            del self.states[self.order.popleft()]
+        self.cache = {}
+
+    def frame_for(self, base_tick):
+        """
+        Кадр поточного тіку відносно бази base_tick.
+        Повертає (байти, чи це ключовий кадр)
+        """
+        base_fields = self.states.get(base_tick) if base_tick is not None else None
+        if base_fields is None or base_tick == self.tick or self.tick - base_tick > 255:
+            base_tick = None
+        frame = self.cache.get(base_tick)
+        if frame is None:
+            if base_tick is None:
+                frame = encode_keyframe(self.tick, self.fields)
+            else:
+                frame = encode_delta(self.tick, self.fields, base_tick, base_fields)
+            self.cache[base_tick] = frame
+        return frame, base_tick is None
+
+
+class DeltaBaseline:
+    """
+    Що знає про стан конкретний клієнт: останній підтверджений ним тік.
+    Для надійного транспорту (TCP) кадр вважається підтвердженим одразу після запису.
+    """
+
+    def __init__(self, reliable=True, keyframe_interval=KEYFRAME_INTERVAL):
+        self.reliable = reliable
+        self.keyframe_interval = keyframe_interval
+        self.acked_tick = None
+        self.last_keyframe_tick = None
+
+    def base_for(self, tick):
+        if self.acked_tick is None or self.last_keyframe_tick is None:
+            return None
+        if tick - self.last_keyframe_tick >= self.keyframe_interval:
+            return None
+        return self.acked_tick
+
+    def sent(self, tick, keyframe):
+        if keyframe:
+            self.last_keyframe_tick = tick
+        if self.reliable:
+            self.acked_tick = tick
+
+    def acknowledge(self, tick):
+        if self.acked_tick is None or tick > self.acked_tick:
+            self.acked_tick = tick
+
+    def reset(self):
+        """Клієнт загубив базу дельти — наступним буде ключовий кадр"""
+        self.acked_tick = None
+
+
+def normalize_json_state(state):
+    """Приводить JSON-знімок до того ж вигляду, що й бінарний (ракетки — список)"""
+    paddles = state.get("paddles")
+    if isinstance(paddles, dict):
+        state["paddles"] = [paddles.get("0", paddles.get(0)), paddles.get("1", paddles.get(1))]
+    return state
+
+
+class FrameDecoder:
+    """
+    Збирає кадри з потоку байтів TCP.
+    feed() повертає список розібраних знімків стану (словників).
+    """
+
+    def __init__(self, codec=CODEC_BINARY):
+        self.codec = codec
+        self.buffer = bytearray()
+        self.history = {}
+        self.order = deque()
+        self.last_tick = None
+        self.missing_base = 0
+        self.requested_missing = 0
+
+    def feed(self, data):
+        self.buffer += data
+        if self.codec == CODEC_JSON:
+            return self._feed_json()
+        return self._feed_binary()
+
+    def feed_datagram(self, data):
+        """
+        UDP-датаграма містить лише цілі кадри і не змішується з потоком TCP.
+        Пошкоджену датаграму просто пропускаємо — наступна принесе свіжий стан
+        """
+        states = []
+        try:
+            frames = split_frames(bytearray(data))
+        except ProtocolError:
+            return states
+        for kind, payload in frames:
+            try:
+                state = self.decode_frame(kind, payload)
+            except ProtocolError:
+                continue
+            if state is not None:
+                states.append(state)
+        return states
+
+    def _feed_json(self):
+        states = []
+        while True:
+            end = self.buffer.find(b"\n")
+            if end < 0:
+                return states
+            packet = bytes(self.buffer[:end])
+            del self.buffer[:end + 1]
+            if packet.strip():
+                states.append(normalize_json_state(json.loads(packet)))
+
+    def _feed_binary(self):
+        states = []
+        for kind, payload in split_frames(self.buffer):
+            state = self.decode_frame(kind, payload)
+            if state is not None:
+                states.append(state)
+        return states
+
+    def decode_frame(self, kind, payload):
+        if kind == FRAME_SNAPSHOT:
+            if len(payload) != SNAPSHOT.size:
+                raise ProtocolError(f"Ключовий кадр довжиною {len(payload)} замість {SNAPSHOT.size}")
+            tick, *fields = SNAPSHOT.unpack(payload)
+            if self.is_stale(tick):
+                return None
+        elif kind == FRAME_DELTA:
+            if len(payload) < DELTA.size:
+                raise ProtocolError(f"Дельта-кадр довжиною {len(payload)} коротший за заголовок")
+            tick, offset, _ = DELTA.unpack_from(payload)
+            if self.is_stale(tick):
+                # Застарілий кадр не варто навіть розбирати: його база могла вже зникнути,
+                # і він даремно змусив би просити ключовий кадр
+                return None
+            base_fields = self.history.get(tick - offset)
+            if base_fields is None:
+                # Бази вже (або ще) немає — чекаємо на ключовий кадр
+                self.missing_base += 1
+                return None
+            tick, fields = decode_delta(payload, base_fields)
+        else:
+            return None
+        self.remember(tick, tuple(fields))
+        return fields_to_state(tick, fields)
+
+    def is_stale(self, tick):
+        """Кадр не новіший за вже розібраний: UDP переставив датаграми або той самий тік прийшов і через TCP"""
+        return self.last_tick is not None and tick <= self.last_tick
+
+    def need_keyframe(self):
+        """Чи траплялись після минулого виклику дельти без бази — тоді клієнт просить ключовий кадр"""
+        needed = self.missing_base > self.requested_missing
+        self.requested_missing = self.missing_base
+        return needed
+
+    def remember(self, tick, fields):
+        self.history[tick] = fields
+        self.order.append(tick)
+        while len(self.order) > HISTORY_SIZE:
+            self.history.pop(self.order.popleft(), None)
+        self.last_tick = tick
@@ -0,0 +1,263 @@
+"""
+Запис партій і швидкий повтор.
+
+Оскільки simulation.step детермінований, для відтворення партії досить зерна
+і команд гравців: файл запису містить заголовок із зерном, команди лише тих тіків,
+на яких вони були, і раз на CHECKPOINT_INTERVAL тіків — повний стан для перевірки.
+Файл тільки дописується, тож навіть після падіння сервера все до останньої
+контрольної точки лишається читабельним.
+
+Повтор перераховує партію у сотні разів швидше за реальний час:
+
+    python recording.py recordings/match.pongrec
+    python recording.py recordings/match.pongrec --show --speed 4
+"""
+import argparse
+import struct
+import time
+
+import simulation
+
+MAGIC = b"PONGREC"
+RECORDING_VERSION = 1
+EXTENSION = ".pongrec"
+# Контрольна точка раз на 10 секунд гри при 60 тіках
+CHECKPOINT_INTERVAL = 600
+
+HEADER = struct.Struct("!7sBIH")  # MAGIC, версія, зерно, частота тіків
+
+RECORD_INPUTS = 1
+RECORD_CHECKPOINT = 2
+RECORD_FORFEIT = 3
+RECORD_END = 4
+
+# Тік записується як приріст від попереднього запису, кількості команд гравців — у півбайтах
+INPUTS = struct.Struct("!HB")
+CHECKPOINT = struct.Struct("!IhhddddHHBHBbI")
+FORFEIT = struct.Struct("!IB")
+END = struct.Struct("!Ib")
+RECORD_SIZES = {RECORD_CHECKPOINT: CHECKPOINT.size, RECORD_FORFEIT: FORFEIT.size, RECORD_END: END.size}
+
+MAX_TICK_DELTA = 0xFFFF
+MAX_COMMANDS = 0x0F
+
+
+class ReplayError(Exception):
+    """Запис пошкоджений або повтор розійшовся з ним"""
+
+
+def pack_state(state):
+    """Повний стан для контрольної точки"""
+    return CHECKPOINT.pack(
+        state.tick, state.paddles[0], state.paddles[1], state.ball_x, state.ball_y, state.ball_vx, state.ball_vy,
+        state.scores[0], state.scores[1], state.countdown, state.countdown_ticks, state.game_over,
+        -1 if state.winner is None else state.winner, state.rng)
+
+
+class MatchRecorder:
+    """Пише одну партію кімнати у файл"""
+
+    def __init__(self, path):
+        self.path = path
+        self.buffer = bytearray()
+        self.last_tick = 0
+        self.file = None
+        self.ended = False
+
+    def start(self, seed, tick_rate):
+        """Нова партія: відкриваємо файл і пишемо заголовок"""
+        try:
+            self.file = open(self.path, "ab")
+        except OSError as e:
+            print(f"⚠️ Не вдалося почати запис {self.path}: {e}")
+            return
+        self.buffer = bytearray(HEADER.pack(MAGIC, RECORDING_VERSION, seed, tick_rate))
+        self.last_tick = 0
+        self.ended = False
+
+    @property
+    def active(self):
+        return self.file is not None and not self.ended
+
+    def record(self, state, inputs):
+        """Викликається після кожного тіку: state — новий стан, inputs — застосовані команди"""
+        if not self.active:
+            return
+        if inputs[0] or inputs[1]:
+            self.write_inputs(state.tick, inputs)
+        if state.tick % CHECKPOINT_INTERVAL == 0:
+            self.checkpoint(state)
+        if state.game_over:
+            self.end(state)
+
+    def write_inputs(self, tick, inputs):
+        while tick - self.last_tick > MAX_TICK_DELTA:
+            # Дуже довга пауза без команд — порожній запис, щоб приріст тіку влазив у два байти
+            self.last_tick += MAX_TICK_DELTA
+            self.buffer += bytes((RECORD_INPUTS,)) + INPUTS.pack(MAX_TICK_DELTA, 0)
+        counts = min(len(inputs[0]), MAX_COMMANDS) << 4 | min(len(inputs[1]), MAX_COMMANDS)
+        self.buffer += bytes((RECORD_INPUTS,)) + INPUTS.pack(tick - self.last_tick, counts)
+        self.buffer += bytes(inputs[0][:MAX_COMMANDS]) + bytes(inputs[1][:MAX_COMMANDS])
+        self.last_tick = tick
+
+    def checkpoint(self, state):
+        self.buffer += bytes((RECORD_CHECKPOINT,)) + pack_state(state)
+        self.flush()
+
+    def forfeit(self, state, pid):
+        """Гравець pid відключився — гра закінчилась поза step()"""
+        if not self.active:
+            return
+        self.buffer += bytes((RECORD_FORFEIT,)) + FORFEIT.pack(state.tick, pid)
+        self.end(state)
+
+    def end(self, state):
+        self.buffer += bytes((RECORD_CHECKPOINT,)) + pack_state(state)
+        self.buffer += bytes((RECORD_END,)) + END.pack(state.tick, -1 if state.winner is None else state.winner)
+        self.ended = True
+        self.flush()
+
+    def flush(self):
+        if self.file is None or not self.buffer:
+            return
+        try:
+            self.file.write(self.buffer)
+            self.file.flush()
+        except OSError as e:
+            print(f"⚠️ Помилка запису {self.path}: {e}")
+            self.close()
+        self.buffer.clear()
+
+    def close(self):
+        if self.file is None:
+            return
+        file, self.file = self.file, None
+        try:
+            if self.buffer:
+                file.write(self.buffer)
+            file.close()
+        except OSError:
+            pass
+        self.buffer.clear()
+
+
+def read_recording(path):
+    """Повертає (зерно, частота тіків, список записів (тип, тік, дані))"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ReplayError("Файл надто короткий для запису партії")
+    magic, version, seed, tick_rate = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError("Це не файл запису партії")
+    if version != RECORDING_VERSION:
+        raise ReplayError(f"Непідтримувана версія запису: {version}")
+
+    records = []
+    offset = HEADER.size
+    tick = 0
+    while offset < len(data):
+        kind = data[offset]
+        offset += 1
+        if kind == RECORD_INPUTS:
+            if offset + INPUTS.size > len(data):
+                break  # Обірваний хвіст — сервер впав посеред запису
+            delta, counts = INPUTS.unpack_from(data, offset)
+            offset += INPUTS.size
+            count0, count1 = counts >> 4, counts & 0x0F
+            if offset + count0 + count1 > len(data):
+                break
+            tick += delta
+            commands = data[offset:offset + count0 + count1]
+            offset += count0 + count1
+            records.append((kind, tick, (tuple(commands[:count0]), tuple(commands[count0:]))))
+            continue
+        size = RECORD_SIZES.get(kind)
+        if size is None:
+            raise ReplayError(f"Невідомий тип запису {kind} на позиції {offset - 1}")
+        if offset + size > len(data):
+            break
+        payload = data[offset:offset + size]
+        offset += size
+        if kind == RECORD_CHECKPOINT:
+            records.append((kind, CHECKPOINT.unpack_from(payload)[0], payload))
+        elif kind == RECORD_FORFEIT:
+            records.append((kind, *FORFEIT.unpack(payload)))
+        else:
+            records.append((kind, *END.unpack(payload)))
+    return seed, tick_rate, records
+
+
+def replay_states(path, verify=True):
+    """
+    Перераховує партію з запису і віддає стан після кожного тіку.
+    З verify=True кожна контрольна точка звіряється з перерахованим станом.
+    """
+    seed, tick_rate, records = read_recording(path)
+    state = simulation.new_game(seed, tick_rate)
+    yield state
+    for kind, tick, data in records:
+        while state.tick < tick - (kind == RECORD_INPUTS):
+            state = simulation.step(state, tick_rate=tick_rate)
+            yield state
+        if kind == RECORD_INPUTS:
+            state = simulation.step(state, data, tick_rate)
+            yield state
+        elif kind == RECORD_CHECKPOINT:
+            if verify and pack_state(state) != data:
+                raise ReplayError(f"Повтор розійшовся із записом на тіку {tick}")
+        elif kind == RECORD_FORFEIT:
+            state = simulation.forfeit(state, data)
+            yield state
+        elif kind == RECORD_END:
+            return
+
+
+def replay(path, verify=True):
+    """Найшвидший повтор без відображення; повертає (кінцевий стан, кількість тіків, секунд)"""
+    start = time.perf_counter()
+    state = None
+    ticks = 0
+    for state in replay_states(path, verify):
+        ticks += 1
+    return state, ticks, time.perf_counter() - start
+
+
+def show(path, speed=1.0):
+    """Повтор у вікні клієнта: швидкість speed відносно реального часу"""
+    import os
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    import updated_client as client
+    client.apply_loaded_assets(block=True)
+
+    _, tick_rate, _ = read_recording(path)
+    states_per_frame = max(1, round(tick_rate * speed / 60))
+    states = replay_states(path)
+    state = next(states)
+    while True:
+        for e in client.event.get():
+            if e.type == client.QUIT:
+                return state
+        for _ in range(states_per_frame):
+            state = next(states, None) or state
+        client.draw_game(list(state.paddles), state.ball_x, state.ball_y, state.scores)
+        client.clock.tick(60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Повтор записаної партії пінг-понгу")
+    parser.add_argument("path", help="Файл запису (.pongrec)")
+    parser.add_argument("--show", action="store_true", help="Показати партію у вікні клієнта")
+    parser.add_argument("--speed", type=float, default=1.0, help="Швидкість показу відносно реального часу")
+    parser.add_argument("--no-verify", action="store_true", help="Не звіряти контрольні точки")
+    args = parser.parse_args()
+
+    if args.show:
+        show(args.path, args.speed)
+    else:
+        _, tick_rate, _ = read_recording(args.path)
+        state, ticks, elapsed = replay(args.path, not args.no_verify)
+        winner = "—" if state.winner is None else state.winner
+        print(f"🎬 Тіків: {ticks}, рахунок {state.scores[0]} : {state.scores[1]}, переможець: {winner}")
+        print(f"⚡ Перераховано за {elapsed:.3f} с — у {ticks / tick_rate / max(elapsed, 1e-9):.0f} разів "
+              f"швидше за реальний час")
@@ -0,0 +1,84 @@
+"""
+Відмальовка лише тих ділянок екрана, що змінились.
+
+Під час гри рухаються тільки м'яч, дві ракетки і рахунок, тож замість того, щоб
+щокадру малювати весь фон 800x600 і оновлювати все вікно, DirtyRenderer
+відновлює фон лише під тим, що було намальовано минулого кадру, малює нове
+і передає в display.update() тільки ці прямокутники.
+
+Написи теж не рендеряться щокадру: render_text кешує готові поверхні тексту.
+"""
+from functools import lru_cache
+
+from pygame import display, Rect
+
+
+class DirtyRenderer:
+    def __init__(self, screen, background=None, fill_color=(30, 30, 30)):
+        """
+        screen — поверхня вікна
+        background — фон (Surface розміру вікна) або None, тоді фон заливається fill_color
+        """
+        self.screen = screen
+        self.background = background
+        self.fill_color = fill_color
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+
+    def set_background(self, background):
+        if background is not self.background:
+            self.background = background
+            self.invalidate()
+
+    def invalidate(self):
+        """Наступний кадр буде намальовано і оновлено повністю (після меню, зміни розміру тощо)"""
+        self.full_redraw = True
+
+    def restore(self, rect):
+        if self.background:
+            self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(self.fill_color, rect)
+
+    def begin(self):
+        """Прибирає з екрана все, що було намальовано минулого кадру"""
+        self.current = []
+        if self.full_redraw:
+            self.restore(self.screen.get_rect())
+        else:
+            for rect in self.previous:
+                self.restore(rect)
+
+    def blit(self, surface, position):
+        rect = self.screen.blit(surface, position)
+        self.current.append(rect)
+        return rect
+
+    def mark(self, rect):
+        """Позначає ділянку, намальовану напряму (draw.rect, draw.circle тощо)"""
+        self.current.append(Rect(rect))
+        return rect
+
+    def end(self):
+        """Показує кадр: оновлює лише старі і нові ділянки"""
+        if self.full_redraw:
+            display.update()
+            self.full_redraw = False
+        else:
+            display.update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+
+
+# Скільки різних написів тримати готовими: рахунки, відлік, усі підписи меню і налаштувань
+TEXT_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text_font, text, color):
+    """
+    Рендерить напис один раз і далі віддає готову поверхню, поки текст не зміниться.
+    Поверхня спільна для всіх викликів — її можна лише малювати, а не змінювати.
+    """
+    return text_font.render(text, True, color)
@@ -0,0 +1,101 @@
+"""
+Планувальник тіків з фіксованим кроком симуляції.
+
+Час рахується за монотонним годинником і накопичується в акумуляторі,
+тож швидкість гри не залежить від навантаження хоста: якщо тік запізнився,
+наступного разу виконується кілька кроків поспіль (але не більше max_catch_up).
+"""
+import asyncio
+import time
+
+
+class TickStats:
+    """Статистика виконання тіків"""
+
+    def __init__(self, step):
+        self.step = step
+        self.ticks = 0
+        self.overruns = 0  # Тіки, що тривали довше за крок
+        self.catch_up_steps = 0  # Кроки, виконані для наздоганяння
+        self.dropped_steps = 0  # Кроки, відкинуті через обмеження наздоганяння
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        # Необов'язкові гістограми (metrics.Histogram) для тривалості і запізнення тіків
+        self.histogram = None
+        self.lag_histogram = None
+
+    def record(self, duration):
+        if self.histogram is not None:
+            self.histogram.observe(duration)
+        self.ticks += 1
+        self.total_time += duration
+        self.last_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+        if duration > self.step:
+            self.overruns += 1
+
+    @property
+    def average_time(self):
+        return self.total_time / self.ticks if self.ticks else 0.0
+
+    def summary(self):
+        return (f"тіків: {self.ticks}, перевищень кроку: {self.overruns}, "
+                f"наздоганяння: {self.catch_up_steps}, відкинуто: {self.dropped_steps}, "
+                f"середній тік: {self.average_time * 1000:.3f} мс, максимальний: {self.max_time * 1000:.3f} мс")
+
+
+class TickScheduler:
+    def __init__(self, tick_rate=60, max_catch_up=5, clock=time.monotonic):
+        self.tick_rate = tick_rate
+        self.step = 1 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.stats = TickStats(self.step)
+        self.accumulator = 0.0
+        self.last = None
+        self.running = False
+
+    def start(self):
+        self.last = self.clock()
+        self.accumulator = 0.0
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def advance(self):
+        """Скільки кроків симуляції треба виконати зараз"""
+        now = self.clock()
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps = int(self.accumulator / self.step)
+        if steps and self.stats.lag_histogram is not None:
+            self.stats.lag_histogram.observe(self.accumulator - self.step)
+        if steps > self.max_catch_up:
+            # Хост не встигає — відкидаємо зайвий час, щоб не піти в «спіраль смерті»
+            self.stats.dropped_steps += steps - self.max_catch_up
+            steps = self.max_catch_up
+            self.accumulator = steps * self.step
+        if steps > 1:
+            self.stats.catch_up_steps += steps - 1
+        self.accumulator -= steps * self.step
+        return steps
+
+    def time_until_next(self):
+        return max(0.0, self.step - self.accumulator - (self.clock() - self.last))
+
+    def run_steps(self, callback):
+        for _ in range(self.advance()):
+            started = self.clock()
+            callback()
+            self.stats.record(self.clock() - started)
+
+    async def run_async(self, callback):
+        """Крокує callback з фіксованою частотою всередині циклу asyncio"""
+        self.start()
+        while self.running:
+            self.run_steps(callback)
+            await asyncio.sleep(self.time_until_next())
@@ -0,0 +1,234 @@
+"""
+Правила гри, спільні для сервера і клієнтів.
+
+Ядро симуляції — чиста функція step(state, inputs) -> state: без сокетів, сну,
+блокувань і глобального random. Випадковість береться з генератора, стан якого
+зберігається в самому GameState, тож з однаковим зерном і однаковими командами
+партія повторюється біт у біт — на сервері, в передбаченні клієнта, у ботів і тестах.
+"""
+from protocol import INPUT_UP, INPUT_DOWN
+
+WIDTH, HEIGHT = 800, 600
+# Базова частота тіків: швидкості задані в пікселях за тік саме при ній
+TICK_RATE = 60
+BALL_SPEED = 5
+PADDLE_SPEED = 10
+PADDLE_HEIGHT = 100
+PADDLE_MIN_Y = 60
+PADDLE_MAX_Y = HEIGHT - PADDLE_HEIGHT
+PADDLE_START_Y = 250
+# Лінії, на яких м'яч відбивається від ракеток, і верхня стінка
+LEFT_PADDLE_X = 40
+RIGHT_PADDLE_X = WIDTH - 40
+WALL_TOP = 60
+WIN_SCORE = 10
+COUNTDOWN_START = 3
+# Скільки відбиттів м'яча можна обробити за один тік
+MAX_BOUNCES = 4
+
+NO_EVENT, WALL_EVENT, PADDLE_EVENT = 0, 1, 2
+
+NO_INPUTS = ((), ())
+
+
+def move_paddle(y, command):
+    """Нова позиція ракетки після однієї команди гравця"""
+    if command == INPUT_UP:
+        return max(PADDLE_MIN_Y, y - PADDLE_SPEED)
+    if command == INPUT_DOWN:
+        return min(PADDLE_MAX_Y, y + PADDLE_SPEED)
+    return y
+
+
+def next_random(rng):
+    """Крок генератора xorshift32: детермінований і однаковий на всіх платформах"""
+    rng ^= (rng << 13) & 0xFFFFFFFF
+    rng ^= rng >> 17
+    rng ^= (rng << 5) & 0xFFFFFFFF
+    return rng
+
+
+class GameState:
+    """Повний стан однієї партії"""
+
+    __slots__ = ("tick", "paddles", "ball_x", "ball_y", "ball_vx", "ball_vy", "scores",
+                 "countdown", "countdown_ticks", "game_over", "winner", "sound_event", "rng")
+
+    def __init__(self, tick, paddles, ball_x, ball_y, ball_vx, ball_vy, scores,
+                 countdown, countdown_ticks, game_over, winner, sound_event, rng):
+        self.tick = tick
+        self.paddles = paddles
+        self.ball_x = ball_x
+        self.ball_y = ball_y
+        self.ball_vx = ball_vx
+        self.ball_vy = ball_vy
+        self.scores = scores
+        self.countdown = countdown
+        self.countdown_ticks = countdown_ticks
+        self.game_over = game_over
+        self.winner = winner
+        self.sound_event = sound_event
+        self.rng = rng
+
+    def copy(self):
+        return GameState(self.tick, self.paddles, self.ball_x, self.ball_y, self.ball_vx, self.ball_vy,
+                         self.scores, self.countdown, self.countdown_ticks, self.game_over, self.winner,
+                         self.sound_event, self.rng)
+
+    def as_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return "GameState(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__) + ")"
+
+    @property
+    def ball(self):
+        return {"x": self.ball_x, "y": self.ball_y, "vx": self.ball_vx, "vy": self.ball_vy}
+
+
+def time_of_impact(start, end, line):
+    """Частка шляху від start до end, на якій м'яч торкається лінії line"""
+    if start == end:
+        return 0.0
+    return max(0.0, (start - line) / (start - end))
+
+
+def sweep_ball(x, y, vx, vy, dt, paddle0, paddle1):
+    """
+    Рух м'яча за час dt з безперервною перевіркою зіткнень.
+    Замість перевірки лише кінцевої точки шукаємо момент перетину стінки чи лінії ракетки
+    і відбиваємо м'яч саме там, тож навіть на великій швидкості чи з великим кроком
+    він не проскакує крізь ракетку і не «залипає» за нею.
+    Повертає (x, y, vx, vy, звукова подія)
+    """
+    sound_event = None
+    remaining = dt
+    for _ in range(MAX_BOUNCES):
+        nx = x + vx * remaining
+        ny = y + vy * remaining
+        event = NO_EVENT
+        t = 1.0
+
+        if vy < 0 and ny <= WALL_TOP:
+            t = time_of_impact(y, ny, WALL_TOP)
+            event = WALL_EVENT
+        elif vy > 0 and ny >= HEIGHT:
+            t = time_of_impact(y, ny, HEIGHT)
+            event = WALL_EVENT
+
+        # Ракетка б'є лише м'яч, що підлітає до неї спереду
+        if vx < 0 and x >= LEFT_PADDLE_X >= nx:
+            paddle_t = time_of_impact(x, nx, LEFT_PADDLE_X)
+            impact_y = y + (ny - y) * paddle_t
+            if (event == NO_EVENT or paddle_t <= t) and paddle0 <= impact_y <= paddle0 + PADDLE_HEIGHT:
+                t = paddle_t
+                event = PADDLE_EVENT
+        elif vx > 0 and x <= RIGHT_PADDLE_X <= nx:
+            paddle_t = time_of_impact(x, nx, RIGHT_PADDLE_X)
+            impact_y = y + (ny - y) * paddle_t
+            if (event == NO_EVENT or paddle_t <= t) and paddle1 <= impact_y <= paddle1 + PADDLE_HEIGHT:
+                t = paddle_t
+                event = PADDLE_EVENT
+
+        if event == NO_EVENT:
+            return nx, ny, vx, vy, sound_event
+
+        # Доходимо до точки удару і відбиваємось; решта шляху — вже з новою швидкістю
+        x = x + vx * remaining * t
+        y = y + vy * remaining * t
+        remaining = remaining * (1.0 - t)
+        if event == WALL_EVENT:
+            vy = -vy
+            sound_event = "wall_hit"
+        else:
+            vx = -vx
+            sound_event = "platform_hit"
+    return x + vx * remaining, y + vy * remaining, vx, vy, sound_event
+
+
+def serve_ball(state):
+    """Ставить м'яч у центр з випадковим напрямком (змінює state)"""
+    rng = next_random(state.rng)
+    state.ball_vx = BALL_SPEED if rng & 1 else -BALL_SPEED
+    rng = next_random(rng)
+    state.ball_vy = BALL_SPEED if rng & 1 else -BALL_SPEED
+    state.rng = rng
+    state.ball_x = WIDTH // 2
+    state.ball_y = HEIGHT // 2
+
+
+def new_game(seed, tick_rate=TICK_RATE):
+    """Початковий стан партії із зерном seed"""
+    state = GameState(
+        tick=0,
+        paddles=(PADDLE_START_Y, PADDLE_START_Y),
+        ball_x=WIDTH // 2, ball_y=HEIGHT // 2, ball_vx=0, ball_vy=0,
+        scores=(0, 0),
+        countdown=COUNTDOWN_START,
+        countdown_ticks=tick_rate,
+        game_over=False,
+        winner=None,
+        sound_event=None,
+        rng=(seed & 0xFFFFFFFF) or 0x9E3779B9  # Нульове зерно xorshift не підходить
+    )
+    serve_ball(state)
+    return state
+
+
+def step(state, inputs=NO_INPUTS, tick_rate=TICK_RATE):
+    """
+    Один тік гри. Не змінює state, а повертає новий стан
+    inputs — пара послідовностей команд для гравців 0 і 1 на цей тік
+    """
+    state = state.copy()
+    state.tick += 1
+    state.sound_event = None
+
+    paddle0, paddle1 = state.paddles
+    for command in inputs[0]:
+        paddle0 = move_paddle(paddle0, command)
+    for command in inputs[1]:
+        paddle1 = move_paddle(paddle1, command)
+    state.paddles = (paddle0, paddle1)
+
+    if state.game_over:
+        return state
+
+    if state.countdown > 0:
+        state.countdown_ticks -= 1
+        if state.countdown_ticks <= 0:
+            state.countdown -= 1
+            state.countdown_ticks = tick_rate
+        return state
+
+    # Швидкості задані для базової частоти — масштабуємо під поточну
+    dt = TICK_RATE / tick_rate
+    x, y, state.ball_vx, state.ball_vy, state.sound_event = sweep_ball(
+        state.ball_x, state.ball_y, state.ball_vx, state.ball_vy, dt, paddle0, paddle1)
+    state.ball_x, state.ball_y = x, y
+
+    if x < 0:
+        state.scores = (state.scores[0], state.scores[1] + 1)
+        serve_ball(state)
+    elif x > WIDTH:
+        state.scores = (state.scores[0] + 1, state.scores[1])
+        serve_ball(state)
+
+    if state.scores[0] >= WIN_SCORE:
+        state.game_over = True
+        state.winner = 0
+    elif state.scores[1] >= WIN_SCORE:
+        state.game_over = True
+        state.winner = 1
+    return state
+
+
+def forfeit(state, pid):
+    """Гравець pid покинув гру — перемога дістається суперникові"""
+    state = state.copy()
+    state.game_over = True
+    state.winner = 1 - pid
+    return state
@@ -0,0 +1,153 @@
+"""
+Сервер на кілька процесів.
+
+Супервізор сам приймає з'єднання, складає гравців у пари і передає обидва сокети
+одному з робочих процесів. Кожен робочий процес — це звичайний AsyncGameServer зі своїми
+кімнатами і власним циклом asyncio, тож кімнат стає приблизно стільки більше,
+скільки ядер. Якщо робочий процес впав, супервізор запускає новий.
+
+Чому не SO_REUSEPORT на кожному процесі: тоді ядро розкидає гравців по процесах
+випадково, і двоє гравців у різних процесах ніколи не зустрінуться; а UDP-датаграми
+могли б потрапити не до того процесу, що веде сесію.
+"""
+import asyncio
+import multiprocessing
+import os
+import selectors
+import socket
+import time
+
+import protocol
+from async_server import AsyncGameServer, build_arg_parser, server_options, DEFAULT_BACKLOG
+from matchmaking import Matchmaker
+
+RESTART_DELAY = 1
+
+
+def run_worker(index, channel, host, udp_port, options):
+    server = AsyncGameServer(host, udp_port=udp_port, **options)
+    print(f"👷 Робочий процес {index} (pid {os.getpid()}) готовий")
+    try:
+        asyncio.run(server.serve_handoff(channel))
+    except KeyboardInterrupt:
+        pass
+
+
+class Supervisor:
+    def __init__(self, host='localhost', port=8080, workers=None, backlog=DEFAULT_BACKLOG, **options):
+        self.host = host
+        self.port = port
+        self.worker_count = workers or os.cpu_count() or 1
+        self.backlog = backlog
+        self.options = options
+        self.workers = {}  # індекс -> (процес, канал)
+        self.restart_at = {}  # індекс впалого процесу -> коли його перезапустити
+        self.next_worker = 0
+        self.matchmaker = Matchmaker()
+        self.pairs_started = 0
+
+    def udp_port_for(self, index):
+        # UDP-датаграми мають приходити саме в той процес, де живе сесія гравця
+        if not self.options.get("udp") or self.options.get("codec") == protocol.CODEC_JSON:
+            return None
+        return self.port + 1 + index
+
+    def start_worker(self, index):
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        process = multiprocessing.Process(
+            target=run_worker, args=(index, child, self.host, self.udp_port_for(index), self.options),
+            daemon=True)
+        process.start()
+        child.close()
+        self.workers[index] = (process, parent)
+
+    def check_workers(self):
+        """Перезапускає впалі процеси, не зупиняючи прийом гравців на RESTART_DELAY"""
+        now = time.monotonic()
+        for index, (process, channel) in list(self.workers.items()):
+            if process.is_alive():
+                continue
+            deadline = self.restart_at.get(index)
+            if deadline is None:
+                print(f"💥 Робочий процес {index} завершився з кодом {process.exitcode}, "
+                      f"перезапуск через {RESTART_DELAY} с")
+                channel.close()
+                self.restart_at[index] = now + RESTART_DELAY
+            elif now >= deadline:
+                del self.restart_at[index]
+                self.start_worker(index)
+
+    def choose_worker(self):
+        for _ in range(self.worker_count):
+            index = self.next_worker
+            self.next_worker = (self.next_worker + 1) % self.worker_count
+            process, channel = self.workers[index]
+            if process.is_alive():
+                return channel
+        return None
+
+    @staticmethod
+    def still_connected(conn):
+        """Чи не пішов гравець, поки чекав на суперника"""
+        try:
+            return conn.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b""
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+    def handle_accept(self, listener):
+        conn, _ = listener.accept()
+        for gone in self.matchmaker.prune(self.still_connected):
+            gone.close()
+        pair = self.matchmaker.join(conn)
+        if pair is None:
+            return
+
+        channel = self.choose_worker()
+        try:
+            if channel is None:
+                raise OSError("немає живих робочих процесів")
+            socket.send_fds(channel, [b"P"], [sock.fileno() for sock in pair])
+            self.pairs_started += 1
+        except OSError as e:
+            print(f"⚠️ Не вдалося передати пару гравців: {e}")
+        finally:
+            # Тепер сокети належать робочому процесу
+            for sock in pair:
+                sock.close()
+
+    def run(self):
+        for index in range(self.worker_count):
+            self.start_worker(index)
+
+        listener = socket.create_server((self.host, self.port), backlog=self.backlog)
+        listener.setblocking(False)
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ)
+        print(f"🎮 Supervisor started on {self.host}:{self.port}, робочих процесів: {self.worker_count}")
+        try:
+            while True:
+                for _ in selector.select(timeout=0.5):
+                    # Забираємо з черги слухача все, що накопичилось
+                    try:
+                        while True:
+                            self.handle_accept(listener)
+                    except BlockingIOError:
+                        pass
+                self.check_workers()
+        except KeyboardInterrupt:
+            print("\n👋 Сервер зупинено користувачем")
+            print(f"🤝 {self.matchmaker.stats.summary()}, передано робочим процесам: {self.pairs_started}")
+        finally:
+            listener.close()
+            for process, channel in self.workers.values():
+                process.terminate()
+                channel.close()
+
+
+if __name__ == "__main__":
+    parser = build_arg_parser("Сервер пінг-понгу на кілька процесів")
+    parser.add_argument("--workers", type=int, default=None, help="Кількість робочих процесів (типово — за числом ядер)")
+    args = parser.parse_args()
+    Supervisor(args.host, args.port, args.workers, args.backlog, **server_options(args)).run()
@@ -0,0 +1,42 @@
+"""Кімната сервера без мережі: черга команд гравців"""
+import random
+
+import pytest
+
+from async_server import Room, max_inputs_per_tick
+from protocol import INPUT_DOWN, INPUT_UP
+from simulation import TICK_RATE
+
+
+@pytest.mark.parametrize("tick_rate", [60, 20, 7])
+def test_inputs_at_frame_rate_do_not_pile_up(tick_rate):
+    """Клієнт шле команду кожен кадр (60 разів за секунду), кімната крокує з tick_rate"""
+    room = Room(0, tick_rate=tick_rate)
+    rng = random.Random(tick_rate)
+    seq = 0
+    sent = 0.0
+    for tick in range(tick_rate * 5):
+        # Нерівномірна мережа: команди приходять пачками, але в середньому з частотою кадрів
+        sent += TICK_RATE / tick_rate
+        while seq < int(sent) + rng.randint(-1, 1):
+            seq += 1
+            for pid in (0, 1):
+                room.handle_input(pid, seq, INPUT_UP if seq % 2 else INPUT_DOWN)
+        room.update()
+        assert all(len(queue) <= max_inputs_per_tick(tick_rate) for queue in room.inputs.values())
+    room.update()
+    assert room.input_seq_pair() == (seq, seq)
+
+
+def test_slow_tick_rate_applies_more_inputs_per_tick():
+    assert max_inputs_per_tick(60) == 2
+    assert max_inputs_per_tick(20) == 4
+    assert max_inputs_per_tick(1) == 15  # Більше не вмістить запис партії
+
+
+def test_stale_and_duplicate_inputs_are_ignored():
+    room = Room(0)
+    room.handle_input(0, 5, INPUT_UP)
+    room.handle_input(0, 5, INPUT_UP)
+    room.handle_input(0, 3, INPUT_DOWN)
+    assert list(room.inputs[0]) == [(5, INPUT_UP)]
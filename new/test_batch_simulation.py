@@ -0,0 +1,31 @@
+"""Пакетна симуляція дає рівно ті самі стани, що й звичайна simulation.step"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import simulation
+from batch_simulation import BatchSimulation
+from protocol import INPUT_DOWN, INPUT_NONE, INPUT_UP
+
+ROOMS = 200
+
+
+@pytest.mark.parametrize("tick_rate, ticks", [(60, 3000), (20, 1500), (7, 800)])
+def test_batch_matches_scalar(tick_rate, ticks):
+    rng = np.random.default_rng(tick_rate)
+    seeds = rng.integers(1, 2 ** 32, ROOMS)
+    batch = BatchSimulation(seeds, tick_rate)
+    states = [simulation.new_game(int(seed), tick_rate) for seed in seeds]
+    for i, state in enumerate(states):
+        assert batch.state(i) == state
+
+    for tick in range(ticks):
+        inputs = rng.choice([INPUT_NONE, INPUT_NONE, INPUT_UP, INPUT_DOWN], size=(ROOMS, 2))
+        batch.step(inputs)
+        for i, state in enumerate(states):
+            commands = tuple((int(command),) if command != INPUT_NONE else () for command in inputs[i])
+            states[i] = simulation.step(state, commands, tick_rate)
+        for i, state in enumerate(states):
+            assert batch.state(i) == state, f"кімната {i} розійшлась на тіку {state.tick}"
+    # Партії встигли дійти до голів і відбиттів, а не лише до відліку
+    assert sum(sum(state.scores) for state in states) > ROOMS
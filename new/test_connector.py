@@ -0,0 +1,154 @@
+"""Фонове підключення: пауза між спробами, скасування і таймаут лише на connect()"""
+import random
+import socket
+import threading
+import time
+
+import pytest
+
+from connector import Connector, backoff_delay, BASE_DELAY, MAX_DELAY
+
+
+class FixedRandom:
+    def __init__(self, value):
+        self.value = value
+
+    def random(self):
+        return self.value
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "не дочекались"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("attempt, expected", [(1, 0.5), (2, 1.0), (3, 2.0), (5, 8.0), (20, 8.0)])
+def test_backoff_doubles_up_to_maximum(attempt, expected):
+    assert backoff_delay(attempt, rng=FixedRandom(1.0)) == pytest.approx(expected)
+    assert backoff_delay(attempt, rng=FixedRandom(0.0)) == pytest.approx(expected / 2)
+
+
+def test_backoff_jitter_stays_in_range():
+    rng = random.Random(1)
+    for attempt in range(1, 30):
+        delay = backoff_delay(attempt, rng=rng)
+        limit = min(MAX_DELAY, BASE_DELAY * 2 ** (attempt - 1))
+        assert limit / 2 <= delay <= limit
+
+
+def test_failed_attempts_are_retried_until_success():
+    attempts = []
+
+    def connect(timeout, watch):
+        attempts.append(timeout)
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("ще ні")
+        return "з'єднання"
+
+    connector = Connector(connect, timeout=0.7, base_delay=0.01, max_delay=0.02).start()
+    wait_for(lambda: connector.attempts == 3 and not connector.thread.is_alive())
+    assert connector.poll() == "з'єднання"
+    assert connector.poll() is None
+    assert attempts == [0.7, 0.7, 0.7]
+
+
+def test_cancel_stops_retrying():
+    calls = []
+
+    def connect(timeout, watch):
+        calls.append(timeout)
+        raise ConnectionRefusedError("сервер лежить")
+
+    connector = Connector(connect, base_delay=10, max_delay=10).start()
+    wait_for(lambda: calls)
+    connector.cancel()
+    connector.thread.join(1.0)
+    assert not connector.thread.is_alive()
+    assert calls == [connector.timeout]
+
+
+def test_result_after_cancel_is_discarded():
+    release = threading.Event()
+    discarded = []
+
+    def connect(timeout, watch):
+        release.wait()
+        return "запізніле з'єднання"
+
+    connector = Connector(connect, discard=discarded.append).start()
+    connector.cancel()
+    release.set()
+    connector.thread.join(1.0)
+    assert discarded == ["запізніле з'єднання"]
+    assert connector.poll() is None
+
+
+@pytest.fixture
+def silent_server():
+    """Сервер, що приймає з'єднання і довго нічого не надсилає — як супервізор без другого гравця"""
+    listener = socket.create_server(("127.0.0.1", 0))
+    accepted = []
+
+    def accept():
+        try:
+            while True:
+                accepted.append(listener.accept()[0])
+        except OSError:
+            pass
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield listener, accepted
+    listener.close()
+    for conn in accepted:
+        conn.close()
+
+
+def connect_and_wait(address):
+    def connect(timeout, watch):
+        sock = socket.create_connection(address, timeout)
+        sock.settimeout(None)
+        watch(sock)
+        try:
+            data = sock.recv(64)
+            if not data:
+                raise ConnectionError("Сервер закрив з'єднання")
+            return data
+        except Exception:
+            sock.close()
+            raise
+    return connect
+
+
+def test_welcome_may_take_longer_than_timeout(silent_server):
+    listener, accepted = silent_server
+    connector = Connector(connect_and_wait(listener.getsockname()), timeout=0.1).start()
+    wait_for(lambda: accepted)
+    time.sleep(0.3)  # Втричі довше за таймаут — спроба все ще та сама
+    assert connector.attempts == 1 and connector.last_error is None
+    assert "суперника" in connector.status()
+    accepted[0].sendall(b"0 bin1\n")
+    wait_for(lambda: not connector.thread.is_alive())
+    assert connector.poll() == b"0 bin1\n"
+
+
+def test_cancel_interrupts_waiting_for_welcome(silent_server):
+    listener, accepted = silent_server
+    connector = Connector(connect_and_wait(listener.getsockname()), timeout=0.1).start()
+    wait_for(lambda: accepted)
+    connector.cancel()
+    connector.thread.join(1.0)
+    assert not connector.thread.is_alive()
+    assert connector.attempts == 1
+    assert accepted[0].recv(1) == b""  # Сервер бачить, що гравець пішов
+
+
+def test_connect_timeout_counts_as_failed_attempt():
+    def connect(timeout, watch):
+        raise socket.timeout("timed out")
+
+    connector = Connector(connect, base_delay=10, max_delay=10).start()
+    wait_for(lambda: connector.last_error is not None)
+    assert "наступна через" in connector.status()
+    connector.cancel()
@@ -0,0 +1,94 @@
+"""Буфер знімків клієнта: затримка під тремтіння мережі, інтерполяція і екстраполяція"""
+import random
+
+import pytest
+
+from interpolation import SnapshotBuffer, TELEPORT_DISTANCE
+
+STEP = 1 / 60
+
+
+def state(tick, x, y=300.0, vx=5, vy=0, paddles=(250, 250)):
+    return {"tick": tick, "ball": {"x": x, "y": y, "vx": vx, "vy": vy}, "paddles": list(paddles)}
+
+
+def steady_buffer(ticks=10, **options):
+    """Знімки 60 разів за секунду, рівно вчасно; м'яч летить на 5 пікселів за тік"""
+    buffer = SnapshotBuffer(**options)
+    for tick in range(ticks):
+        buffer.push(state(tick, 100.0 + 5 * tick), now=tick * STEP)
+    return buffer
+
+
+def test_steady_stream_keeps_minimum_delay():
+    buffer = steady_buffer()
+    assert buffer.jitter == pytest.approx(0.0)
+    assert buffer.delay == pytest.approx(max(buffer.min_delay, 2 * STEP))
+
+
+def test_interpolates_between_snapshots():
+    buffer = steady_buffer()
+    # Кадр малюється на delay у минулому: посередині між тіками 3 і 4
+    view = buffer.sample(now=3.5 * STEP + buffer.delay)
+    assert view["ball"] == (pytest.approx(117.5), pytest.approx(300.0))
+
+
+def test_jitter_grows_delay_up_to_maximum():
+    rng = random.Random(1)
+    buffer = SnapshotBuffer()
+    for tick in range(300):
+        buffer.push(state(tick, 100.0), now=tick * STEP + rng.uniform(0, 0.05))
+    assert buffer.min_delay < buffer.delay < buffer.max_delay
+
+    buffer = SnapshotBuffer()
+    for tick in range(300):
+        buffer.push(state(tick, 100.0), now=tick * STEP + rng.uniform(0, 2.0))
+    assert buffer.delay == buffer.max_delay
+
+
+def test_extrapolation_is_capped():
+    buffer = steady_buffer(max_extrapolation=0.1)
+    last_x = 100.0 + 5 * 9
+    # Трохи після останнього знімка — м'яч ще летить за швидкістю
+    view = buffer.sample(now=9 * STEP + buffer.delay + 0.05)
+    assert view["ball"][0] == pytest.approx(last_x + 5 * 0.05 * 60)
+    # Знімків давно немає — м'яч зупиняється через max_extrapolation
+    view = buffer.sample(now=9 * STEP + buffer.delay + 5.0)
+    assert view["ball"][0] == pytest.approx(last_x + 5 * 0.1 * 60)
+
+
+def test_out_of_order_and_duplicate_snapshots_are_dropped():
+    buffer = steady_buffer(ticks=5)
+    buffer.push(state(2, 999.0), now=5 * STEP)  # Запізнілий UDP-знімок
+    buffer.push(state(4, 999.0), now=5 * STEP)  # Той самий тік удруге (UDP і TCP)
+    assert [snapshot["tick"] for _, snapshot in buffer.snapshots] == [0, 1, 2, 3, 4]
+    assert all(snapshot["ball"]["x"] != 999.0 for _, snapshot in buffer.snapshots)
+
+
+def test_teleport_is_not_interpolated():
+    buffer = SnapshotBuffer()
+    buffer.push(state(0, 700.0), now=0.0)
+    buffer.push(state(1, 700.0 - TELEPORT_DISTANCE - 300), now=STEP)  # Гол і нова подача з центру
+    view = buffer.sample(now=0.5 * STEP + buffer.delay)
+    assert view["ball"][0] == 700.0
+
+
+def test_before_first_snapshot_shows_oldest():
+    buffer = steady_buffer()
+    assert buffer.sample(now=-1.0)["ball"][0] == 100.0
+    assert SnapshotBuffer().sample(now=0.0) is None
+
+
+def test_server_tick_rate_is_estimated():
+    buffer = SnapshotBuffer()
+    for tick in range(20):  # Сервер з --tick-rate 20
+        buffer.push(state(tick, 100.0), now=tick / 20)
+    buffer.push(state(25, 100.0), now=25 / 20)
+    assert buffer.tick_interval == pytest.approx(1 / 20)
+
+
+def test_clear_resets_state():
+    buffer = steady_buffer()
+    buffer.clear()
+    assert buffer.sample(now=1.0) is None
+    assert buffer.delay == buffer.min_delay and buffer.offset is None
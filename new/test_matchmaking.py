@@ -0,0 +1,65 @@
+"""Черга пошуку суперника: порядок пар, вихід з черги і статистика очікування"""
+import pytest
+
+from matchmaking import Matchmaker, percentile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_players_are_paired_in_arrival_order():
+    matchmaker = Matchmaker(clock=FakeClock())
+    assert matchmaker.join("a") is None
+    assert matchmaker.join("b") == ("a", "b")
+    assert matchmaker.join("c") is None
+    assert len(matchmaker) == 1
+    assert matchmaker.join("d") == ("c", "d")
+    assert len(matchmaker) == 0
+
+
+def test_leaving_player_is_skipped():
+    matchmaker = Matchmaker(clock=FakeClock())
+    matchmaker.join("a")
+    assert matchmaker.leave("a")
+    assert not matchmaker.leave("a")  # Вдруге — вже немає в черзі
+    assert matchmaker.join("b") is None
+    assert matchmaker.join("c") == ("b", "c")
+    assert matchmaker.stats.abandoned == 1
+
+
+def test_prune_removes_disconnected():
+    matchmaker = Matchmaker(clock=FakeClock())
+    matchmaker.join("gone")
+    assert matchmaker.prune(lambda player: player != "gone") == ["gone"]
+    assert len(matchmaker) == 0
+    assert matchmaker.join("x") is None
+
+
+def test_wait_time_stats():
+    clock = FakeClock()
+    matchmaker = Matchmaker(clock=clock)
+    matchmaker.join("a")
+    clock.now = 2.0
+    matchmaker.join("b")  # a чекав 2 с, b — нуль
+    matchmaker.join("c")
+    clock.now = 2.5
+    matchmaker.join("d")  # c чекав 0,5 с
+    stats = matchmaker.stats
+    assert stats.matches == 2
+    assert stats.total_wait == pytest.approx(2.5)
+    assert stats.max_wait == pytest.approx(2.0)
+    assert stats.percentiles() == {50: 0.5, 95: 2.0, 99: 2.0}  # Очікування 0, 0, 0,5 і 2 с
+    assert "пар: 2" in stats.summary()
+
+
+def test_percentile():
+    values = list(range(101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 0) == 0 and percentile(values, 100) == 100
+    assert percentile([], 50) is None
@@ -0,0 +1,93 @@
+"""Текстовий формат Prometheus: лічильники, гістограми, розподіли"""
+import asyncio
+
+from metrics import Registry, MetricsServer
+
+
+def test_counter_renders_help_type_and_value():
+    registry = Registry()
+    counter = registry.counter("pong_inputs_total", "Прийняті команди гравців")
+    counter.inc()
+    counter.inc(4)
+    assert registry.render() == (
+        "# HELP pong_inputs_total Прийняті команди гравців\n"
+        "# TYPE pong_inputs_total counter\n"
+        "pong_inputs_total 5\n"
+    )
+
+
+def test_counter_function_is_read_at_render_time():
+    value = [1]
+    registry = Registry()
+    registry.counter("pong_rooms_total", "Створені кімнати", lambda: value[0])
+    value[0] = 7
+    assert registry.render().splitlines()[-1] == "pong_rooms_total 7"
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = Registry()
+    histogram = registry.histogram("pong_tick_seconds", "Тривалість тіку", buckets=(0.001, 0.01, 0.1))
+    for value in (0.0005, 0.001, 0.005, 0.05, 0.5):
+        histogram.observe(value)
+    assert registry.render().splitlines() == [
+        "# HELP pong_tick_seconds Тривалість тіку",
+        "# TYPE pong_tick_seconds histogram",
+        # Межа кошика включна: 0.001 потрапляє в le="0.001"
+        'pong_tick_seconds_bucket{le="0.001"} 2',
+        'pong_tick_seconds_bucket{le="0.01"} 3',
+        'pong_tick_seconds_bucket{le="0.1"} 4',
+        'pong_tick_seconds_bucket{le="+Inf"} 5',
+        "pong_tick_seconds_sum 0.5565",
+        "pong_tick_seconds_count 5",
+    ]
+
+
+def test_empty_histogram_renders_zeros():
+    registry = Registry()
+    registry.histogram("pong_broadcast_seconds", "Розсилка", buckets=(0.01,))
+    assert registry.render().splitlines()[2:] == [
+        'pong_broadcast_seconds_bucket{le="0.01"} 0',
+        'pong_broadcast_seconds_bucket{le="+Inf"} 0',
+        "pong_broadcast_seconds_sum 0",
+        "pong_broadcast_seconds_count 0",
+    ]
+
+
+def test_collectors_run_before_render_and_metrics_keep_order():
+    registry = Registry()
+    gauge = registry.gauge("pong_rooms", "Активні кімнати")
+    registry.distribution("pong_client_queue", "Черги клієнтів", lambda: [3, 1, 2], percentiles=(50,))
+    registry.on_collect(lambda: gauge.set(2))
+    assert registry.render().splitlines() == [
+        "# HELP pong_rooms Активні кімнати",
+        "# TYPE pong_rooms gauge",
+        "pong_rooms 2",
+        "# HELP pong_client_queue Черги клієнтів",
+        "# TYPE pong_client_queue gauge",
+        'pong_client_queue{stat="count"} 3',
+        'pong_client_queue{stat="sum"} 6',
+        'pong_client_queue{stat="max"} 3',
+        'pong_client_queue{stat="p50"} 2',
+    ]
+
+
+def test_metrics_server_serves_exposition_text():
+    registry = Registry()
+    registry.counter("pong_matches_total", "Зіграні партії").inc(3)
+
+    async def scenario():
+        server = MetricsServer(registry, port=0)
+        await server.start()
+        port = server.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        server.server.close()
+        await server.server.wait_closed()
+        return response
+
+    head, body = asyncio.run(scenario()).split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert b"Content-Type: text/plain; version=0.0.4" in head
+    assert body.decode() == registry.render()
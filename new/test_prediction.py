@@ -0,0 +1,60 @@
+"""Передбачення своєї ракетки: узгодження зі знімками сервера"""
+from prediction import PaddlePredictor, MAX_PENDING_INPUTS
+from protocol import INPUT_DOWN, INPUT_UP
+from simulation import PADDLE_MIN_Y, PADDLE_SPEED
+
+
+def snapshot(tick, paddle, acked, pid=0):
+    paddles = [250, 250]
+    paddles[pid] = paddle
+    seqs = [0, 0]
+    seqs[pid] = acked
+    return {"tick": tick, "paddles": paddles, "input_seq": seqs}
+
+
+def test_local_inputs_move_immediately():
+    predictor = PaddlePredictor(0)
+    predictor.reconcile(snapshot(1, 250, 0))
+    predictor.apply_local(1, INPUT_DOWN)
+    predictor.apply_local(2, INPUT_DOWN)
+    assert predictor.y == 250 + 2 * PADDLE_SPEED
+
+
+def test_acked_inputs_are_dropped_and_rest_replayed():
+    predictor = PaddlePredictor(1)
+    predictor.reconcile(snapshot(1, 250, 0, pid=1))
+    for seq in range(1, 6):
+        predictor.apply_local(seq, INPUT_DOWN)
+    # Сервер застосував перші три команди
+    predictor.reconcile(snapshot(2, 250 + 3 * PADDLE_SPEED, 3, pid=1))
+    assert [seq for seq, _ in predictor.pending] == [4, 5]
+    assert predictor.y == 250 + 5 * PADDLE_SPEED
+
+
+def test_server_correction_wins():
+    predictor = PaddlePredictor(0)
+    predictor.reconcile(snapshot(1, 250, 0))
+    for seq in range(1, 4):
+        predictor.apply_local(seq, INPUT_UP)
+    assert predictor.y == 250 - 3 * PADDLE_SPEED
+    # Сервер застосував дві команди, але ракетка в нього вперлась у верхню межу
+    predictor.reconcile(snapshot(2, PADDLE_MIN_Y + 5, 2))
+    assert predictor.y == PADDLE_MIN_Y  # Третя команда повторена поверх позиції сервера
+    predictor.reconcile(snapshot(3, PADDLE_MIN_Y, 3))
+    assert not predictor.pending and predictor.y == PADDLE_MIN_Y
+
+
+def test_same_tick_is_reconciled_once():
+    predictor = PaddlePredictor(0)
+    state = snapshot(5, 300, 0)
+    predictor.reconcile(state)
+    predictor.apply_local(1, INPUT_DOWN)
+    predictor.reconcile(state)  # Той самий знімок ще раз — локальна команда не губиться
+    assert predictor.y == 300 + PADDLE_SPEED
+
+
+def test_pending_inputs_are_bounded():
+    predictor = PaddlePredictor(0)
+    for seq in range(1, MAX_PENDING_INPUTS * 2):
+        predictor.apply_local(seq, INPUT_DOWN)
+    assert len(predictor.pending) == MAX_PENDING_INPUTS
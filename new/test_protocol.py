@@ -0,0 +1,162 @@
+"""Бінарний протокол: ключові кадри, дельти і команди проходять туди й назад без втрат"""
+import random
+
+import pytest
+
+import simulation
+from protocol import (
+    FRAME_DELTA, HEADER, INPUT_DOWN, INPUT_UP, PROTOCOL_VERSION, DeltaBaseline, FrameDecoder, InputDecoder,
+    ProtocolError, SnapshotHistory, encode_delta, encode_input, encode_keyframe, fields_to_state, quantize_game_state,
+    quantize_state
+)
+
+
+def make_fields(rng, tick):
+    return quantize_state(
+        (rng.uniform(0, 500), rng.uniform(0, 500)),
+        {"x": rng.uniform(0, 800), "y": rng.uniform(0, 600), "vx": rng.uniform(-20, 20), "vy": rng.uniform(-20, 20)},
+        (rng.randint(0, 10), rng.randint(0, 10)),
+        rng.randint(0, 3),
+        rng.choice((None, 0, 1)),
+        rng.choice((None, "wall_hit", "platform_hit")),
+        (tick, tick * 2),
+    )
+
+
+def nudge(rng, fields):
+    """Наступний тік: м'яч трохи зсунувся, інколи змінюється щось іще"""
+    fields = list(fields)
+    fields[2] += rng.randint(-40, 40) if rng.random() < 0.9 else rng.randint(-2000, 2000)
+    fields[3] += rng.randint(-40, 40)
+    if rng.random() < 0.3:
+        fields[0] = rng.randint(0, 4000)
+    if rng.random() < 0.05:
+        fields[6] = min(fields[6] + 1, 10)
+    fields[2] = max(0, fields[2])
+    fields[3] = max(0, fields[3])
+    return tuple(fields)
+
+
+def test_quantize_game_state_matches_quantize_state():
+    rng = random.Random(7)
+    state = simulation.new_game(7)
+    for tick in range(3000):
+        state = simulation.step(state, ((rng.choice((INPUT_UP, INPUT_DOWN)),), ()))
+        expected = quantize_state(state.paddles, state.ball, state.scores, state.countdown,
+                                  state.winner if state.game_over else None, state.sound_event, (tick, 1))
+        assert quantize_game_state(state, (tick, 1)) == expected
+
+
+def test_keyframe_round_trip():
+    fields = make_fields(random.Random(1), 5)
+    states = FrameDecoder().feed(encode_keyframe(5, fields))
+    assert states == [fields_to_state(5, fields)]
+
+
+def test_delta_round_trip_through_history():
+    rng = random.Random(2)
+    history = SnapshotHistory()
+    decoder = FrameDecoder()
+    fields = make_fields(rng, 0)
+    acked = None
+    for tick in range(500):
+        fields = nudge(rng, fields)
+        history.push(tick, fields)
+        frame, keyframe = history.frame_for(acked)
+        assert keyframe == (acked is None)
+        # Байти приходять шматками довільної довжини, як із TCP
+        states = []
+        for start in range(0, len(frame), 5):
+            states += decoder.feed(frame[start:start + 5])
+        assert states == [fields_to_state(tick, fields)]
+        # Клієнт підтверджує не кожен кадр — база дельти буває на кілька тіків старша
+        if rng.random() < 0.5:
+            acked = tick
+
+
+def test_delta_is_smaller_than_keyframe():
+    rng = random.Random(3)
+    base = make_fields(rng, 0)
+    fields = nudge(rng, base)
+    assert len(encode_delta(1, fields, 0, base)) < len(encode_keyframe(1, fields))
+
+
+def test_missing_base_requests_keyframe():
+    rng = random.Random(4)
+    history = SnapshotHistory()
+    baseline = DeltaBaseline(reliable=False)
+    decoder = FrameDecoder()
+    fields = make_fields(rng, 0)
+    history.push(0, fields)
+    frame, keyframe = history.frame_for(baseline.base_for(0))
+    baseline.sent(0, keyframe)
+    baseline.acknowledge(0)
+    assert keyframe and not decoder.need_keyframe()
+
+    # Клієнт не отримав кадр тіку 0, а сервер уже шле дельту відносно нього
+    fields = nudge(rng, fields)
+    history.push(1, fields)
+    frame, keyframe = history.frame_for(baseline.base_for(1))
+    baseline.sent(1, keyframe)
+    assert not keyframe
+    assert decoder.feed_datagram(frame) == []
+    assert decoder.need_keyframe()
+    assert not decoder.need_keyframe()
+
+    # Сервер отримав прохання — наступним іде ключовий кадр
+    baseline.reset()
+    fields = nudge(rng, fields)
+    history.push(2, fields)
+    frame, keyframe = history.frame_for(baseline.base_for(2))
+    assert keyframe
+    assert decoder.feed_datagram(frame) == [fields_to_state(2, fields)]
+
+
+def test_stale_and_duplicate_frames_are_dropped():
+    rng = random.Random(8)
+    decoder = FrameDecoder()
+    fields = [make_fields(rng, 0)]
+    for tick in range(1, 4):
+        fields.append(nudge(rng, fields[-1]))
+    assert decoder.feed_datagram(encode_keyframe(0, fields[0]))
+    assert decoder.feed_datagram(encode_delta(3, fields[3], 0, fields[0])) == [fields_to_state(3, fields[3])]
+    # UDP приніс старіший кадр пізніше — його відкидаємо, не просячи ключового кадру
+    assert decoder.feed_datagram(encode_delta(2, fields[2], 1, fields[1])) == []
+    assert not decoder.need_keyframe()
+    # Той самий тік ще раз (ключовий кадр дублюється через TCP)
+    assert decoder.feed(encode_keyframe(3, fields[3])) == []
+
+
+def test_truncated_keyframe_raises():
+    frame = encode_keyframe(1, make_fields(random.Random(5), 1))
+    broken = HEADER.pack(PROTOCOL_VERSION, frame[1], 4) + frame[HEADER.size:HEADER.size + 4]
+    with pytest.raises(ProtocolError):
+        FrameDecoder().feed(broken)
+
+
+def test_delta_with_wrong_length_raises():
+    rng = random.Random(6)
+    base = make_fields(rng, 0)
+    decoder = FrameDecoder()
+    decoder.feed(encode_keyframe(0, base))
+    payload = encode_delta(1, nudge(rng, base), 0, base)[HEADER.size:] + b"\0"
+    with pytest.raises(ProtocolError):
+        decoder.feed(HEADER.pack(PROTOCOL_VERSION, FRAME_DELTA, len(payload)) + payload)
+
+
+def test_bad_datagram_is_dropped():
+    assert FrameDecoder().feed_datagram(b"\xff\x01\x00\x03abc") == []
+
+
+def test_input_round_trip():
+    commands = [(seq, random.Random(seq).choice((INPUT_UP, INPUT_DOWN))) for seq in range(1, 50)]
+    data = b"".join(encode_input(seq, command) for seq, command in commands)
+    decoder = InputDecoder()
+    decoded = decoder.feed(data[:7]) + decoder.feed(data[7:])
+    assert decoded == commands
+
+
+def test_input_with_wrong_length_raises():
+    frame = encode_input(1, INPUT_UP)
+    with pytest.raises(ProtocolError):
+        InputDecoder().feed(frame[:1] + frame[1:2] + b"\x00\x00")
@@ -0,0 +1,80 @@
+"""Запис партії і повтор: повтор приходить до того самого стану і ловить розбіжності"""
+import random
+
+import pytest
+
+import simulation
+from protocol import INPUT_DOWN, INPUT_UP
+from recording import (
+    CHECKPOINT_INTERVAL, RECORD_CHECKPOINT, MatchRecorder, ReplayError, read_recording, replay, replay_states
+)
+
+
+def record_match(path, seed, ticks, tick_rate=simulation.TICK_RATE, forfeit_by=None):
+    """Грає партію з випадковими рідкими командами, пише її у path і повертає всі стани"""
+    rng = random.Random(seed)
+    recorder = MatchRecorder(str(path))
+    recorder.start(seed, tick_rate)
+    state = simulation.new_game(seed, tick_rate)
+    states = [state]
+    for _ in range(ticks):
+        inputs = tuple(
+            tuple(rng.choice((INPUT_UP, INPUT_DOWN)) for _ in range(rng.randint(1, 3))) if rng.random() < 0.2 else ()
+            for _ in range(2))
+        state = simulation.step(state, inputs, tick_rate)
+        recorder.record(state, inputs)
+        states.append(state)
+        if state.game_over:
+            break
+    if forfeit_by is not None and not state.game_over:
+        state = simulation.forfeit(state, forfeit_by)
+        recorder.forfeit(state, forfeit_by)
+        states.append(state)
+    recorder.close()
+    return states
+
+
+def test_replay_reaches_recorded_state(tmp_path):
+    path = tmp_path / "match.pongrec"
+    states = record_match(path, seed=12345, ticks=CHECKPOINT_INTERVAL * 5 + 17)
+    assert list(replay_states(str(path))) == states
+    assert any(kind == RECORD_CHECKPOINT for kind, _, _ in read_recording(str(path))[2])
+
+
+@pytest.mark.parametrize("tick_rate", [60, 20])
+def test_replay_of_finished_match(tmp_path, tick_rate):
+    path = tmp_path / "match.pongrec"
+    states = record_match(path, seed=7, ticks=200000, tick_rate=tick_rate)
+    assert states[-1].game_over
+    state, ticks, _ = replay(str(path))
+    assert state == states[-1]
+    assert ticks == len(states)
+
+
+def test_replay_of_forfeit(tmp_path):
+    path = tmp_path / "match.pongrec"
+    states = record_match(path, seed=99, ticks=1000, forfeit_by=1)
+    state, _, _ = replay(str(path))
+    assert state == states[-1]
+    assert state.winner == 0
+
+
+def test_tampered_checkpoint_raises(tmp_path):
+    path = tmp_path / "match.pongrec"
+    record_match(path, seed=3, ticks=CHECKPOINT_INTERVAL * 2)
+    data = bytearray(path.read_bytes())
+    # Перша контрольна точка: тип запису, тік, ракетки... — псуємо ракетку першого гравця
+    offset = data.index(bytes((RECORD_CHECKPOINT,)) + CHECKPOINT_INTERVAL.to_bytes(4, "big")) + 5
+    data[offset + 1] ^= 0x01
+    path.write_bytes(bytes(data))
+    with pytest.raises(ReplayError):
+        replay(str(path))
+    # Без звірки повтор усе одно проходить до кінця
+    replay(str(path), verify=False)
+
+
+def test_not_a_recording_raises(tmp_path):
+    path = tmp_path / "junk.pongrec"
+    path.write_bytes(b"definitely not a recording")
+    with pytest.raises(ReplayError):
+        replay(str(path))
@@ -0,0 +1,84 @@
+"""Планувальник тіків з фіксованим кроком на підставному годиннику"""
+import asyncio
+
+import pytest
+
+from scheduler import TickScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler(tick_rate=60, max_catch_up=5):
+    clock = FakeClock()
+    scheduler = TickScheduler(tick_rate, max_catch_up, clock=clock)
+    scheduler.start()
+    return scheduler, clock
+
+
+def test_accumulator_runs_whole_steps_only():
+    scheduler, clock = make_scheduler(tick_rate=50)
+    clock.advance(0.01)
+    assert scheduler.advance() == 0
+    clock.advance(0.015)
+    assert scheduler.advance() == 1
+    assert scheduler.accumulator == pytest.approx(0.005)
+    clock.advance(0.035)
+    assert scheduler.advance() == 2
+    assert scheduler.accumulator == pytest.approx(0.0)
+    assert scheduler.stats.catch_up_steps == 1
+
+
+def test_late_tick_catches_up_and_clamps():
+    scheduler, clock = make_scheduler(tick_rate=10, max_catch_up=3)
+    clock.advance(0.75)  # 7 пропущених кроків
+    assert scheduler.advance() == 3
+    assert scheduler.stats.dropped_steps == 4
+    assert scheduler.stats.catch_up_steps == 2
+    # Відкинутий час не повертається — наступний крок через повний інтервал
+    assert scheduler.accumulator == pytest.approx(0.0)
+    clock.advance(0.05)
+    assert scheduler.advance() == 0
+
+
+def test_time_until_next():
+    scheduler, clock = make_scheduler(tick_rate=20)
+    assert scheduler.time_until_next() == pytest.approx(0.05)
+    clock.advance(0.03)
+    assert scheduler.time_until_next() == pytest.approx(0.02)
+    clock.advance(0.04)
+    assert scheduler.time_until_next() == 0.0
+    scheduler.advance()
+    assert scheduler.time_until_next() == pytest.approx(0.03)
+
+
+def test_run_steps_records_durations():
+    scheduler, clock = make_scheduler(tick_rate=10)
+    clock.advance(0.2)
+    scheduler.run_steps(lambda: clock.advance(0.15))  # Кожен крок довший за 0,1 с
+    stats = scheduler.stats
+    assert stats.ticks == 2 and stats.overruns == 2
+    assert stats.max_time == pytest.approx(0.15)
+    assert stats.average_time == pytest.approx(0.15)
+
+
+def test_run_async_keeps_fixed_rate():
+    scheduler = TickScheduler(tick_rate=200)
+    ticks = []
+
+    def callback():
+        ticks.append(scheduler.clock())
+        if len(ticks) == 40:
+            scheduler.stop()
+
+    asyncio.run(asyncio.wait_for(scheduler.run_async(callback), 5))
+    # Запізнілі кроки наздоганяються пачкою, але загалом 40 тіків не швидші за 40 кроків
+    assert ticks[-1] - ticks[0] >= 38 * scheduler.step
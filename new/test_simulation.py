@@ -0,0 +1,139 @@
+"""Ядро симуляції: детермінованість і безперервні зіткнення м'яча"""
+import random
+
+import pytest
+
+import simulation
+from protocol import INPUT_UP, INPUT_DOWN
+
+COMMANDS = ((), (INPUT_UP,), (INPUT_DOWN,), (INPUT_UP, INPUT_UP))
+
+
+def random_inputs(rng):
+    return rng.choice(COMMANDS), rng.choice(COMMANDS)
+
+
+def play(seed, ticks, tick_rate=simulation.TICK_RATE, input_seed=1):
+    rng = random.Random(input_seed)
+    state = simulation.new_game(seed, tick_rate)
+    states = [state]
+    for _ in range(ticks):
+        state = simulation.step(state, random_inputs(rng), tick_rate)
+        states.append(state)
+    return states
+
+
+def test_same_seed_and_inputs_give_identical_match():
+    assert play(42, 3000) == play(42, 3000)
+
+
+def test_different_seeds_give_different_matches():
+    assert play(1, 600)[-1] != play(2, 600)[-1]
+
+
+def test_step_does_not_change_previous_state():
+    state = simulation.new_game(7)
+    before = state.as_tuple()
+    simulation.step(state, ((INPUT_UP,), (INPUT_DOWN,)))
+    assert state.as_tuple() == before
+
+
+def test_countdown_lasts_countdown_start_seconds():
+    state = simulation.new_game(3, tick_rate=20)
+    for _ in range(simulation.COUNTDOWN_START * 20 - 1):
+        state = simulation.step(state, tick_rate=20)
+        assert state.countdown > 0
+    state = simulation.step(state, tick_rate=20)
+    assert state.countdown == 0
+
+
+def test_paddles_stay_inside_field():
+    state = simulation.new_game(5)
+    for _ in range(100):
+        state = simulation.step(state, ((INPUT_UP,), (INPUT_DOWN,)))
+    assert state.paddles == (simulation.PADDLE_MIN_Y, simulation.PADDLE_MAX_Y)
+
+
+def test_match_ends_with_winner_at_win_score():
+    for state in play(9, 200000):
+        if state.game_over:
+            break
+    assert state.game_over
+    assert state.scores[state.winner] == simulation.WIN_SCORE
+
+
+def test_forfeit_gives_win_to_opponent():
+    state = simulation.forfeit(simulation.new_game(11), 0)
+    assert state.game_over and state.winner == 1
+
+
+# Ракетка завтовшки 20 пікселів: м'яч, що пролітає більше за тік, раніше міг її проскочити
+PADDLE_THICKNESS = 20
+
+
+@pytest.mark.parametrize("speed", [PADDLE_THICKNESS + 1, 50, 120, 300])
+def test_fast_ball_bounces_off_left_paddle(speed):
+    x, y, vx, vy, sound = simulation.sweep_ball(
+        simulation.LEFT_PADDLE_X + 10, 300, -speed, 0, 1.0, 250, simulation.PADDLE_START_Y)
+    assert vx == speed and sound == "platform_hit"
+    assert x == simulation.LEFT_PADDLE_X + speed - 10
+
+
+@pytest.mark.parametrize("speed", [PADDLE_THICKNESS + 1, 50, 120, 300])
+def test_fast_ball_bounces_off_right_paddle(speed):
+    x, y, vx, vy, sound = simulation.sweep_ball(
+        simulation.RIGHT_PADDLE_X - 10, 300, speed, 3, 1.0, simulation.PADDLE_START_Y, 250)
+    assert vx == -speed and sound == "platform_hit"
+    assert x == simulation.RIGHT_PADDLE_X - speed + 10
+
+
+def test_ball_beside_paddle_flies_past():
+    x, y, vx, vy, sound = simulation.sweep_ball(
+        simulation.LEFT_PADDLE_X + 10, 100, -50, 0, 1.0, 400, simulation.PADDLE_START_Y)
+    assert vx == -50 and x < simulation.LEFT_PADDLE_X - PADDLE_THICKNESS and sound is None
+
+
+def test_large_step_does_not_tunnel_through_paddle():
+    """На 7 Гц крок м'яча більший за товщину ракетки; ракетка стоїть там, де м'яч перетне її лінію"""
+    tick_rate = 7
+    assert simulation.BALL_SPEED * simulation.TICK_RATE / tick_rate > PADDLE_THICKNESS
+    state = simulation.new_game(21, tick_rate)
+    state.countdown = 0
+    bounces = 0
+    for _ in range(2000):
+        # Ракетки ходять за м'ячем ідеально — жодного гола бути не може
+        target = min(max(round(state.ball_y) - simulation.PADDLE_HEIGHT // 2, simulation.PADDLE_MIN_Y),
+                     simulation.PADDLE_MAX_Y)
+        state.paddles = (target, target)
+        state = simulation.step(state, tick_rate=tick_rate)
+        bounces += state.sound_event == "platform_hit"
+        assert simulation.LEFT_PADDLE_X <= state.ball_x <= simulation.RIGHT_PADDLE_X
+    assert state.scores == (0, 0) and bounces > 10
+
+
+def test_corner_paddle_then_wall():
+    """М'яч одночасно доходить до лінії ракетки і верхньої стінки — відбивається від обох"""
+    x, y, vx, vy, sound = simulation.sweep_ball(
+        simulation.LEFT_PADDLE_X + 10, simulation.WALL_TOP + 10, -30, -30, 1.0,
+        simulation.PADDLE_MIN_Y, simulation.PADDLE_START_Y)
+    assert (x, y, vx, vy) == (simulation.LEFT_PADDLE_X + 20, simulation.WALL_TOP + 20, 30, 30)
+    assert sound == "wall_hit"
+
+
+def test_corner_wall_then_paddle():
+    """Спершу стінка, а вже відбитий від неї м'яч — у ракетку в тому самому тіку"""
+    x, y, vx, vy, sound = simulation.sweep_ball(
+        simulation.LEFT_PADDLE_X + 15, simulation.WALL_TOP + 10, -30, -30, 1.0,
+        simulation.PADDLE_MIN_Y, simulation.PADDLE_START_Y)
+    assert vx == 30 and vy == 30 and sound == "platform_hit"
+    assert x == pytest.approx(simulation.LEFT_PADDLE_X + 15)
+    assert y == pytest.approx(simulation.WALL_TOP + 20)
+
+
+def test_corner_wall_bounce_misses_low_paddle():
+    """Після стінки м'яч проходить над ракеткою, що стоїть нижче"""
+    x, y, vx, vy, sound = simulation.sweep_ball(
+        simulation.LEFT_PADDLE_X + 15, simulation.WALL_TOP + 10, -30, -30, 1.0,
+        simulation.PADDLE_MAX_Y, simulation.PADDLE_START_Y)
+    assert vx == -30 and vy == 30 and sound == "wall_hit"
+    assert x < simulation.LEFT_PADDLE_X
@@ -1,9 +1,20 @@
 from pygame import *
+import select
 import socket
-import json
+from collections import deque
 from threading import Thread
 import os
 import sys
+from time import perf_counter
+
+import assets
+import protocol
+from connector import Connector
+from prediction import PaddlePredictor
+from interpolation import SnapshotBuffer
+from render import DirtyRenderer, render_text
+
+STARTED = perf_counter()  # Від цього моменту міряємо, скільки чекати першого кадру
 
 # ---PYGAME НАЛАШТУВАННЯ ---
 WIDTH, HEIGHT = 800, 600
@@ -17,6 +28,7 @@ display.set_caption("Пінг-Понг")
 font_title = font.Font(None, 64)
 font_button = font.Font(None, 36)
 font_win = font.Font(None, 72)
+font_countdown = font.Font(None, 72)
 font_main = font.Font(None, 36)
 font_small = font.Font(None, 24)
 
@@ -53,62 +65,57 @@ def load_music_safe(path, volume=0.3):
         return False
 
 
-print("🔊 Завантажую звуки...")
-
-# Завантаження звукових ефектів
-paddle_hit_sound = load_sound_safe('audio/paddle_hit.wav', 0.6)  # Звук удару по ракетці
-wall_hit_sound = load_sound_safe('audio/wall_hit.wav', 0.4)  # Звук удару об стіну
-menu_click_sound = load_sound_safe('audio/menu_click.wav', 0.5)  # Звук кліку в меню
-win_sound = load_sound_safe('audio/win.wav', 0.7)  # Звук перемоги
-lose_sound = load_sound_safe('audio/lose.wav', 0.7)  # Звук поразки
-
-background_music_loaded = load_music_safe('audio/background_music.wav', 0.3)
+# === ФОНОВЕ ЗАВАНТАЖЕННЯ РЕСУРСІВ ===
+# Звуки і картинки вантажаться на кількох потоках, а вікно тим часом уже показує меню
+print("🔊🎨 Завантажую звуки і зображення у фоні...")
+loader = assets.AssetLoader()
+# Картинки беруться з готового кешу (assets.py): без декодування і масштабування на кожному запуску
+loader.submit("images", assets.load_images)
+loader.submit("menu_click_sound", load_sound_safe, 'audio/menu_click.wav', 0.5)  # Звук кліку в меню
+loader.submit("paddle_hit_sound", load_sound_safe, 'audio/paddle_hit.wav', 0.6)  # Звук удару по ракетці
+loader.submit("wall_hit_sound", load_sound_safe, 'audio/wall_hit.wav', 0.4)  # Звук удару об стіну
+loader.submit("win_sound", load_sound_safe, 'audio/win.wav', 0.7)  # Звук перемоги
+loader.submit("lose_sound", load_sound_safe, 'audio/lose.wav', 0.7)  # Звук поразки
+loader.submit("background_music", load_music_safe, 'audio/background_music.wav', 0.3)
+# Без цього гру не починаємо: підключення чекає, поки вони завантажаться
+GAME_ASSETS = ("images", "paddle_hit_sound", "wall_hit_sound", "win_sound", "lose_sound")
+
+# Поки ресурс не готовий, на його місці None: фони заливаються кольором, звуки не грають
+paddle_hit_sound = wall_hit_sound = menu_click_sound = win_sound = lose_sound = None
+background_music_loaded = False
+menu_bg = game_bg = settings_bg = win_bg = None
+ball_img = paddle1_img = paddle2_img = None
 
 # Змінна для відстеження стану фонової музики
 music_playing = False
 
-
-# === ЗАВАНТАЖЕННЯ ЗОБРАЖЕНЬ ===
-def load_image_safe(path, size=None):
-    """
-    Безпечно завантажує зображення з обробкою помилок
-    path - шлях до файлу
-    size - розмір (width, height) або None
-    Повертає зображення або None при помилці
-    """
-    try:
-        img = image.load(path)
-        if size:
-            img = transform.scale(img, size)
-        return img.convert_alpha()
-    except:
-        print(f"⚠️ Не вдалося завантажити {path}")
-        return None
-
-
-print("🎨 Завантажую зображення...")
-
-# Фони
-menu_bg = load_image_safe('images/backgrounds/menu_bg.jpg', (WIDTH, HEIGHT))
-game_bg = load_image_safe('images/backgrounds/game_bg.jpg', (WIDTH, HEIGHT))
-settings_bg = load_image_safe('images/backgrounds/settings_bg.jpg', (WIDTH, HEIGHT))
-win_bg = load_image_safe('images/backgrounds/win_bg.jpg', (WIDTH, HEIGHT))
-
-# Резервний фон
-if game_bg is None:
-    try:
-        game_bg = image.load('bg.jpg')
-        game_bg = transform.scale(game_bg, (WIDTH, HEIGHT))
-    except:
-        print("⚠️ Фонове зображення не знайдено")
-        game_bg = None
-
-# Ігрові елементи
-ball_img = load_image_safe('images/game_elements/ball.png', (20, 20))
-paddle1_img = load_image_safe('images/game_elements/paddle1.png', (20, 100))
-paddle2_img = load_image_safe('images/game_elements/paddle2.png', (20, 100))
-
-print("✅ Завантаження зображень завершено!")
+# Під час гри перемальовуються лише ділянки під м'ячем, ракетками і рахунком
+renderer = DirtyRenderer(screen, game_bg)
+
+
+def apply_loaded_assets(block=False):
+    """Забирає з фонових потоків те, що вже завантажилось; з block=True чекає на все"""
+    global menu_bg, game_bg, settings_bg, win_bg, ball_img, paddle1_img, paddle2_img, background_music_loaded
+    loaded = loader.take_ready(block)
+    for name, value in loaded:
+        if name == "images":
+            images = value or {}
+            menu_bg = images.get("menu_bg")
+            game_bg = images.get("game_bg")
+            settings_bg = images.get("settings_bg")
+            win_bg = images.get("win_bg")
+            ball_img = images.get("ball")
+            paddle1_img = images.get("paddle1")
+            paddle2_img = images.get("paddle2")
+            renderer.set_background(game_bg)
+        elif name == "background_music":
+            background_music_loaded = bool(value)
+            if current_state in (CONNECTING, PLAYING):
+                start_background_music()  # Гравець натиснув «Грати» раніше, ніж музика завантажилась
+        else:
+            globals()[name] = value  # Звуки: назва ресурсу збігається з назвою змінної
+    if loaded and loader.elapsed is not None:
+        print(f"✅ Ресурси завантажено за {loader.elapsed * 1000:.0f} мс")
 
 
 # === ФУНКЦІЇ ДЛЯ РОБОТИ З МУЗИКОЮ ===
@@ -164,7 +171,7 @@ class Button:
         draw.rect(screen, (255, 255, 255), self.rect, 2)  # Біла рамка
 
         # Малюємо текст
-        text_surface = font_button.render(self.text, True, text_color)
+        text_surface = render_text(font_button, self.text, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -192,15 +199,18 @@ game_settings = {
     "server_ip": "localhost",
     "server_port": 8080,
     "player_name": "Гравець",
-    "sound_enabled": True
+    "sound_enabled": True,
+    "transport": protocol.TRANSPORT_TCP  # tcp або udp (якщо сервер запущено з --udp)
 }
 
 
 # === ФУНКЦІЇ ДЛЯ КНОПОК МЕНЮ ===
 def start_game():
-    global current_state
+    global current_state, connector
     current_state = CONNECTING
     start_background_music()
+    # Підключаємось у фоні: вікно тим часом малює екран підключення і реагує на «Назад»
+    connector = Connector(connect_to_server, close_connection).start()
     print("🎮 Підключення до гри...")
 
 
@@ -213,12 +223,16 @@ def open_settings():
 def exit_game():
     print("👋 До побачення!")
     stop_background_music()
+    loader.close()
     quit()
     sys.exit()
 
 
 def back_to_menu():
-    global current_state
+    global current_state, connector
+    if connector:
+        connector.cancel()
+        connector = None
     current_state = MENU
     stop_background_music()
     print("🏠 Повертаюся до меню...")
@@ -235,6 +249,15 @@ def toggle_sound():
         print("🔇 Звук вимкнено")
 
 
+def toggle_transport():
+    """Перемикає транспорт між TCP і UDP"""
+    if game_settings["transport"] == protocol.TRANSPORT_TCP:
+        game_settings["transport"] = protocol.TRANSPORT_UDP
+    else:
+        game_settings["transport"] = protocol.TRANSPORT_TCP
+    print(f"📡 Транспорт: {game_settings['transport'].upper()}")
+
+
 # === СТВОРЕННЯ КНОПОК МЕНЮ ===
 menu_buttons = [
     Button(WIDTH // 2 - 100, 250, 200, 50, "Грати", start_game),
@@ -245,7 +268,8 @@ menu_buttons = [
 settings_buttons = [
     Button(50, 500, 150, 40, "Назад", back_to_menu),
     Button(WIDTH - 200, 500, 150, 40, "Застосувати", back_to_menu),
-    Button(350, 300, 150, 40, "Звук вкл/викл", toggle_sound)
+    Button(350, 300, 150, 40, "Звук вкл/викл", toggle_sound),
+    Button(520, 345, 150, 40, "TCP / UDP", toggle_transport)
 ]
 
 
@@ -259,12 +283,12 @@ def draw_menu():
         screen.fill((30, 30, 60))
 
     # Заголовок
-    title_text = font_title.render("ПІНГ-ПОНГ", True, (255, 255, 255))
+    title_text = render_text(font_title, "ПІНГ-ПОНГ", (255, 255, 255))
     title_rect = title_text.get_rect(center=(WIDTH // 2, 150))
     screen.blit(title_text, title_rect)
 
     # Підзаголовок
-    subtitle_text = font_main.render("Онлайн гра для двох гравців", True, (200, 200, 200))
+    subtitle_text = render_text(font_main, "Онлайн гра для двох гравців", (200, 200, 200))
     subtitle_rect = subtitle_text.get_rect(center=(WIDTH // 2, 190))
     screen.blit(subtitle_text, subtitle_rect)
 
@@ -282,7 +306,7 @@ def draw_settings():
         screen.fill((40, 40, 70))
 
     # Заголовок
-    title_text = font_title.render("НАЛАШТУВАННЯ", True, (255, 255, 255))
+    title_text = render_text(font_title, "НАЛАШТУВАННЯ", (255, 255, 255))
     title_rect = title_text.get_rect(center=(WIDTH // 2, 80))
     screen.blit(title_text, title_rect)
 
@@ -290,37 +314,44 @@ def draw_settings():
     y_offset = 150
 
     # IP сервера
-    ip_label = font_main.render("IP сервера:", True, (255, 255, 255))
+    ip_label = render_text(font_main, "IP сервера:", (255, 255, 255))
     screen.blit(ip_label, (100, y_offset))
-    ip_value = font_main.render(game_settings["server_ip"], True, (200, 255, 200))
+    ip_value = render_text(font_main, game_settings["server_ip"], (200, 255, 200))
     screen.blit(ip_value, (300, y_offset))
 
     # Порт сервера
     y_offset += 50
-    port_label = font_main.render("Порт:", True, (255, 255, 255))
+    port_label = render_text(font_main, "Порт:", (255, 255, 255))
     screen.blit(port_label, (100, y_offset))
-    port_value = font_main.render(str(game_settings["server_port"]), True, (200, 255, 200))
+    port_value = render_text(font_main, str(game_settings["server_port"]), (200, 255, 200))
     screen.blit(port_value, (300, y_offset))
 
     # Ім'я гравця
     y_offset += 50
-    name_label = font_main.render("Ім'я гравця:", True, (255, 255, 255))
+    name_label = render_text(font_main, "Ім'я гравця:", (255, 255, 255))
     screen.blit(name_label, (100, y_offset))
-    name_value = font_main.render(game_settings["player_name"], True, (200, 255, 200))
+    name_value = render_text(font_main, game_settings["player_name"], (200, 255, 200))
     screen.blit(name_value, (300, y_offset))
 
     # Звук
     y_offset += 50
-    sound_label = font_main.render("Звук:", True, (255, 255, 255))
+    sound_label = render_text(font_main, "Звук:", (255, 255, 255))
     screen.blit(sound_label, (100, y_offset))
     sound_status = "Увімкнено" if game_settings["sound_enabled"] else "Вимкнено"
     sound_color = (200, 255, 200) if game_settings["sound_enabled"] else (255, 200, 200)
-    sound_value = font_main.render(sound_status, True, sound_color)
+    sound_value = render_text(font_main, sound_status, sound_color)
     screen.blit(sound_value, (300, y_offset))
 
+    # Транспорт
+    y_offset += 50
+    transport_label = render_text(font_main, "Транспорт:", (255, 255, 255))
+    screen.blit(transport_label, (100, y_offset))
+    transport_value = render_text(font_main, game_settings["transport"].upper(), (200, 255, 200))
+    screen.blit(transport_value, (300, y_offset))
+
     # Підказка
-    hint_text = font_small.render("Підказка: Змініть налаштування в коді для налаштування IP", True, (150, 150, 150))
-    screen.blit(hint_text, (100, 400))
+    hint_text = render_text(font_small, "Підказка: Змініть налаштування в коді для налаштування IP", (150, 150, 150))
+    screen.blit(hint_text, (100, 450))
 
     # Кнопки
     for button in settings_buttons:
@@ -336,20 +367,26 @@ def draw_connecting():
         screen.fill((30, 30, 30))
 
     # Текст підключення
-    connecting_text = font_title.render("Підключення...", True, (255, 255, 255))
+    connecting_text = render_text(font_title, "Підключення...", (255, 255, 255))
     connecting_rect = connecting_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
     screen.blit(connecting_text, connecting_rect)
 
     # Підтекст
-    hint_text = font_main.render("Очікування з'єднання з сервером", True, (200, 200, 200))
+    hint_text = render_text(font_main, "Очікування з'єднання з сервером", (200, 200, 200))
     hint_rect = hint_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
     screen.blit(hint_text, hint_rect)
 
     # Інструкція
-    instruction_text = font_small.render("Переконайтеся, що сервер запущено", True, (150, 150, 150))
+    instruction_text = render_text(font_small, "Переконайтеся, що сервер запущено", (150, 150, 150))
     instruction_rect = instruction_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
     screen.blit(instruction_text, instruction_rect)
 
+    # Стан спроб підключення
+    if connector:
+        status_text = render_text(font_small, connector.status(), (150, 150, 150))
+        status_rect = status_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 75))
+        screen.blit(status_text, status_rect)
+
     # Кнопка назад
     back_button = Button(WIDTH // 2 - 75, HEIGHT // 2 + 100, 150, 40, "Назад", back_to_menu)
     back_button.hovered = back_button.rect.collidepoint(mouse.get_pos())
@@ -358,33 +395,126 @@ def draw_connecting():
     return back_button
 
 
+def draw_background():
+    """Малює фон гри"""
+    if game_bg:
+        screen.blit(game_bg, (0, 0))
+    else:
+        screen.fill((30, 30, 30))
+
+
+def draw_game(paddles, ball_x, ball_y, scores):
+    """
+    Малює і показує кадр гри: стирає ракетки, м'яч і рахунок минулого кадру,
+    малює нові і оновлює на екрані лише ці ділянки
+    """
+    renderer.begin()
+
+    # Ракетки
+    if paddle1_img:
+        renderer.blit(paddle1_img, (20, paddles[0]))
+    else:
+        renderer.mark(draw.rect(screen, (0, 255, 0), (20, paddles[0], 20, 100)))
+
+    if paddle2_img:
+        renderer.blit(paddle2_img, (WIDTH - 40, paddles[1]))
+    else:
+        renderer.mark(draw.rect(screen, (255, 0, 255), (WIDTH - 40, paddles[1], 20, 100)))
+
+    # М'яч
+    if ball_img:
+        renderer.blit(ball_img, (ball_x - 10, ball_y - 10))
+    else:
+        renderer.mark(draw.circle(screen, (255, 255, 255), (ball_x, ball_y), 10))
+
+    # Рахунок
+    score_text = render_text(font_main, f"{scores[0]} : {scores[1]}", (255, 255, 255))
+    renderer.blit(score_text, (WIDTH // 2 - 25, 20))
+
+    renderer.end()
+
+
 # === МЕРЕЖЕВІ ФУНКЦІЇ ===
-def connect_to_server():
-    """Підключення до сервера"""
+HELLO_RESEND_INTERVAL = 0.25  # Як часто повторювати UDP-привітання, доки сервер не відповів
+
+
+def connect_to_server(timeout, watch):
+    """
+    Підключення до сервера; викликається з потоку Connector.
+    timeout обмежує лише connect(): вітання приходить, коли знайдеться суперник,
+    тож чекаємо його без обмеження, а «Назад» розриває з'єднання через watch
+    При помилці кидає виняток
+    """
+    client = socket.create_connection((game_settings["server_ip"], game_settings["server_port"]), timeout)
+    udp_client = None
+    udp_hello = None
     try:
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client.connect((game_settings["server_ip"], game_settings["server_port"]))
-        buffer = ""
+        client.settimeout(None)
+        watch(client)
+        my_id, codec, udp_token, udp_port, rest = protocol.recv_welcome(client)
+        decoder = protocol.FrameDecoder(codec)
         game_state = {}
-        my_id = int(client.recv(24).decode())
-        return my_id, game_state, buffer, client
-    except Exception as e:
-        print(f"❌ Помилка підключення: {e}")
-        return None
+        for state in decoder.feed(rest):
+            game_state = state
+
+        if game_settings["transport"] == protocol.TRANSPORT_UDP:
+            if udp_token is None:
+                print("⚠️ Сервер не приймає UDP, граємо через TCP")
+            else:
+                udp_client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                # Сервер з кількома процесами дає кожному процесу власний UDP-порт
+                udp_client.connect((game_settings["server_ip"], udp_port or game_settings["server_port"]))
+                # Привітання може загубитись — головний цикл повторює його, доки не прийде перший UDP-знімок
+                udp_hello = protocol.encode_hello(udp_token)
+                udp_client.send(udp_hello)
+        return my_id, game_state, decoder, client, udp_client, protocol.INPUT_ENCODERS[codec], udp_hello
+    except Exception:
+        client.close()
+        if udp_client:
+            udp_client.close()
+        raise
+
+
+def close_connection(result):
+    """Закриває сокети підключення, яке вже не потрібне (гравець натиснув «Назад»)"""
+    _, _, _, tcp_client, udp, _, _ = result
+    tcp_client.close()
+    if udp:
+        udp.close()
 
 
 def receive():
     """Отримання даних від сервера"""
-    global buffer, game_state, game_over
+    global game_state, game_over, udp_confirmed
+    sockets = [client] if udp_client is None else [client, udp_client]
     while not game_over and current_state == PLAYING:
         try:
-            data = client.recv(1024).decode()
-            buffer += data
-            while "\n" in buffer:
-                packet, buffer = buffer.split("\n", 1)
-                if packet.strip():
-                    game_state = json.loads(packet)
-        except:
+            readable, _, _ = select.select(sockets, [], [], 0.5)
+            for sock in readable:
+                if sock is udp_client:
+                    try:
+                        states = decoder.feed_datagram(udp_client.recv(2048))
+                        if states:
+                            udp_confirmed = True  # Сервер отримав привітання — далі команди теж через UDP
+                            udp_client.send(protocol.encode_ack(states[-1]["tick"]))
+                        if decoder.need_keyframe():
+                            udp_client.send(protocol.encode_keyframe_request())
+                    except OSError:
+                        # ICMP «порт недоступний» на під'єднаному UDP-сокеті — TCP при цьому живий,
+                        # тож команди знову йдуть через TCP, а знімки чекаємо з будь-якого каналу
+                        udp_confirmed = False
+                        continue
+                else:
+                    data = client.recv(1024)
+                    if not data:
+                        raise ConnectionError("Сервер закрив з'єднання")
+                    states = decoder.feed(data)
+                # UDP і TCP можуть принести кадри не по порядку — показуємо найновіший
+                for state in states:
+                    if state.get("tick", 0) >= game_state.get("tick", 0):
+                        game_state = state
+                        snapshot_buffer.push(state)
+        except (OSError, ValueError, protocol.ProtocolError):
             game_state["winner"] = -1
             break
 
@@ -396,157 +526,197 @@ winner = None
 you_winner = None
 my_id = None
 game_state = {}
-buffer = ""
+decoder = None
+encode_input = None
+input_seq = 0
+recent_inputs = deque(maxlen=3)  # Через UDP кожна датаграма несе і кілька попередніх команд
 client = None
-connection_attempts = 0
+udp_client = None
+udp_hello = None
+udp_confirmed = False  # Чи дійшло UDP-привітання до сервера (прийшов перший UDP-знімок)
+last_hello_at = 0.0
+predictor = None
+snapshot_buffer = SnapshotBuffer()  # Плавне відображення незалежно від моменту приходу знімків
+connector = None  # Фонове підключення, поки гравець на екрані «Підключення...»
+first_frame = True
 last_sound_event = None
 
-while True:
-    # Обробка подій
-    for e in event.get():
-        if e.type == QUIT:
-            stop_background_music()
-            exit()
+if __name__ == "__main__":
+    while True:
+        # Кадр гри показує draw_game, решта екранів оновлюються повністю
+        frame_shown = False
 
-        # Обробка подій для різних станів
-        if current_state == MENU:
-            for button in menu_buttons:
-                button.handle_event(e)
+        # Ресурси, що встигли завантажитись у фоні
+        apply_loaded_assets()
 
-        elif current_state == SETTINGS:
-            for button in settings_buttons:
-                button.handle_event(e)
+        # Обробка подій
+        for e in event.get():
+            if e.type == QUIT:
+                stop_background_music()
+                loader.close()
+                if connector:
+                    connector.cancel()
+                exit()
 
-        elif current_state == CONNECTING:
-            back_button = draw_connecting()  # Отримуємо кнопку для обробки
-            back_button.handle_event(e)
-
-    # === ВІДОБРАЖЕННЯ ВІДПОВІДНО ДО СТАНУ ===
-    if current_state == MENU:
-        draw_menu()
-
-    elif current_state == SETTINGS:
-        draw_settings()
-
-    elif current_state == CONNECTING:
-        draw_connecting()
-
-        # Спроба підключення (не блокуюча)
-        connection_attempts += 1
-        if connection_attempts > 60:  # Спробувати підключитися через 1 секунду (60 кадрів)
-            connection_attempts = 0
-            result = connect_to_server()
-            if result:
-                my_id, game_state, buffer, client = result
-                current_state = PLAYING
-                game_over = False
-                you_winner = None
-                Thread(target=receive, daemon=True).start()
-                print("✅ Успішно підключено до сервера!")
-
-    elif current_state == PLAYING:
-        # === ІГРОВА ЛОГІКА ===
-
-        # Відображення фону
-        if game_bg:
-            screen.blit(game_bg, (0, 0))
-        else:
-            screen.fill((30, 30, 30))
+            if e.type == VIDEOEXPOSE:
+                renderer.invalidate()  # Вміст вікна міг загубитись — наступний кадр малюємо повністю
 
-        # Екран відліку
-        if "countdown" in game_state and game_state["countdown"] > 0:
-            countdown_text = font.Font(None, 72).render(str(game_state["countdown"]), True, (255, 255, 255))
-            screen.blit(countdown_text, (WIDTH // 2 - 20, HEIGHT // 2 - 30))
-            display.update()
-            continue
+            # Обробка подій для різних станів
+            if current_state == MENU:
+                for button in menu_buttons:
+                    button.handle_event(e)
 
-        # Екран перемоги
-        if "winner" in game_state and game_state["winner"] is not None:
-            if win_bg:
-                screen.blit(win_bg, (0, 0))
-            else:
-                screen.fill((20, 20, 20))
+            elif current_state == SETTINGS:
+                for button in settings_buttons:
+                    button.handle_event(e)
 
-            if you_winner is None:
-                if game_state["winner"] == my_id:
-                    you_winner = True
-                    play_sound_effect(win_sound)
-                else:
-                    you_winner = False
-                    play_sound_effect(lose_sound)
-
-            if you_winner:
-                text = "Ти переміг!"
-            else:
-                text = "Пощастить наступним разом!"
-
-            win_text = font_win.render(text, True, (255, 215, 0))
-            text_rect = win_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            screen.blit(win_text, text_rect)
-
-            # Додаємо кнопку повернення до меню
-            menu_button = Button(WIDTH // 2 - 100, HEIGHT // 2 + 80, 200, 50, "Головне меню", back_to_menu)
-            menu_button.hovered = menu_button.rect.collidepoint(mouse.get_pos())
-            menu_button.draw(screen)
+            elif current_state == CONNECTING:
+                back_button = draw_connecting()  # Отримуємо кнопку для обробки
+                back_button.handle_event(e)
 
-            # Обробка кліку по кнопці меню
-            for e in event.get():
-                if e.type == QUIT:
-                    stop_background_music()
-                    exit()
-                menu_button.handle_event(e)
-
-            display.update()
-            continue
+        # === ВІДОБРАЖЕННЯ ВІДПОВІДНО ДО СТАНУ ===
+        if current_state == MENU:
+            draw_menu()
 
-        # Основна гра
-        if game_state:
-            # Ракетки
-            if paddle1_img:
-                screen.blit(paddle1_img, (20, game_state['paddles']['0']))
-            else:
-                draw.rect(screen, (0, 255, 0), (20, game_state['paddles']['0'], 20, 100))
+        elif current_state == SETTINGS:
+            draw_settings()
 
-            if paddle2_img:
-                screen.blit(paddle2_img, (WIDTH - 40, game_state['paddles']['1']))
-            else:
-                draw.rect(screen, (255, 0, 255), (WIDTH - 40, game_state['paddles']['1'], 20, 100))
+        elif current_state == CONNECTING:
+            draw_connecting()
+
+            # Connector підключається у фоні; забираємо з'єднання, коли вже є все потрібне для гри
+            if connector and loader.ready(*GAME_ASSETS):
+                result = connector.poll()
+                if result:
+                    connector = None
+                    my_id, game_state, decoder, client, udp_client, encode_input, udp_hello = result
+                    udp_confirmed = False
+                    last_hello_at = perf_counter()
+                    input_seq = 0
+                    recent_inputs.clear()
+                    snapshot_buffer.clear()
+                    # Передбачення потребує нумерованих команд, тобто бінарного протоколу
+                    predictor = PaddlePredictor(my_id) if decoder.codec == protocol.CODEC_BINARY else None
+                    current_state = PLAYING
+                    game_over = False
+                    you_winner = None
+                    Thread(target=receive, daemon=True).start()
+                    print("✅ Успішно підключено до сервера!")
+
+        elif current_state == PLAYING:
+            # === ІГРОВА ЛОГІКА ===
+
+            # Екран відліку
+            if "countdown" in game_state and game_state["countdown"] > 0:
+                draw_background()
+                renderer.invalidate()
+                countdown_text = render_text(font_countdown, str(game_state["countdown"]), (255, 255, 255))
+                screen.blit(countdown_text, (WIDTH // 2 - 20, HEIGHT // 2 - 30))
+                display.update()
+                clock.tick(60)
+                continue
+
+            # Екран перемоги
+            if "winner" in game_state and game_state["winner"] is not None:
+                renderer.invalidate()
+                if win_bg:
+                    screen.blit(win_bg, (0, 0))
+                else:
+                    screen.fill((20, 20, 20))
+
+                if you_winner is None:
+                    if game_state["winner"] == my_id:
+                        you_winner = True
+                        play_sound_effect(win_sound)
+                    else:
+                        you_winner = False
+                        play_sound_effect(lose_sound)
+
+                if you_winner:
+                    text = "Ти переміг!"
+                else:
+                    text = "Пощастить наступним разом!"
+
+                win_text = render_text(font_win, text, (255, 215, 0))
+                text_rect = win_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+                screen.blit(win_text, text_rect)
+
+                # Додаємо кнопку повернення до меню
+                menu_button = Button(WIDTH // 2 - 100, HEIGHT // 2 + 80, 200, 50, "Головне меню", back_to_menu)
+                menu_button.hovered = menu_button.rect.collidepoint(mouse.get_pos())
+                menu_button.draw(screen)
+
+                # Обробка кліку по кнопці меню
+                for e in event.get():
+                    if e.type == QUIT:
+                        stop_background_music()
+                        exit()
+                    menu_button.handle_event(e)
+
+                display.update()
+                clock.tick(60)
+                continue
+
+            # Основна гра
+            if game_state:
+                # Позиції інтерполюються між знімками, а свою ракетку малюємо там,
+                # де її передбачив клієнт
+                view = snapshot_buffer.sample() or SnapshotBuffer.view(game_state)
+                paddles = view['paddles']
+                ball_x, ball_y = view['ball']
+                if predictor:
+                    predictor.reconcile(game_state)
+                    paddles[my_id] = predictor.y
+
+                draw_game(paddles, ball_x, ball_y, game_state['scores'])
+                frame_shown = True
+
+                # Звукові події
+                if game_state['sound_event'] and game_settings["sound_enabled"]:
+                    if game_state['sound_event'] == 'wall_hit':
+                        play_sound_effect(wall_hit_sound)
+                    if game_state['sound_event'] == 'platform_hit':
+                        play_sound_effect(paddle_hit_sound)
 
-            # М'яч
-            if ball_img:
-                screen.blit(ball_img, (game_state['ball']['x'] - 10, game_state['ball']['y'] - 10))
             else:
-                draw.circle(screen, (255, 255, 255), (game_state['ball']['x'], game_state['ball']['y']), 10)
-
-            # Рахунок
-            score_text = font_main.render(f"{game_state['scores'][0]} : {game_state['scores'][1]}", True,
-                                          (255, 255, 255))
-            screen.blit(score_text, (WIDTH // 2 - 25, 20))
-
-            # Звукові події
-            if game_state['sound_event'] and game_settings["sound_enabled"]:
-                if game_state['sound_event'] == 'wall_hit':
-                    play_sound_effect(wall_hit_sound)
-                if game_state['sound_event'] == 'platform_hit':
-                    play_sound_effect(paddle_hit_sound)
-
-        else:
-            # Екран очікування
-            waiting_text = font_main.render(f"Очікування гравців...", True, (255, 255, 255))
-            screen.blit(waiting_text, (WIDTH // 2 - 125, HEIGHT // 2))
-
-        # Управління
-        keys = key.get_pressed()
-        if keys[K_w] and client:
-            try:
-                client.send(b"UP")
-            except:
-                current_state = MENU  # Повернутися до меню при втраті з'єднання
-        elif keys[K_s] and client:
-            try:
-                client.send(b"DOWN")
-            except:
-                current_state = MENU  # Повернутися до меню при втраті з'єднання
-
-    display.update()
-    clock.tick(60)
\ No newline at end of file
+                # Екран очікування
+                draw_background()
+                waiting_text = render_text(font_main, f"Очікування гравців...", (255, 255, 255))
+                screen.blit(waiting_text, (WIDTH // 2 - 125, HEIGHT // 2))
+
+            # Поки сервер не відповів по UDP, привітання могло загубитись — повторюємо його
+            if udp_client and not udp_confirmed and perf_counter() - last_hello_at >= HELLO_RESEND_INTERVAL:
+                last_hello_at = perf_counter()
+                try:
+                    udp_client.send(udp_hello)
+                except OSError:
+                    pass
+
+            # Управління
+            keys = key.get_pressed()
+            command = protocol.INPUT_UP if keys[K_w] else protocol.INPUT_DOWN if keys[K_s] else None
+            if command and client:
+                input_seq += 1
+                try:
+                    # До першого UDP-знімка сервер може ще не знати нашої UDP-адреси — команди йдуть через TCP
+                    if udp_client and udp_confirmed:
+                        recent_inputs.append(encode_input(input_seq, command))
+                        try:
+                            udp_client.send(b"".join(recent_inputs))
+                        except OSError:
+                            udp_confirmed = False  # UDP недоступний — ця і наступні команди через TCP
+                            client.send(encode_input(input_seq, command))
+                    else:
+                        client.send(encode_input(input_seq, command))
+                    if predictor:
+                        predictor.apply_local(input_seq, command)
+                except OSError:
+                    current_state = MENU  # Повернутися до меню при втраті з'єднання
+
+        if not frame_shown:
+            renderer.invalidate()
+            display.update()
+        if first_frame:
+            first_frame = False
+            print(f"⚡ Перший кадр через {(perf_counter() - STARTED) * 1000:.0f} мс")
+        clock.tick(60)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import socket
 import json
+import queue
+import re
 import threading
 import time
 import random
@@ -9,6 +11,15 @@ BALL_SPEED = 5
 PADDLE_SPEED = 10
 COUNTDOWN_START = 3
 
+
+def command_tail(data):
+    """Кінець даних, з якого ще може початись команда ("U", "DO", "DOW"); решту можна викинути"""
+    for keep in range(min(len(data), 3), 0, -1):
+        if "DOWN".startswith(data[-keep:]) or "UP".startswith(data[-keep:]):
+            return data[-keep:]
+    return ""
+
+
 class GameServer:
     def __init__(self, host='localhost', port=8080):
         self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -32,7 +43,9 @@ class GameServer:
 
         self.clients = {0: None, 1: None}
         self.connected = {0: False, 1: False}
-        self.lock = threading.Lock()
+        # Команди гравців: потоки клієнтів лише кладуть їх сюди, а змінює стан гри
+        # тільки потік ball_logic — тож тік ніколи не чекає на блокування
+        self.inputs = queue.SimpleQueue()
         self.reset_game_state()
         self.sound_event = None
 
@@ -51,21 +64,45 @@ class GameServer:
 
     def handle_client(self, pid):
         conn = self.clients[pid]
+        buffer = ""
         try:
             while True:
                 data = conn.recv(64).decode()
-                with self.lock:
-                    if data == "UP":
-                        self.paddles[pid] = max(60, self.paddles[pid] - PADDLE_SPEED)
-                    elif data == "DOWN":
-                        self.paddles[pid] = min(HEIGHT - 100, self.paddles[pid] + PADDLE_SPEED)
+                if not data:
+                    raise ConnectionError
+                # Кілька команд можуть прийти одним пакетом, а одна — розірватись між двома ("U" | "P")
+                buffer += data
+                consumed = 0
+                for match in re.finditer("UP|DOWN", buffer):
+                    self.inputs.put((pid, conn, match.group()))
+                    consumed = match.end()
+                buffer = command_tail(buffer[consumed:])
         except:
-            with self.lock:
+            # Сокет минулої партії може «відключитись» уже під час нової — це не привід її завершувати
+            if conn is self.clients[pid]:
+                self.inputs.put((pid, conn, None))  # None — гравець відключився
+
+    def apply_inputs(self):
+        """Застосовує команди, що накопичились з минулого тіку (лише в потоці гри)"""
+        for _ in range(self.inputs.qsize()):
+            pid, conn, command = self.inputs.get_nowait()
+            if conn is not self.clients[pid]:
+                continue  # Залишок від з'єднання попередньої партії
+            if command == "UP":
+                self.paddles[pid] = max(60, self.paddles[pid] - PADDLE_SPEED)
+            elif command == "DOWN":
+                self.paddles[pid] = min(HEIGHT - 100, self.paddles[pid] + PADDLE_SPEED)
+            elif command is None and not self.game_over:
                 self.connected[pid] = False
                 self.game_over = True
                 self.winner = 1 - pid  # інший гравець автоматично виграє
                 print(f"Гравець {pid} відключився. Переміг гравець {1 - pid}.")
 
+    def discard_inputs(self):
+        """Команди і відключення з минулої партії новій не потрібні"""
+        while not self.inputs.empty():
+            self.inputs.get_nowait()
+
     def broadcast_state(self):
         state = json.dumps({
             "paddles": self.paddles,
@@ -83,42 +120,42 @@ class GameServer:
                     self.connected[pid] = False
 
     def ball_logic(self):
-        while self.countdown > 0:
+        while self.countdown > 0 and not self.game_over:
             time.sleep(1)
-            with self.lock:
-                self.countdown -= 1
-                self.broadcast_state()
+            self.apply_inputs()
+            self.countdown -= 1
+            self.broadcast_state()
 
         while not self.game_over:
-            with self.lock:
-                self.ball['x'] += self.ball['vx']
-                self.ball['y'] += self.ball['vy']
-
-                if self.ball['y'] <= 60 or self.ball['y'] >= HEIGHT:
-                    self.ball['vy'] *= -1
-                    self.sound_event = "wall_hit"
-
-                if (self.ball['x'] <= 40 and self.paddles[0] <= self.ball['y'] <= self.paddles[0] + 100) or \
-                   (self.ball['x'] >= WIDTH - 40 and self.paddles[1] <= self.ball['y'] <= self.paddles[1] + 100):
-                    self.ball['vx'] *= -1
-                    self.sound_event = 'platform_hit'
-
-                if self.ball['x'] < 0:
-                    self.scores[1] += 1
-                    self.reset_ball()
-                elif self.ball['x'] > WIDTH:
-                    self.scores[0] += 1
-                    self.reset_ball()
-
-                if self.scores[0] >= 10:
-                    self.game_over = True
-                    self.winner = 0
-                elif self.scores[1] >= 10:
-                    self.game_over = True
-                    self.winner = 1
-
-                self.broadcast_state()
-                self.sound_event = None
+            self.apply_inputs()
+            self.ball['x'] += self.ball['vx']
+            self.ball['y'] += self.ball['vy']
+
+            if self.ball['y'] <= 60 or self.ball['y'] >= HEIGHT:
+                self.ball['vy'] *= -1
+                self.sound_event = "wall_hit"
+
+            if (self.ball['x'] <= 40 and self.paddles[0] <= self.ball['y'] <= self.paddles[0] + 100) or \
+               (self.ball['x'] >= WIDTH - 40 and self.paddles[1] <= self.ball['y'] <= self.paddles[1] + 100):
+                self.ball['vx'] *= -1
+                self.sound_event = 'platform_hit'
+
+            if self.ball['x'] < 0:
+                self.scores[1] += 1
+                self.reset_ball()
+            elif self.ball['x'] > WIDTH:
+                self.scores[0] += 1
+                self.reset_ball()
+
+            if self.scores[0] >= 10:
+                self.game_over = True
+                self.winner = 0
+            elif self.scores[1] >= 10:
+                self.game_over = True
+                self.winner = 1
+
+            self.broadcast_state()
+            self.sound_event = None
             time.sleep(0.016)
 
     def reset_ball(self):
@@ -142,6 +179,7 @@ class GameServer:
     def run(self):
         try:
             while True:
+                self.discard_inputs()
                 self.accept_players()
                 self.reset_game_state()
                 threading.Thread(target=self.ball_logic, daemon=True).start()
@@ -154,6 +192,10 @@ class GameServer:
 
                 # Закриваємо старі з'єднання
                 for pid in [0, 1]:
+                    try:
+                        self.clients[pid].shutdown(socket.SHUT_RDWR)  # Будить потік, що чекає в recv()
+                    except:
+                        pass
                     try:
                         self.clients[pid].close()
                     except: